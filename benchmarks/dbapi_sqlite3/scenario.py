@@ -0,0 +1,52 @@
+import sqlite3
+
+import bm
+
+from ddtrace import Pin
+from ddtrace.contrib.sqlite3.patch import patch_conn
+from ddtrace.internal.writer import TraceWriter
+from ddtrace.tracer import Tracer
+
+
+class NoopWriter(TraceWriter):
+    def recreate(self):
+        return NoopWriter()
+
+    def stop(self, timeout=None):
+        pass
+
+    def write(self, spans=None):
+        pass
+
+
+class DBAPISQLite3(bm.Scenario):
+    tracing = bm.var(type=bool)
+    cursor_per_query = bm.var(type=bool)
+    nqueries = bm.var(type=int)
+
+    def run(self):
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, name TEXT)")
+        conn.executemany("INSERT INTO t (name) VALUES (?)", [("name%d" % i,) for i in range(100)])
+        if self.tracing:
+            tracer = Tracer()
+            tracer.configure(writer=NoopWriter())
+            conn = patch_conn(conn)
+            Pin.override(conn, tracer=tracer)
+
+        query = "SELECT name FROM t WHERE id = ?"
+
+        def _(loops):
+            for _ in range(loops):
+                if self.cursor_per_query:
+                    for i in range(self.nqueries):
+                        cursor = conn.cursor()
+                        cursor.execute(query, (i,))
+                        cursor.fetchall()
+                else:
+                    cursor = conn.cursor()
+                    for i in range(self.nqueries):
+                        cursor.execute(query, (i,))
+                        cursor.fetchall()
+
+        yield _
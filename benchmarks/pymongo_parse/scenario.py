@@ -0,0 +1,19 @@
+import bm
+import utils
+
+from ddtrace.contrib.pymongo.parse import parse_msg
+
+
+class PymongoParse(bm.Scenario):
+    command = bm.var(type=str)
+    ndocs = bm.var(type=int)
+    docsize = bm.var(type=int)
+
+    def run(self):
+        msg = utils.gen_op_msg(self)
+
+        def _(loops):
+            for _ in range(loops):
+                parse_msg(msg)
+
+        yield _
@@ -0,0 +1,63 @@
+import random
+import string
+import struct
+
+from bson import BSON
+from bson.int64 import Int64
+from bson.objectid import ObjectId
+from bson.son import SON
+
+
+OP_MSG = 2013
+
+# The document sequence holding the documents of each command, as sent by pymongo
+IDENTIFIERS = {
+    "insert": b"documents",
+    "update": b"updates",
+    "delete": b"deletes",
+}
+
+
+def rands(size=6, chars=string.ascii_uppercase + string.digits):
+    return "".join(random.choice(chars) for _ in range(size))
+
+
+def gen_document(scenario):
+    doc = SON([("_id", ObjectId()), ("name", rands(size=scenario.docsize)), ("count", random.randint(0, 2 ** 16))])
+    if scenario.command == "insert":
+        return doc
+    # updates and deletes documents hold the filter of the documents to update or delete
+    op = SON([("q", SON([("name", doc["name"]), ("count", {"$gt": doc["count"]})]))])
+    if scenario.command == "update":
+        op["u"] = {"$set": {"count": 0}}
+    else:
+        op["limit"] = 0
+    return op
+
+
+def gen_op_msg(scenario):
+    """Return an OP_MSG message like the ones sent by pymongo for bulk writes."""
+    command = SON(
+        [
+            (scenario.command, "collection"),
+            ("ordered", True),
+            ("lsid", {"id": ObjectId()}),
+            ("$clusterTime", {"clusterTime": Int64(0), "signature": {"keyId": Int64(0)}}),
+            ("$db", "database"),
+        ]
+    )
+    documents = b"".join(BSON.encode(gen_document(scenario)) for _ in range(scenario.ndocs))
+    identifier = IDENTIFIERS[scenario.command] + b"\x00"
+
+    body = b"".join(
+        (
+            struct.pack("<i", 0),  # flags
+            b"\x00",  # body section
+            BSON.encode(command),
+            b"\x01",  # document sequence section
+            struct.pack("<i", 4 + len(identifier) + len(documents)),
+            identifier,
+            documents,
+        )
+    )
+    return struct.pack("<iiii", 16 + len(body), random.randint(0, 2 ** 16), 0, OP_MSG) + body
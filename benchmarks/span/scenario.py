@@ -10,6 +10,7 @@ class Span(bm.Scenario):
     ltags = bm.var(type=int)
     nmetrics = bm.var(type=int)
     finishspan = bm.var(type=bool)
+    batchtags = bm.var(type=bool)
 
     def run(self):
         # run scenario to also set tags on spans
@@ -23,12 +24,19 @@ class Span(bm.Scenario):
         # run scenario to include finishing spans
         finishspan = self.finishspan
 
+        # run scenario to set tags all at once or one by one like integrations do
+        batchtags = self.batchtags
+
         def _(loops):
             for _ in range(loops):
                 for i in range(self.nspans):
                     s = dd_Span(None, "test." + str(i), resource="resource", service="service")
                     if settags:
-                        s.set_tags(tags)
+                        if batchtags:
+                            s.set_tags(tags)
+                        else:
+                            for k, v in tags.items():
+                                s.set_tag(k, v)
                     if setmetrics:
                         s.set_metrics(metrics)
                     if finishspan:
@@ -5,8 +5,13 @@ ANALYTICS_SAMPLE_RATE_KEY = "_dd1.sr.eausr"
 SAMPLING_AGENT_DECISION = "_dd.agent_psr"
 SAMPLING_RULE_DECISION = "_dd.rule_psr"
 SAMPLING_LIMIT_DECISION = "_dd.limit_psr"
+SPAN_SAMPLING_MECHANISM = "_dd.span_sampling.mechanism"
+SPAN_SAMPLING_RULE_RATE = "_dd.span_sampling.rule_rate"
+SPAN_SAMPLING_MAX_PER_SECOND = "_dd.span_sampling.max_per_second"
 ORIGIN_KEY = "_dd.origin"
 HOSTNAME_KEY = "_dd.hostname"
+# Hexadecimal representation of the higher 64 bits of 128-bit trace ids
+HIGHER_ORDER_TRACE_ID_BITS = "_dd.p.tid"
 ENV_KEY = "env"
 VERSION_KEY = "version"
 SERVICE_KEY = "service.name"
@@ -21,3 +26,14 @@ MANUAL_DROP_KEY = "manual.drop"
 MANUAL_KEEP_KEY = "manual.keep"
 
 LOG_SPAN_KEY = "__datadog_log_span"
+
+PROPAGATION_STYLE_DATADOG = "datadog"
+PROPAGATION_STYLE_B3 = "b3multi"
+PROPAGATION_STYLE_B3_SINGLE_HEADER = "b3 single header"
+PROPAGATION_STYLE_W3C_TRACECONTEXT = "tracecontext"
+PROPAGATION_STYLE_ALL = (
+    PROPAGATION_STYLE_DATADOG,
+    PROPAGATION_STYLE_B3,
+    PROPAGATION_STYLE_B3_SINGLE_HEADER,
+    PROPAGATION_STYLE_W3C_TRACECONTEXT,
+)
@@ -1,4 +1,3 @@
-import threading
 from typing import Optional
 from typing import TYPE_CHECKING
 from typing import Text
@@ -24,15 +23,19 @@ log = get_logger(__name__)
 class Context(object):
     """Represents the state required to propagate a trace across execution
     boundaries.
+
+    The trace-level tags and metrics are shared by all the contexts of a trace. They are only changed with single
+    dict operations, which are atomic, so no lock is needed to update or read them from several threads.
     """
 
     trace_id = attr.ib(default=None, type=Optional[int])
     span_id = attr.ib(default=None, type=Optional[int])
     _dd_origin = attr.ib(default=None, type=Optional[str], repr=False)
     _sampling_priority = attr.ib(default=None, type=Optional[NumericType], repr=False)
-    _lock = attr.ib(factory=threading.RLock, type=threading.RLock, repr=False)
     _meta = attr.ib(factory=dict)  # type: _MetaDictType
     _metrics = attr.ib(factory=dict)  # type: _MetricDictType
+    # The W3C ``tracestate`` members of other vendors received with the trace, propagated as is
+    _tracestate = attr.ib(default=None, init=False, repr=False, type=Optional[str])
 
     def __attrs_post_init__(self):
         if self._dd_origin is not None:
@@ -44,29 +47,27 @@ class Context(object):
 
     def __eq__(self, other):
         if isinstance(other, Context):
-            with self._lock:
-                return (
-                    self.trace_id == other.trace_id
-                    and self.span_id == other.span_id
-                    and self._meta == other._meta
-                    and self._metrics == other._metrics
-                )
+            return (
+                self.trace_id == other.trace_id
+                and self.span_id == other.span_id
+                and self._meta == other._meta
+                and self._metrics == other._metrics
+            )
         return False
 
     def _with_span(self, span):
         # type: (Span) -> Context
         """Return a shallow copy of the context with the given span."""
         ctx = self.__class__(trace_id=span.trace_id, span_id=span.span_id)
-        ctx._lock = self._lock
         ctx._meta = self._meta
         ctx._metrics = self._metrics
+        ctx._tracestate = self._tracestate
         return ctx
 
     def _update_tags(self, span):
         # type: (Span) -> None
-        with self._lock:
-            span.meta.update(self._meta)
-            span.metrics.update(self._metrics)
+        span._meta.update(self._meta)
+        span.metrics.update(self._metrics)
 
     @property
     def sampling_priority(self):
@@ -77,11 +78,9 @@ class Context(object):
     @sampling_priority.setter
     def sampling_priority(self, value):
         # type: (Optional[NumericType]) -> None
-        with self._lock:
-            if value is None:
-                if SAMPLING_PRIORITY_KEY in self._metrics:
-                    del self._metrics[SAMPLING_PRIORITY_KEY]
-                return
+        if value is None:
+            self._metrics.pop(SAMPLING_PRIORITY_KEY, None)
+        else:
             self._metrics[SAMPLING_PRIORITY_KEY] = value
 
     @property
@@ -94,11 +93,9 @@ class Context(object):
     def dd_origin(self, value):
         # type: (Optional[Text]) -> None
         """Set the origin of the trace."""
-        with self._lock:
-            if value is None:
-                if ORIGIN_KEY in self._meta:
-                    del self._meta[ORIGIN_KEY]
-                return
+        if value is None:
+            self._meta.pop(ORIGIN_KEY, None)
+        else:
             self._meta[ORIGIN_KEY] = value
 
     @deprecated("Cloning contexts will no longer be required in 0.50", version="0.50")
@@ -6,6 +6,7 @@ from ddtrace import config
 from ddtrace.constants import ANALYTICS_SAMPLE_RATE_KEY
 from ddtrace.ext import SpanTypes
 from ddtrace.ext import http
+from ddtrace.propagation.http import HTTPPropagator
 
 from .. import trace_utils
 from ...internal.compat import reraise
@@ -100,15 +101,20 @@ class TraceMiddleware:
         if scope["type"] != "http":
             return await self.app(scope, receive, send)
 
-        try:
-            headers = _extract_headers(scope)
-        except Exception:
-            log.warning("failed to decode headers for distributed tracing", exc_info=True)
-            headers = {}
-        else:
-            trace_utils.activate_distributed_headers(
-                self.tracer, int_config=self.integration_config, request_headers=headers
-            )
+        trace_utils._activate_distributed_context(
+            self.tracer,
+            HTTPPropagator._extract_from_asgi_headers,
+            scope.get("headers"),
+            int_config=self.integration_config,
+        )
+
+        # Only decode the request headers if some of them are traced
+        headers = None
+        if self.integration_config.is_header_tracing_configured:
+            try:
+                headers = _extract_headers(scope)
+            except Exception:
+                log.warning("failed to decode headers for tracing", exc_info=True)
 
         resource = "{} {}".format(scope["method"], scope["path"])
 
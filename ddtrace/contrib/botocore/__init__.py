@@ -18,12 +18,28 @@ Configuration
 
 .. py:data:: ddtrace.config.botocore['distributed_tracing']
 
-   Whether to inject distributed tracing data to requests in SQS and Lambda.
+   Whether to inject distributed tracing data to requests in SQS, SNS, Kinesis, EventBridge and Lambda.
+
+   The trace context is added to the ``_datadog`` message attribute of the SQS and SNS messages. It is serialized
+   once per call, including for the batch APIs.
 
    Can also be enabled with the ``DD_BOTOCORE_DISTRIBUTED_TRACING`` environment variable.
 
    Default: ``True``
 
+.. py:data:: ddtrace.config.botocore['distributed_tracing_payloads']
+
+   Whether to inject distributed tracing data to the payload of the Kinesis records and EventBridge events. This
+   requires ``distributed_tracing`` to be enabled.
+
+   The trace context is added to the ``_datadog`` key of the records and events whose data is enclosed in braces and
+   does not already mention a ``_datadog`` key. The data is not parsed: only enable this option when the payloads
+   are JSON objects that the consumers can accept an extra key in.
+
+   Can also be enabled with the ``DD_BOTOCORE_DISTRIBUTED_TRACING_PAYLOADS`` environment variable.
+
+   Default: ``False``
+
 .. py:data:: ddtrace.config.botocore['invoke_with_legacy_context']
 
     This preserves legacy behavior when tracing directly invoked Python and Node Lambda
@@ -44,6 +60,22 @@ Example::
     # Enable distributed tracing
     config.botocore['distributed_tracing'] = True
 
+
+Consuming messages
+~~~~~~~~~~~~~~~~~~
+
+The trace context of a received SQS message, or of a Kinesis record, is returned by ``extract_context``. The
+messages published to SNS or EventBridge and delivered to SQS are supported. As a batch of messages can come from
+several traces, the context of each message can be used to trace its processing::
+
+    from ddtrace import tracer
+    from ddtrace.contrib.botocore import extract_context
+
+    for message in sqs.receive_message(QueueUrl=queue_url)["Messages"]:
+        with tracer.start_span("process", child_of=extract_context(message), activate=True):
+            process(message)
+
+The ``_datadog`` message attribute is requested by the traced ``ReceiveMessage`` calls.
 """
 
 
@@ -54,6 +86,7 @@ required_modules = ["botocore.client"]
 
 with require_modules(required_modules) as missing_modules:
     if not missing_modules:
+        from .patch import extract_context
         from .patch import patch
 
-        __all__ = ["patch"]
+        __all__ = ["patch", "extract_context"]
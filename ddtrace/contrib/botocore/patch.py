@@ -4,6 +4,12 @@ Trace queries to aws api done via botocore client
 # 3p
 import base64
 import json
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import TYPE_CHECKING
+from typing import Union
 
 import botocore.client
 
@@ -13,6 +19,7 @@ from ddtrace.vendor import wrapt
 # project
 from ...constants import ANALYTICS_SAMPLE_RATE_KEY
 from ...constants import SPAN_MEASURED_KEY
+from ...context import Context
 from ...ext import SpanTypes
 from ...ext import aws
 from ...ext import http
@@ -24,6 +31,10 @@ from ...utils.formats import get_env
 from ...utils.wrappers import unwrap
 
 
+if TYPE_CHECKING:
+    from ...span import Span
+
+
 # Original botocore client class
 _Botocore_client = botocore.client.BaseClient
 
@@ -37,36 +48,180 @@ config._add(
     "botocore",
     {
         "distributed_tracing": get_env("botocore", "distributed_tracing", default=True),
+        "distributed_tracing_payloads": get_env("botocore", "distributed_tracing_payloads", default=False),
         "invoke_with_legacy_context": get_env("botocore", "invoke_with_legacy_context", default=False),
     },
 )
 
 
-def inject_trace_data_to_message_attributes(trace_data, entry):
-    if "MessageAttributes" not in entry:
-        entry["MessageAttributes"] = {}
-    # An Amazon SQS message can contain up to 10 metadata attributes.
-    if len(entry["MessageAttributes"]) < 10:
-        entry["MessageAttributes"]["_datadog"] = {"DataType": "String", "StringValue": json.dumps(trace_data)}
+# An Amazon SQS or SNS message can contain up to 10 metadata attributes.
+MAX_MESSAGE_ATTRIBUTES = 10
+# Maximum size of the data blob of a Kinesis record
+MAX_KINESIS_DATA_SIZE = 1 << 20
+# Maximum size of an EventBridge event
+MAX_EVENTBRIDGE_DETAIL_SIZE = 1 << 18
+
+
+def get_trace_json(span):
+    # type: (Span) -> str
+    """Return the trace context of the span serialized as JSON.
+
+    It is computed once per call and shared by all the entries of the batch APIs.
+    """
+    trace_data = {}  # type: Dict[str, str]
+    HTTPPropagator.inject(span.context, trace_data)
+    return json.dumps(trace_data)
+
+
+def inject_trace_data_to_message_attributes(attribute, entry):
+    # type: (Dict[str, Any], Dict[str, Any]) -> None
+    """Set the ``_datadog`` attribute of an SQS or SNS message, unless it already has too many attributes."""
+    message_attributes = entry.get("MessageAttributes")
+    if message_attributes is None:
+        message_attributes = entry["MessageAttributes"] = {}
+    if "_datadog" in message_attributes or len(message_attributes) < MAX_MESSAGE_ATTRIBUTES:
+        message_attributes["_datadog"] = attribute
     else:
-        log.debug("skipping trace injection, max number (10) of MessageAttributes exceeded")
+        log.debug("skipping trace injection, max number (%d) of MessageAttributes exceeded", MAX_MESSAGE_ATTRIBUTES)
+
+
+def inject_trace_to_message_batch(entries, trace_json):
+    # type: (List[Dict[str, Any]], str) -> None
+    # DEV: the attribute is shared by the entries, they are serialized separately by botocore
+    attribute = {"DataType": "String", "StringValue": trace_json}
+    for entry in entries:
+        inject_trace_data_to_message_attributes(attribute, entry)
 
 
 def inject_trace_to_sqs_batch_message(args, span):
-    trace_data = {}
-    HTTPPropagator.inject(span.context, trace_data)
-    params = args[1]
+    inject_trace_to_message_batch(args[1]["Entries"], get_trace_json(span))
 
-    for entry in params["Entries"]:
-        inject_trace_data_to_message_attributes(trace_data, entry)
 
+def inject_trace_to_sns_batch_message(args, span):
+    inject_trace_to_message_batch(args[1]["PublishBatchRequestEntries"], get_trace_json(span))
 
-def inject_trace_to_sqs_message(args, span):
-    trace_data = {}
-    HTTPPropagator.inject(span.context, trace_data)
-    params = args[1]
 
-    inject_trace_data_to_message_attributes(trace_data, params)
+def inject_trace_to_message(args, span):
+    inject_trace_data_to_message_attributes({"DataType": "String", "StringValue": get_trace_json(span)}, args[1])
+
+
+def inject_trace_json_to_object(data, member, max_size):
+    # type: (Union[str, bytes], Union[str, bytes], int) -> Optional[Union[str, bytes]]
+    """Return the serialized JSON object ``data`` with the serialized ``"_datadog":<context>`` member appended.
+
+    The member is spliced before the closing brace rather than serializing the object again. The data is not parsed:
+    only its enclosing braces are checked. None is returned when the data is not enclosed in braces, mentions a
+    ``_datadog`` key, or would exceed ``max_size`` bytes.
+    """
+    if isinstance(data, bytes):
+        opening, closing, separator, key = b"{", b"}", b",", b'"_datadog"'
+    else:
+        opening, closing, separator, key = "{", "}", ",", '"_datadog"'
+    stripped = data.strip()
+    if stripped[:1] != opening or stripped[-1:] != closing or key in data:  # type: ignore[operator]
+        return None
+
+    end = data.rindex(closing)
+    if stripped[1:-1].strip():
+        result = data[:end] + separator + member + data[end:]  # type: ignore[operator]
+    else:
+        result = data[:end] + member + data[end:]  # type: ignore[operator]
+
+    size = len(result)
+    # DEV: only encode the strings that might be too large, an UTF-8 character is at most 4 bytes
+    if not isinstance(result, bytes) and size * 4 > max_size:
+        size = len(result.encode("utf-8"))
+    if size > max_size:
+        log.debug("skipping trace injection, the data would exceed %d bytes", max_size)
+        return None
+    return result
+
+
+def inject_trace_to_records(records, key, trace_json, max_size):
+    # type: (List[Dict[str, Any]], str, str, int) -> None
+    member = '"_datadog":' + trace_json
+    member_bytes = member.encode("utf-8")
+    for record in records:
+        data = record.get(key)
+        if isinstance(data, bytes):
+            data = inject_trace_json_to_object(data, member_bytes, max_size)
+        elif isinstance(data, str):
+            data = inject_trace_json_to_object(data, member, max_size)
+        else:
+            continue
+        if data is not None:
+            record[key] = data
+
+
+def inject_trace_to_kinesis_record(args, span):
+    inject_trace_to_records([args[1]], "Data", get_trace_json(span), MAX_KINESIS_DATA_SIZE)
+
+
+def inject_trace_to_kinesis_records(args, span):
+    inject_trace_to_records(args[1]["Records"], "Data", get_trace_json(span), MAX_KINESIS_DATA_SIZE)
+
+
+def inject_trace_to_eventbridge_events(args, span):
+    inject_trace_to_records(args[1]["Entries"], "Detail", get_trace_json(span), MAX_EVENTBRIDGE_DETAIL_SIZE)
+
+
+def request_trace_message_attribute(args, span):
+    """Request the ``_datadog`` attribute of the received SQS messages, to extract their trace context."""
+    params = args[1]
+    names = params.get("MessageAttributeNames")
+    if not names:
+        params["MessageAttributeNames"] = ["_datadog"]
+    elif not {"_datadog", "All", ".*"}.intersection(names):
+        # DEV: the list belongs to the caller
+        params["MessageAttributeNames"] = list(names) + ["_datadog"]
+
+
+def _get_trace_data(message):
+    # type: (Dict[str, Any]) -> Optional[Dict[str, str]]
+    attribute = message.get("MessageAttributes", {}).get("_datadog")
+    if attribute is not None:
+        # SQS message
+        return json.loads(attribute.get("StringValue") or attribute["BinaryValue"])
+
+    # SQS message body or Kinesis record data
+    body = message.get("Body", message.get("Data"))
+    if not isinstance(body, (str, bytes)) or body.lstrip()[:1] not in ("{", b"{"):
+        return None
+    obj = json.loads(body)
+    if not isinstance(obj, dict):
+        return None
+    if "_datadog" in obj:
+        # Kinesis record
+        return obj["_datadog"]
+    attribute = obj.get("MessageAttributes", {}).get("_datadog")
+    if attribute is not None:
+        # SNS notification delivered to SQS
+        value = attribute["Value"]
+        if attribute.get("Type") == "Binary":
+            value = base64.b64decode(value)
+        return json.loads(value)
+    detail = obj.get("detail")
+    if isinstance(detail, dict):
+        # EventBridge event delivered to SQS
+        return detail.get("_datadog")
+    return None
+
+
+def extract_context(message):
+    # type: (Dict[str, Any]) -> Context
+    """Return the trace context injected in a message received from SQS or in a record read from Kinesis.
+
+    The messages published to SNS or EventBridge and delivered to SQS are supported. An empty context is returned when
+    the message has no trace context.
+    """
+    try:
+        trace_data = _get_trace_data(message)
+    except Exception:
+        log.debug("malformed trace context in message", exc_info=True)
+        trace_data = None
+    if not trace_data:
+        return Context()
+    return HTTPPropagator.extract(trace_data)
 
 
 def modify_client_context(client_context_object, trace_headers):
@@ -100,6 +255,23 @@ def inject_trace_to_client_context(args, span):
     params["ClientContext"] = base64.b64encode(json_context).decode("utf-8")
 
 
+_INJECTORS = {
+    ("lambda", "Invoke"): inject_trace_to_client_context,
+    ("sqs", "SendMessage"): inject_trace_to_message,
+    ("sqs", "SendMessageBatch"): inject_trace_to_sqs_batch_message,
+    ("sqs", "ReceiveMessage"): request_trace_message_attribute,
+    ("sns", "Publish"): inject_trace_to_message,
+    ("sns", "PublishBatch"): inject_trace_to_sns_batch_message,
+}
+
+# DEV: these injectors rewrite the payload of the user records, they are only used when enabled
+_PAYLOAD_INJECTORS = {
+    ("kinesis", "PutRecord"): inject_trace_to_kinesis_record,
+    ("kinesis", "PutRecords"): inject_trace_to_kinesis_records,
+    ("events", "PutEvents"): inject_trace_to_eventbridge_events,
+}
+
+
 def patch():
     if getattr(botocore.client, "_datadog_patch", False):
         return
@@ -136,12 +308,11 @@ def patched_api_call(original_func, instance, args, kwargs):
             span.resource = ".".join((endpoint_name, operation.lower()))
 
             if config.botocore["distributed_tracing"]:
-                if endpoint_name == "lambda" and operation == "Invoke":
-                    inject_trace_to_client_context(args, span)
-                if endpoint_name == "sqs" and operation == "SendMessage":
-                    inject_trace_to_sqs_message(args, span)
-                if endpoint_name == "sqs" and operation == "SendMessageBatch":
-                    inject_trace_to_sqs_batch_message(args, span)
+                inject = _INJECTORS.get((endpoint_name, operation))
+                if inject is None and config.botocore["distributed_tracing_payloads"]:
+                    inject = _PAYLOAD_INJECTORS.get((endpoint_name, operation))
+                if inject is not None:
+                    inject(args, span)
 
         else:
             span.resource = endpoint_name
@@ -37,8 +37,11 @@ def trace_prerun(*args, **kwargs):
         log.debug("no pin found on task or task.app task_id=%s", task_id)
         return
 
-    request_headers = task.request.get("headers", {})
-    trace_utils.activate_distributed_headers(pin.tracer, int_config=config.celery, request_headers=request_headers)
+    request = task.request
+    # DEV: the context is injected in the nested `headers` of the message, see `trace_before_publish`
+    trace_utils.activate_distributed_headers(
+        pin.tracer, int_config=config.celery, request_headers=request.get("headers")
+    )
 
     # propagate the `Span` in the current task Context
     service = config.celery["worker_service_name"]
@@ -49,7 +52,7 @@ def trace_prerun(*args, **kwargs):
         span.set_tag(ANALYTICS_SAMPLE_RATE_KEY, rate)
 
     span.set_tag(SPAN_MEASURED_KEY)
-    attach_span(task, task_id, span)
+    attach_span(request, span)
 
 
 def trace_postrun(*args, **kwargs):
@@ -63,17 +66,21 @@ def trace_postrun(*args, **kwargs):
         return
 
     # retrieve and finish the Span
-    span = retrieve_span(task, task_id)
+    request = task.request
+    span = retrieve_span(request)
     if span is None:
         log.warning("no existing span found for task_id=%s", task_id)
         return
     else:
         # request context tags
         span.set_tag(c.TASK_TAG_KEY, c.TASK_RUN)
-        set_tags_from_context(span, kwargs)
-        set_tags_from_context(span, task.request.__dict__)
+        # DEV: `state` is the only tag found in the signal arguments
+        state = kwargs.get("state")
+        if state:
+            span.set_tag("celery.state", state)
+        set_tags_from_context(span, request.__dict__)
         span.finish()
-        detach_span(task, task_id)
+        detach_span(request)
 
 
 def trace_before_publish(*args, **kwargs):
@@ -90,13 +97,13 @@ def trace_before_publish(*args, **kwargs):
         log.debug("unable to extract the Task and the task_id. This version of Celery may not be supported.")
         return
 
-    # propagate the `Span` in the current task Context
     pin = Pin.get_from(task) or Pin.get_from(task.app)
     if pin is None:
         return
 
     # apply some tags here because most of the data is not available
     # in the task_after_publish signal
+    # DEV: the span stays active until `trace_after_publish`, which is sent right after the message is published
     service = config.celery["producer_service_name"]
     span = pin.tracer.trace(c.PRODUCER_ROOT_SPAN, service=service, resource=task_name)
     # set analytics sample rate
@@ -112,19 +119,16 @@ def trace_before_publish(*args, **kwargs):
     # Note: adding tags from `traceback` or `state` calls will make an
     # API call to the backend for the properties so we should rely
     # only on the given `Context`
-    attach_span(task, task_id, span, is_publish=True)
-
-    if config.celery["distributed_tracing"]:
-        trace_headers = {}
-        propagator.inject(span.context, trace_headers)
 
+    task_headers = kwargs.get("headers")
+    if task_headers is not None and config.celery["distributed_tracing"]:
         # This weirdness is due to yet another Celery bug concerning
         # how headers get propagated in async flows
         # https://github.com/celery/celery/issues/4875
-        task_headers = kwargs.get("headers") or {}
-        task_headers.setdefault("headers", {})
-        task_headers["headers"].update(trace_headers)
-        kwargs["headers"] = task_headers
+        headers = task_headers.get("headers")
+        if headers is None:
+            headers = task_headers["headers"] = {}
+        propagator.inject(span.context, headers)
 
 
 def trace_after_publish(*args, **kwargs):
@@ -137,13 +141,15 @@ def trace_after_publish(*args, **kwargs):
         log.debug("unable to extract the Task and the task_id. This version of Celery may not be supported.")
         return
 
-    # retrieve and finish the Span
-    span = retrieve_span(task, task_id, is_publish=True)
-    if span is None:
+    pin = Pin.get_from(task) or Pin.get_from(task.app)
+    if pin is None:
         return
-    else:
-        span.finish()
-        detach_span(task, task_id, is_publish=True)
+
+    # retrieve and finish the Span started by `trace_before_publish`
+    span = pin.tracer.current_span()
+    if span is None or span.name != c.PRODUCER_ROOT_SPAN or span.get_tag("celery.id") != task_id:
+        return
+    span.finish()
 
 
 def trace_failure(*args, **kwargs):
@@ -156,7 +162,7 @@ def trace_failure(*args, **kwargs):
         return
 
     # retrieve and finish the Span
-    span = retrieve_span(task, task_id)
+    span = retrieve_span(task.request)
     if span is None:
         return
     else:
@@ -184,7 +190,7 @@ def trace_retry(*args, **kwargs):
         log.debug("unable to extract the retry reason. This version of Celery may not be supported.")
         return
 
-    span = retrieve_span(task, context.id)
+    span = retrieve_span(context)
     if span is None:
         return
 
@@ -1,35 +1,33 @@
 from typing import Any
 from typing import Dict
-from weakref import WeakValueDictionary
+from typing import Optional
 
 from ddtrace.span import Span
 
 from .constants import CTX_KEY
 
 
-TAG_KEYS = frozenset(
-    [
-        ("compression", "celery.compression"),
-        ("correlation_id", "celery.correlation_id"),
-        ("countdown", "celery.countdown"),
-        ("delivery_info", "celery.delivery_info"),
-        ("eta", "celery.eta"),
-        ("exchange", "celery.exchange"),
-        ("expires", "celery.expires"),
-        ("hostname", "celery.hostname"),
-        ("id", "celery.id"),
-        ("priority", "celery.priority"),
-        ("queue", "celery.queue"),
-        ("reply_to", "celery.reply_to"),
-        ("retries", "celery.retries"),
-        ("routing_key", "celery.routing_key"),
-        ("serializer", "celery.serializer"),
-        ("timelimit", "celery.timelimit"),
-        # Celery 4.0 uses `origin` instead of `hostname`; this change preserves
-        # the same name for the tag despite Celery version
-        ("origin", "celery.hostname"),
-        ("state", "celery.state"),
-    ]
+# Keys of the request or signal context to tag when they are set, with the name of their tag. `retries` and
+# `timelimit` have their own unset values and are handled separately.
+TAG_KEYS = (
+    ("compression", "celery.compression"),
+    ("correlation_id", "celery.correlation_id"),
+    ("countdown", "celery.countdown"),
+    ("delivery_info", "celery.delivery_info"),
+    ("eta", "celery.eta"),
+    ("exchange", "celery.exchange"),
+    ("expires", "celery.expires"),
+    ("hostname", "celery.hostname"),
+    ("id", "celery.id"),
+    ("priority", "celery.priority"),
+    ("queue", "celery.queue"),
+    ("reply_to", "celery.reply_to"),
+    ("routing_key", "celery.routing_key"),
+    ("serializer", "celery.serializer"),
+    # Celery 4.0 uses `origin` instead of `hostname`; this change preserves
+    # the same name for the tag despite Celery version
+    ("origin", "celery.hostname"),
+    ("state", "celery.state"),
 )
 
 
@@ -41,73 +39,50 @@ def set_tags_from_context(span, context):
         value = context.get(key)
 
         # Skip this key if it is not set
-        if value is None or value == "":
-            continue
+        if value is not None and value != "":
+            span.set_tag(tag_name, value)
 
-        # Skip `timelimit` if it is not set (its default/unset value is a
-        # tuple or a list of `None` values
-        if key == "timelimit" and all(_ is None for _ in value):
-            continue
+    # Skip `retries` if its value is `0`
+    retries = context.get("retries")
+    if retries:
+        span.set_tag("celery.retries", retries)
 
-        # Skip `retries` if its value is `0`
-        if key == "retries" and value == 0:
-            continue
+    # Skip `timelimit` if it is not set (its default/unset value is a
+    # tuple or a list of `None` values
+    timelimit = context.get("timelimit")
+    if timelimit and any(limit is not None for limit in timelimit):
+        span.set_tag("celery.timelimit", timelimit)
 
-        span.set_tag(tag_name, value)
 
+def attach_span(request, span):
+    # type: (Any, Span) -> None
+    """Helper to propagate the `Span` of a task execution from one Celery signal to another.
 
-def attach_span(task, task_id, span, is_publish=False):
-    """Helper to propagate a `Span` for the given `Task` instance. This
-    function uses a `WeakValueDictionary` that stores a Datadog Span using
-    the `(task_id, is_publish)` as a key. This is useful when information must be
-    propagated from one Celery signal to another.
+    The span is stored on the request of the task (`task.request`): Celery creates a request for each execution of a
+    task and keeps it from the `task_prerun` to the `task_postrun` signals, so the span does not need to be tracked
+    separately and is released with the request.
 
-    DEV: We use (task_id, is_publish) for the key to ensure that publishing a
-         task from within another task does not cause any conflicts.
-
-         This mostly happens when either a task fails and a retry policy is in place,
-         or when a task is manually retried (e.g. `task.retry()`), we end up trying
-         to publish a task with the same id as the task currently running.
-
-         Previously publishing the new task would overwrite the existing `celery.run` span
-         in the `weak_dict` causing that span to be forgotten and never finished.
-
-         NOTE: We cannot test for this well yet, because we do not run a celery worker,
-         and cannot run `task.apply_async()`
+    DEV: Spans of published tasks are not attached: publishing a task from within another one (e.g. `task.retry()`)
+         happens in the request of the running task.
     """
-    weak_dict = getattr(task, CTX_KEY, None)
-    if weak_dict is None:
-        weak_dict = WeakValueDictionary()
-        setattr(task, CTX_KEY, weak_dict)
-
-    weak_dict[(task_id, is_publish)] = span
+    setattr(request, CTX_KEY, span)
 
 
-def detach_span(task, task_id, is_publish=False):
-    """Helper to remove a `Span` in a Celery task when it's propagated.
-    This function handles tasks where the `Span` is not attached.
+def detach_span(request):
+    # type: (Any) -> None
+    """Helper to remove the `Span` attached to the request of a task.
+    This function handles requests where the `Span` is not attached.
     """
-    weak_dict = getattr(task, CTX_KEY, None)
-    if weak_dict is None:
-        return
-
-    # DEV: See note in `attach_span` for key info
     try:
-        del weak_dict[(task_id, is_publish)]
-    except KeyError:
+        delattr(request, CTX_KEY)
+    except AttributeError:
         pass
 
 
-def retrieve_span(task, task_id, is_publish=False):
-    """Helper to retrieve an active `Span` stored in a `Task`
-    instance
-    """
-    weak_dict = getattr(task, CTX_KEY, None)
-    if weak_dict is None:
-        return
-    else:
-        # DEV: See note in `attach_span` for key info
-        return weak_dict.get((task_id, is_publish))
+def retrieve_span(request):
+    # type: (Any) -> Optional[Span]
+    """Helper to retrieve the `Span` attached to the request of a task"""
+    return getattr(request, CTX_KEY, None)
 
 
 def retrieve_task_id(context):
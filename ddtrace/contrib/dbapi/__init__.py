@@ -1,6 +1,10 @@
 """
 Generic dbapi tracing code.
 """
+import sys
+from typing import Dict
+from typing import Optional
+
 import six
 
 from ddtrace import config
@@ -9,6 +13,7 @@ from ...constants import ANALYTICS_SAMPLE_RATE_KEY
 from ...constants import SPAN_MEASURED_KEY
 from ...ext import SpanTypes
 from ...ext import sql
+from ...internal.compat import monotonic_ns
 from ...internal.logger import get_logger
 from ...pin import Pin
 from ...vendor import wrapt
@@ -28,17 +33,31 @@ config._add(
 )
 
 
+# Rows sampled to estimate the time spent fetching, and the size of, the rows iterated over from a cursor
+FETCH_SAMPLING_INTERVAL = 100
+
+
 class TracedCursor(wrapt.ObjectProxy):
     """TracedCursor wraps a psql cursor and traces its queries."""
 
+    # Whether the analytics sample rate is set on the spans
+    _self_analytics = True
+
     def __init__(self, cursor, pin, cfg):
         super(TracedCursor, self).__init__(cursor)
-        pin.onto(self)
-        name = pin.app or "sql"
-        self._self_datadog_name = "{}.query".format(name)
+        # DEV: the pin is usually the pin of the connection: keep a reference instead of using `pin.onto(self)`,
+        #      which would retarget the pin and make the connection clone it when creating the next cursor.
+        self._self_pin = pin
+        self._self_datadog_name = _query_span_name(pin.app)
         self._self_last_execute_operation = None
         self._self_config = cfg or config.dbapi2
 
+    def __getddpin__(self):
+        return self._self_pin
+
+    def __setddpin__(self, pin):
+        self._self_pin = pin
+
     def _trace_method(self, method, name, resource, extra_tags, *args, **kwargs):
         """
         Internal function to trace the call to the underlying cursor method
@@ -50,8 +69,8 @@ class TracedCursor(wrapt.ObjectProxy):
         :param kwargs: The args that will be passed as kwargs to the wrapped method
         :return: The result of the wrapped method invocation
         """
-        pin = Pin.get_from(self)
-        if not pin or not pin.enabled():
+        pin = self._self_pin
+        if not pin or not pin.enabled() or self._self_config._collapse_span(pin.tracer):
             return method(*args, **kwargs)
         measured = name == self._self_datadog_name
 
@@ -59,15 +78,19 @@ class TracedCursor(wrapt.ObjectProxy):
             name, service=ext_service(pin, self._self_config), resource=resource, span_type=SpanTypes.SQL
         ) as s:
             if measured:
-                s.set_tag(SPAN_MEASURED_KEY)
+                s.metrics[SPAN_MEASURED_KEY] = 1
             # No reason to tag the query since it is set as the resource by the agent. See:
             # https://github.com/DataDog/datadog-trace-agent/blob/bda1ebbf170dd8c5879be993bdd4dbae70d10fda/obfuscate/sql.go#L232
-            s.set_tags(pin.tags)
-            s.set_tags(extra_tags)
+            if pin.tags:
+                s.set_tags(pin.tags)
+            if extra_tags:
+                s.set_tags(extra_tags)
 
             # set analytics sample rate if enabled but only for non-FetchTracedCursor
-            if not isinstance(self, FetchTracedCursor):
-                s.set_tag(ANALYTICS_SAMPLE_RATE_KEY, self._self_config.get_analytics_sample_rate())
+            if self._self_analytics:
+                analytics_sr = self._self_config.get_analytics_sample_rate()
+                if analytics_sr is not None:
+                    s.set_tag(ANALYTICS_SAMPLE_RATE_KEY, analytics_sr)
 
             try:
                 return method(*args, **kwargs)
@@ -90,14 +113,12 @@ class TracedCursor(wrapt.ObjectProxy):
         #      These differences should be overridden at the integration specific layer (e.g. in `sqlite3/patch.py`)
         # FIXME[matt] properly handle kwargs here. arg names can be different
         # with different libs.
+        extra_tags = {"sql.executemany": "true"}
+        # DEV: the parameters can also be a generator, whose size is unknown until it is consumed
+        if args and isinstance(args[0], (list, tuple)):
+            extra_tags["db.executemany.size"] = len(args[0])
         return self._trace_method(
-            self.__wrapped__.executemany,
-            self._self_datadog_name,
-            query,
-            {"sql.executemany": "true"},
-            query,
-            *args,
-            **kwargs
+            self.__wrapped__.executemany, self._self_datadog_name, query, extra_tags, query, *args, **kwargs
         )
 
     def execute(self, query, *args, **kwargs):
@@ -126,11 +147,14 @@ class TracedCursor(wrapt.ObjectProxy):
 
 class FetchTracedCursor(TracedCursor):
     """
-    Sub-class of :class:`TracedCursor` that also instruments `fetchone`, `fetchall`, and `fetchmany` methods.
+    Sub-class of :class:`TracedCursor` that also instruments `fetchone`, `fetchall`, and `fetchmany` methods, and the
+    iteration over the rows of the cursor.
 
     We do not trace these functions by default since they can get very noisy (e.g. `fetchone` with 100k rows).
     """
 
+    _self_analytics = False
+
     def fetchone(self, *args, **kwargs):
         """Wraps the cursor.fetchone method"""
         span_name = "{}.{}".format(self._self_datadog_name, "fetchone")
@@ -163,6 +187,67 @@ class FetchTracedCursor(TracedCursor):
             self.__wrapped__.fetchmany, span_name, self._self_last_execute_operation, extra_tags, *args, **kwargs
         )
 
+    def __iter__(self):
+        """Traces the iteration over the rows of the cursor with a single span"""
+        pin = self._self_pin
+        if not pin or not pin.enabled():
+            return iter(self.__wrapped__)
+        return self._trace_rows(pin, iter(self.__wrapped__))
+
+    def _trace_rows(self, pin, rows):
+        """Yield the given rows, tracing the whole iteration with a single span.
+
+        Only one fetch every ``FETCH_SAMPLING_INTERVAL`` rows is timed, and only the size of one row every
+        ``FETCH_SAMPLING_INTERVAL`` rows is computed: the duration and size of the fetch are extrapolated from these
+        samples. The size is sampled from the first row of each interval, but the fetch timed is the last one of the
+        interval: the first fetch pays for the execution of the query and the warm-up of the cursor. The duration is
+        therefore only reported once ``FETCH_SAMPLING_INTERVAL`` rows have been fetched.
+        """
+        tracer = pin.tracer
+        # DEV: the span is not activated since the iteration can be suspended at any row
+        span = tracer.start_span(
+            "{}.{}".format(self._self_datadog_name, "iter"),
+            child_of=tracer.context_provider.active(),
+            service=ext_service(pin, self._self_config),
+            resource=self._self_last_execute_operation,
+            span_type=SpanTypes.SQL,
+        )
+        if pin.tags:
+            span.set_tags(pin.tags)
+
+        count = size_samples = sampled_size = duration_samples = sampled_duration = 0
+        try:
+            while True:
+                phase = count % FETCH_SAMPLING_INTERVAL
+                if phase == FETCH_SAMPLING_INTERVAL - 1:
+                    start = monotonic_ns()
+                    row = next(rows)
+                    # DEV: the end of the iteration is not a row fetch, it is not accounted
+                    sampled_duration += monotonic_ns() - start
+                    duration_samples += 1
+                else:
+                    row = next(rows)
+                    if not phase:
+                        size_samples += 1
+                        sampled_size += _row_size(row)
+                count += 1
+                yield row
+        except StopIteration:
+            pass
+        except GeneratorExit:
+            # The iteration was stopped before the last row
+            raise
+        except Exception:
+            span.set_exc_info(*sys.exc_info())
+            raise
+        finally:
+            span.set_tag(sql.ROWS, count)
+            if size_samples:
+                span.set_metric("db.fetch.bytes", sampled_size * count // size_samples)
+            if duration_samples:
+                span.set_metric("db.fetch.duration", sampled_duration * count // duration_samples)
+            span.finish()
+
 
 class TracedConnection(wrapt.ObjectProxy):
     """TracedConnection wraps a Connection with tracing code."""
@@ -185,6 +270,13 @@ class TracedConnection(wrapt.ObjectProxy):
         self._self_cursor_cls = cursor_cls
         self._self_config = cfg
 
+    def __getddpin__(self):
+        return self._self_pin
+
+    def __setddpin__(self, pin):
+        # DEV: the pin is shared with the cursors of the connection
+        self._self_pin = pin
+
     def __enter__(self):
         """Context management is not defined by the dbapi spec.
 
@@ -218,7 +310,7 @@ class TracedConnection(wrapt.ObjectProxy):
             if iswrapped(r):
                 return r
             else:
-                pin = Pin.get_from(self)
+                pin = self._self_pin
                 if not pin:
                     return r
                 return self._self_cursor_cls(r, pin, self._self_config)
@@ -228,19 +320,21 @@ class TracedConnection(wrapt.ObjectProxy):
             return r
 
     def _trace_method(self, method, name, extra_tags, *args, **kwargs):
-        pin = Pin.get_from(self)
-        if not pin or not pin.enabled():
+        pin = self._self_pin
+        if not pin or not pin.enabled() or self._self_config._collapse_span(pin.tracer):
             return method(*args, **kwargs)
 
         with pin.tracer.trace(name, service=ext_service(pin, self._self_config)) as s:
-            s.set_tags(pin.tags)
-            s.set_tags(extra_tags)
+            if pin.tags:
+                s.set_tags(pin.tags)
+            if extra_tags:
+                s.set_tags(extra_tags)
 
             return method(*args, **kwargs)
 
     def cursor(self, *args, **kwargs):
         cursor = self.__wrapped__.cursor(*args, **kwargs)
-        pin = Pin.get_from(self)
+        pin = self._self_pin
         if not pin:
             return cursor
         return self._self_cursor_cls(cursor, pin, self._self_config)
@@ -254,6 +348,31 @@ class TracedConnection(wrapt.ObjectProxy):
         return self._trace_method(self.__wrapped__.rollback, span_name, {}, *args, **kwargs)
 
 
+def _query_span_name(app):
+    """Return the name of the query spans of the cursors of the given app."""
+    name = _QUERY_SPAN_NAMES.get(app)
+    if name is None:
+        name = _QUERY_SPAN_NAMES[app] = "{}.query".format(app or "sql")
+    return name
+
+
+# The number of apps is bounded by the number of integrations
+_QUERY_SPAN_NAMES = {}  # type: Dict[Optional[str], str]
+
+
+def _row_size(row):
+    """Return the size of the text and binary values of the given row."""
+    try:
+        values = row.values() if isinstance(row, dict) else iter(row)
+    except TypeError:
+        return 0
+    size = 0
+    for value in values:
+        if isinstance(value, (six.text_type, six.binary_type, bytearray)):
+            size += len(value)
+    return size
+
+
 def _get_vendor(conn):
     """Return the vendor (e.g postgres, mysql) of the given
     database.
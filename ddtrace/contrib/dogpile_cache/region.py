@@ -1,5 +1,6 @@
 import dogpile
 
+from ddtrace import config
 from ddtrace.ext import SpanTypes
 
 from ...constants import SPAN_MEASURED_KEY
@@ -9,7 +10,7 @@ from ...utils import get_argument_value
 
 def _wrap_get_create(func, instance, args, kwargs):
     pin = Pin.get_from(dogpile.cache)
-    if not pin or not pin.enabled():
+    if not pin or not pin.enabled() or config.dogpile_cache._collapse_span(pin.tracer):
         return func(*args, **kwargs)
 
     key = get_argument_value(args, kwargs, 0, "key")
@@ -23,7 +24,7 @@ def _wrap_get_create(func, instance, args, kwargs):
 
 def _wrap_get_create_multi(func, instance, args, kwargs):
     pin = Pin.get_from(dogpile.cache)
-    if not pin or not pin.enabled():
+    if not pin or not pin.enabled() or config.dogpile_cache._collapse_span(pin.tracer):
         return func(*args, **kwargs)
 
     keys = get_argument_value(args, kwargs, 0, "keys")
@@ -18,6 +18,26 @@
     es = Elasticsearch(port=ELASTICSEARCH_CONFIG['port'])
     Pin.override(es.transport, service='elasticsearch-videos')
     es.indices.create(index='videos', ignore=400)
+
+Configuration
+~~~~~~~~~~~~~
+
+.. py:data:: ddtrace.config.elasticsearch['index_patterns']
+
+   The regular expressions matching the variable parts of the index names, e.g. the dates of timestamped indexes.
+   They are replaced by ``?`` in the resources of the spans, along with the document IDs.
+
+   Can also be set with the ``DD_ELASTICSEARCH_INDEX_PATTERNS`` environment variable, the patterns being separated
+   by spaces.
+
+   Default: ``["[0-9]{2,}"]``
+
+Example::
+
+    from ddtrace import config
+
+    # Quantize the indexes named after the day, e.g. ``logs-2021.05.04``
+    config.elasticsearch['index_patterns'] = [r"[0-9]{4}[.][0-9]{2}[.][0-9]{2}"]
 """
 from .patch import patch
 
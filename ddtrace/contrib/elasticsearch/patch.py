@@ -10,8 +10,26 @@ from ...ext import elasticsearch as metadata
 from ...ext import http
 from ...internal.compat import urlencode
 from ...pin import Pin
+from ...utils.formats import get_env
 from ...utils.wrappers import unwrap as _u
-from .quantize import quantize
+from .quantize import DEFAULT_INDEX_PATTERNS
+from .quantize import get_quantizer
+
+
+def _get_index_patterns():
+    patterns = get_env("elasticsearch", "index_patterns")
+    if patterns is None:
+        return DEFAULT_INDEX_PATTERNS
+    # DEV: the patterns are separated by spaces, as a comma can be part of a pattern
+    return patterns.split()
+
+
+config._add(
+    "elasticsearch",
+    {
+        "index_patterns": _get_index_patterns(),
+    },
+)
 
 
 def _es_modules():
@@ -81,13 +99,16 @@ def _get_perform_request(elasticsearch):
                 span.set_tag(http.QUERY_STRING, encoded_params)
 
             if method in ["GET", "POST"]:
-                span.set_tag(metadata.BODY, instance.serializer.dumps(body))
+                serialized_body = instance.serializer.dumps(body)
+                span.set_tag(metadata.BODY, serialized_body)
+                if serialized_body is not None:
+                    span.set_metric(metadata.BODY_SIZE, len(serialized_body))
             status = None
 
             # set analytics sample rate
             span.set_tag(ANALYTICS_SAMPLE_RATE_KEY, config.elasticsearch.get_analytics_sample_rate())
 
-            span = quantize(span)
+            span.resource = get_quantizer(config.elasticsearch.index_patterns).resource(method, url)
 
             try:
                 result = func(*args, **kwargs)
@@ -106,6 +127,7 @@ def _get_perform_request(elasticsearch):
                     # that just returns the body
                     data = result
 
+                # DEV: the body is already deserialized by the transport
                 took = data.get("took")
                 if took:
                     span.set_metric(metadata.TOOK, int(took))
@@ -1,16 +1,72 @@
 import re
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Pattern
+from typing import Tuple
+from typing import Union
+
+from ddtrace import config
 
 from ...ext import elasticsearch as metadata
+from ...utils.cache import LRUCache
 
 
 # Replace any ID
 ID_REGEXP = re.compile(r"/([0-9]+)([/\?]|$)")
 ID_PLACEHOLDER = r"/?\2"
 
-# Remove digits from potential timestamped indexes (should be an option).
-# For now, let's say 2+ digits
+# Remove digits from potential timestamped indexes.
+# By default, let's say 2+ digits
 INDEX_REGEXP = re.compile(r"[0-9]{2,}")
 INDEX_PLACEHOLDER = r"?"
+DEFAULT_INDEX_PATTERNS = [INDEX_REGEXP.pattern]
+
+
+class Quantizer(object):
+    """Compute the resources of the requests from their method and URL.
+
+    The resources are cached per method and raw path: most requests target a few paths, e.g. the bulk API of the
+    indexes of the day.
+    """
+
+    def __init__(self, index_patterns, maxsize=1024):
+        # type: (Iterable[Union[str, Pattern[str]]], int) -> None
+        self.index_patterns = list(index_patterns)
+        # DEV: a single regular expression replaces the parts of the URL matching any of the patterns
+        self._index_regexp = (
+            re.compile("|".join("(?:%s)" % getattr(p, "pattern", p) for p in self.index_patterns))
+            if self.index_patterns
+            else None
+        )  # type: Optional[Pattern[str]]
+        self._cache = LRUCache(maxsize)
+
+    def _quantize(self, request):
+        # type: (Tuple[str, str]) -> str
+        method, url = request
+        quantized_url = ID_REGEXP.sub(ID_PLACEHOLDER, url)
+        if self._index_regexp is not None:
+            quantized_url = self._index_regexp.sub(INDEX_PLACEHOLDER, quantized_url)
+        return " ".join((method, quantized_url))
+
+    def resource(self, method, url):
+        # type: (str, str) -> str
+        """Return the resource of a request."""
+        return self._cache.get_or_compute((method, url), self._quantize)
+
+
+_quantizer = None  # type: Optional[Quantizer]
+
+
+def get_quantizer(index_patterns):
+    # type: (List[Union[str, Pattern[str]]]) -> Quantizer
+    """Return the quantizer of the index patterns, creating a new one when they changed."""
+    global _quantizer
+
+    quantizer = _quantizer
+    if quantizer is None or quantizer.index_patterns != index_patterns:
+        quantizer = _quantizer = Quantizer(index_patterns)
+    return quantizer
 
 
 def quantize(span):
@@ -20,16 +76,12 @@ def quantize(span):
     We do it based on the method + url, with some cleanup applied to the URL.
 
     The URL might a ID, but also it is common to have timestamped indexes.
-    While the first is easy to catch, the second should probably be configurable.
-
-    All of this should probably be done in the Agent. Later.
+    While the first is easy to catch, the second is configured with
+    ``config.elasticsearch['index_patterns']``.
     """
     url = span.get_tag(metadata.URL)
     method = span.get_tag(metadata.METHOD)
 
-    quantized_url = ID_REGEXP.sub(ID_PLACEHOLDER, url)
-    quantized_url = INDEX_REGEXP.sub(INDEX_PLACEHOLDER, quantized_url)
-
-    span.resource = "{method} {url}".format(method=method, url=quantized_url)
+    span.resource = get_quantizer(config.elasticsearch.index_patterns).resource(method, url)
 
     return span
@@ -37,6 +37,32 @@ Global Configuration
 
    Default: ``"grpc-server"``
 
+.. py:data:: ddtrace.config.grpc["stream_sample_rate"]
+             ddtrace.config.grpc_server["stream_sample_rate"]
+
+   The rate of the response messages of streaming RPCs whose size is computed, on the client and server
+   respectively. The other messages are only counted: the ``grpc.stream.messages`` and ``grpc.stream.bytes``
+   metrics of the span report the number of messages and an estimate of the bytes streamed. ``0`` disables the
+   estimation of the bytes streamed.
+
+   This option can also be set with the ``DD_GRPC_STREAM_SAMPLE_RATE`` and
+   ``DD_GRPC_SERVER_STREAM_SAMPLE_RATE`` environment variables.
+
+   Default: ``0.01``
+
+.. py:data:: ddtrace.config.grpc["stream_span_interval"]
+             ddtrace.config.grpc_server["stream_span_interval"]
+
+   The interval, in seconds, at which long-lived streaming RPCs report a ``grpc.stream`` span with the metrics of
+   the messages streamed since the previous one. These spans are the roots of their own traces, linked to the RPC
+   span with the ``grpc.stream.rpc.trace_id`` and ``grpc.stream.rpc.span_id`` tags: they are sent as soon as they
+   are finished, which makes the activity of a stream visible before the stream ends. ``0`` disables these spans.
+
+   This option can also be set with the ``DD_GRPC_STREAM_SPAN_INTERVAL`` and
+   ``DD_GRPC_SERVER_STREAM_SPAN_INTERVAL`` environment variables.
+
+   Default: ``0``
+
 
 Instance Configuration
 ~~~~~~~~~~~~~~~~~~~~~~
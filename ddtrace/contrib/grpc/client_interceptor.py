@@ -115,9 +115,10 @@ def _handle_error(span, response_error, status_code):
 
 
 class _WrappedResponseCallFuture(wrapt.ObjectProxy):
-    def __init__(self, wrapped, span):
+    def __init__(self, wrapped, span, messages):
         super(_WrappedResponseCallFuture, self).__init__(wrapped)
         self._span = span
+        self._self_messages = messages
         # Registers callback on the _MultiThreadedRendezvous future to finish
         # span in case StopIteration is never raised but RPC is terminated
         _handle_response(self._span, self.__wrapped__)
@@ -134,7 +135,7 @@ class _WrappedResponseCallFuture(wrapt.ObjectProxy):
         # https://github.com/googleapis/python-api-core/blob/35e87e0aca52167029784379ca84e979098e1d6c/google/api_core/grpc_helpers.py#L84
         # https://github.com/GoogleCloudPlatform/grpc-gcp-python/blob/5a2cd9807bbaf1b85402a2a364775e5b65853df6/src/grpc_gcp/_channel.py#L102
         try:
-            return next(self.__wrapped__)
+            message = next(self.__wrapped__)
         except StopIteration:
             # Callback will handle span finishing
             raise
@@ -151,10 +152,16 @@ class _WrappedResponseCallFuture(wrapt.ObjectProxy):
             self._span.finish()
             raise
 
-    def __next__(self):
-        return self._next()
+        # DEV: only count the messages, see `utils._StreamMessages`
+        messages = self._self_messages
+        messages.count += 1
+        if messages.count == messages.next_sample:
+            messages.sample(message)
+        return message
 
-    next = __next__
+    # DEV: alias rather than delegate to `_next` to save a call for each message
+    __next__ = _next
+    next = _next
 
 
 class _ClientInterceptor(
@@ -233,7 +240,9 @@ class _ClientInterceptor(
             client_call_details,
         )
         response_iterator = continuation(client_call_details, request)
-        response_iterator = _WrappedResponseCallFuture(response_iterator, span)
+        response_iterator = _WrappedResponseCallFuture(
+            response_iterator, span, utils._StreamMessages(self._pin.tracer, span, config.grpc)
+        )
         return response_iterator
 
     def intercept_stream_unary(self, continuation, client_call_details, request_iterator):
@@ -259,5 +268,7 @@ class _ClientInterceptor(
             client_call_details,
         )
         response_iterator = continuation(client_call_details, request_iterator)
-        response_iterator = _WrappedResponseCallFuture(response_iterator, span)
+        response_iterator = _WrappedResponseCallFuture(
+            response_iterator, span, utils._StreamMessages(self._pin.tracer, span, config.grpc)
+        )
         return response_iterator
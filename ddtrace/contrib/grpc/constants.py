@@ -20,5 +20,10 @@ GRPC_METHOD_KIND_UNARY = "unary"
 GRPC_METHOD_KIND_CLIENT_STREAMING = "client_streaming"
 GRPC_METHOD_KIND_SERVER_STREAMING = "server_streaming"
 GRPC_METHOD_KIND_BIDI_STREAMING = "bidi_streaming"
+GRPC_STREAM_MESSAGES_KEY = "grpc.stream.messages"
+GRPC_STREAM_BYTES_KEY = "grpc.stream.bytes"
+GRPC_STREAM_SPAN_NAME = "grpc.stream"
+GRPC_STREAM_RPC_TRACE_ID_KEY = "grpc.stream.rpc.trace_id"
+GRPC_STREAM_RPC_SPAN_ID_KEY = "grpc.stream.rpc.span_id"
 GRPC_SERVICE_SERVER = "grpc-server"
 GRPC_SERVICE_CLIENT = "grpc-client"
@@ -6,6 +6,7 @@ from ddtrace.vendor.wrapt import wrap_function_wrapper as _w
 
 from . import constants
 from . import utils
+from ...utils.formats import get_env
 from ...utils.wrappers import unwrap as _u
 from .client_interceptor import create_client_interceptor
 from .client_interceptor import intercept_channel
@@ -17,6 +18,8 @@ config._add(
     dict(
         _default_service=constants.GRPC_SERVICE_SERVER,
         distributed_tracing_enabled=True,
+        stream_sample_rate=float(get_env("grpc_server", "stream_sample_rate", default=0.01)),  # type: ignore[arg-type]
+        stream_span_interval=float(get_env("grpc_server", "stream_span_interval", default=0)),  # type: ignore[arg-type]
     ),
 )
 
@@ -28,6 +31,8 @@ config._add(
     dict(
         _default_service=constants.GRPC_SERVICE_CLIENT,
         distributed_tracing_enabled=True,
+        stream_sample_rate=float(get_env("grpc", "stream_sample_rate", default=0.01)),  # type: ignore[arg-type]
+        stream_span_interval=float(get_env("grpc", "stream_span_interval", default=0)),  # type: ignore[arg-type]
     ),
 )
 
@@ -10,6 +10,7 @@ from .. import trace_utils
 from ...constants import ANALYTICS_SAMPLE_RATE_KEY
 from ...constants import SPAN_MEASURED_KEY
 from ...ext import SpanTypes
+from .utils import _StreamMessages
 from .utils import set_grpc_method_meta
 
 
@@ -41,9 +42,13 @@ def _handle_server_exception(server_context, span):
         span._set_str_tag(errors.ERROR_TYPE, code)
 
 
-def _wrap_response_iterator(response_iterator, server_context, span):
+def _wrap_response_iterator(response_iterator, server_context, span, messages):
     try:
         for response in response_iterator:
+            # DEV: only count the messages, see `utils._StreamMessages`
+            messages.count += 1
+            if messages.count == messages.next_sample:
+                messages.sample(response)
             yield response
     except Exception:
         span.set_traceback()
@@ -91,7 +96,9 @@ class _TracedRpcMethodHandler(wrapt.ObjectProxy):
             response_or_iterator = behavior(*args, **kwargs)
 
             if self.__wrapped__.response_streaming:
-                response_or_iterator = _wrap_response_iterator(response_or_iterator, server_context, span)
+                response_or_iterator = _wrap_response_iterator(
+                    response_or_iterator, server_context, span, _StreamMessages(tracer, span, config.grpc_server)
+                )
         except Exception:
             span.set_traceback()
             _handle_server_exception(server_context, span)
@@ -1,6 +1,8 @@
 import logging
 
+from ddtrace.ext import SpanTypes
 from ddtrace.internal.compat import parse
+from ddtrace.internal.compat import time_ns
 
 from . import constants
 
@@ -45,6 +47,120 @@ def set_grpc_client_meta(span, host, port):
     span._set_str_tag(constants.GRPC_SPAN_KIND_KEY, constants.GRPC_SPAN_KIND_VALUE_CLIENT)
 
 
+# Number of messages between two checks of the interval of the stream spans
+STREAM_SPAN_CHECK_INTERVAL = 100
+
+
+class _StreamMessages(object):
+    """Metrics of the response messages of a streaming RPC, accumulated in its span.
+
+    The messages are only counted as they are streamed: the size of one message every ``1 / stream_sample_rate`` is
+    computed, and the number of bytes streamed is extrapolated from these samples. The metrics are set on the span
+    when it is flushed: the client span is finished when the RPC terminates, which can happen before the last
+    messages are consumed.
+
+    If ``stream_span_interval`` is set, a ``grpc.stream`` span covering the messages streamed is also created every
+    ``stream_span_interval`` seconds, checked every ``STREAM_SPAN_CHECK_INTERVAL`` messages at most whatever the
+    sample rate. The spans of a trace are only sent once they are all finished: these spans are the roots of their
+    own traces, so they are sent while the RPC is still running. They are linked to the RPC span with the
+    ``grpc.stream.rpc.trace_id`` and ``grpc.stream.rpc.span_id`` tags, and keep the sampling priority of its trace.
+
+    DEV: the span is not referenced, to avoid a reference cycle through its flush callbacks.
+    """
+
+    __slots__ = [
+        "tracer",
+        "context",
+        "service",
+        "resource",
+        "count",
+        "next_sample",
+        "sample_interval",
+        "next_bytes_sample",
+        "bytes_sample_interval",
+        "sampled",
+        "sampled_bytes",
+        "window_interval_ns",
+        "window_start_ns",
+        "window_count",
+    ]
+
+    def __init__(self, tracer, span, int_config):
+        # Number of messages streamed, and the number of the next message to check
+        self.count = 0
+        rate = int_config.stream_sample_rate
+        self.bytes_sample_interval = int(round(1.0 / rate)) if rate > 0 else 0
+        self.next_bytes_sample = 1
+        self.sampled = 0
+        self.sampled_bytes = 0
+        self.window_interval_ns = int(int_config.stream_span_interval * 1e9)
+        if self.window_interval_ns:
+            self.tracer = tracer
+            self.context = span.context
+            self.service = span.service
+            self.resource = span.resource
+            self.window_start_ns = span.start_ns
+            self.window_count = 0
+            self.sample_interval = min(
+                self.bytes_sample_interval or STREAM_SPAN_CHECK_INTERVAL, STREAM_SPAN_CHECK_INTERVAL
+            )
+        else:
+            self.sample_interval = self.bytes_sample_interval
+        self.next_sample = 1 if self.sample_interval else -1
+        span._add_on_flush_callback(self.set_metrics)
+
+    def sample(self, message):
+        """Check a message, once ``count`` reached ``next_sample``."""
+        self.next_sample += self.sample_interval
+        if self.bytes_sample_interval and self.count >= self.next_bytes_sample:
+            self.next_bytes_sample += self.bytes_sample_interval
+            self.sampled += 1
+            self.sampled_bytes += _message_size(message)
+        if self.window_interval_ns:
+            now = time_ns()
+            if now - self.window_start_ns >= self.window_interval_ns:
+                self._finish_window(now)
+
+    def _bytes(self, count):
+        return self.sampled_bytes * count // self.sampled
+
+    def _finish_window(self, now):
+        window = self.tracer.start_span(
+            constants.GRPC_STREAM_SPAN_NAME,
+            service=self.service,
+            resource=self.resource,
+            span_type=SpanTypes.GRPC,
+        )
+        window.start_ns = self.window_start_ns
+        window._set_str_tag(constants.GRPC_STREAM_RPC_TRACE_ID_KEY, str(self.context.trace_id))
+        window._set_str_tag(constants.GRPC_STREAM_RPC_SPAN_ID_KEY, str(self.context.span_id))
+        if self.context.sampling_priority is not None:
+            window.context.sampling_priority = self.context.sampling_priority
+        count = self.count - self.window_count
+        window.set_metric(constants.GRPC_STREAM_MESSAGES_KEY, count)
+        if self.sampled:
+            window.set_metric(constants.GRPC_STREAM_BYTES_KEY, self._bytes(count))
+        window.finish(now / 1e9)
+        self.window_start_ns = now
+        self.window_count = self.count
+
+    def set_metrics(self, span):
+        span.set_metric(constants.GRPC_STREAM_MESSAGES_KEY, self.count)
+        if self.sampled:
+            span.set_metric(constants.GRPC_STREAM_BYTES_KEY, self._bytes(self.count))
+
+
+def _message_size(message):
+    """Return the serialized size of a message."""
+    byte_size = getattr(message, "ByteSize", None)
+    if byte_size is not None:
+        # protobuf messages
+        return byte_size()
+    if isinstance(message, (bytes, bytearray)):
+        return len(message)
+    return 0
+
+
 def _parse_target_from_args(args, kwargs):
     if "target" in kwargs:
         target = kwargs["target"]
@@ -48,7 +48,7 @@ def unpatch():
 def _wrap_render(wrapped, instance, args, kwargs):
     """Wrap `Template.render()` or `Template.generate()`"""
     pin = Pin.get_from(instance.environment)
-    if not pin or not pin.enabled():
+    if not pin or not pin.enabled() or config.jinja2._collapse_span(pin.tracer):
         return wrapped(*args, **kwargs)
 
     template_name = instance.name or DEFAULT_TEMPLATE_NAME
@@ -63,7 +63,7 @@ def _wrap_render(wrapped, instance, args, kwargs):
 
 def _wrap_compile(wrapped, instance, args, kwargs):
     pin = Pin.get_from(instance)
-    if not pin or not pin.enabled():
+    if not pin or not pin.enabled() or config.jinja2._collapse_span(pin.tracer):
         return wrapped(*args, **kwargs)
 
     if len(args) > 1:
@@ -81,7 +81,7 @@ def _wrap_compile(wrapped, instance, args, kwargs):
 
 def _wrap_load_template(wrapped, instance, args, kwargs):
     pin = Pin.get_from(instance)
-    if not pin or not pin.enabled():
+    if not pin or not pin.enabled() or config.jinja2._collapse_span(pin.tracer):
         return wrapped(*args, **kwargs)
 
     template_name = kwargs.get("name", args[0])
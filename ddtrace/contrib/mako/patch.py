@@ -38,7 +38,7 @@ def unpatch():
 
 def _wrap_render(wrapped, instance, args, kwargs):
     pin = Pin.get_from(instance)
-    if not pin or not pin.enabled():
+    if not pin or not pin.enabled() or config.mako._collapse_span(pin.tracer):
         return wrapped(*args, **kwargs)
 
     # Determine the resource and `mako.template_name` tag value
@@ -130,7 +130,7 @@ class TracedClient(ObjectProxy):
     def _span(self, cmd_name):
         """Return a span timing the given command."""
         pin = ddtrace.Pin.get_from(self)
-        if not pin or not pin.enabled():
+        if not pin or not pin.enabled() or config.pylibmc._collapse_span(pin.tracer):
             return self._no_span()
 
         span = pin.tracer.trace(
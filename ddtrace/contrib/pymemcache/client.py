@@ -137,7 +137,7 @@ class WrappedClient(wrapt.ObjectProxy):
         p = Pin.get_from(self)
 
         # if the pin does not exist or is not enabled, shortcut
-        if not p or not p.enabled():
+        if not p or not p.enabled() or config.pymemcache._collapse_span(p.tracer):
             return method(*args, **kwargs)
 
         with p.tracer.trace(
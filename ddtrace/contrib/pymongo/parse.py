@@ -1,4 +1,3 @@
-import ctypes
 import struct
 
 # 3p
@@ -32,10 +31,46 @@ OP_CODES = {
     2013: "msg",
 }
 
-# The maximum message length we'll try to parse
-MAX_MSG_PARSE_LEN = 1024 * 1024
-
 header_struct = struct.Struct("<iiii")
+int32_struct = struct.Struct("<i")
+int64_struct = struct.Struct("<q")
+double_struct = struct.Struct("<d")
+
+# OP_MSG flag bit set when the message ends with a CRC-32C checksum
+OP_MSG_CHECKSUM_PRESENT = 1
+
+# Sizes of the BSON values with a fixed size, by type
+# http://bsonspec.org/spec.html
+BSON_FIXED_SIZES = {
+    0x01: 8,  # double
+    0x06: 0,  # undefined
+    0x07: 12,  # ObjectId
+    0x08: 1,  # boolean
+    0x09: 8,  # UTC datetime
+    0x0A: 0,  # null
+    0x10: 4,  # int32
+    0x11: 8,  # timestamp
+    0x12: 8,  # int64
+    0x13: 16,  # decimal128
+    0x7F: 0,  # max key
+    0xFF: 0,  # min key
+}
+# Types of the BSON values prefixed with their int32 size (including the size itself)
+BSON_SIZED_TYPES = frozenset((0x03, 0x04, 0x0F))  # document, array, code with scope
+# Types of the BSON values prefixed with the int32 size of the string following the size
+BSON_STRING_TYPES = frozenset((0x02, 0x0D, 0x0E))  # string, JavaScript code, symbol
+
+SON_CODEC_OPTIONS = CodecOptions(SON)
+
+# Maximum number of written documents counted for a command: past it, the count is a lower limit
+MAX_COUNTED_DOCUMENTS = 100
+
+# Fields of the commands, inline or in OP_MSG document sequences, holding the documents written
+DOCUMENTS_FIELDS = {
+    "insert": b"documents",
+    "update": b"updates",
+    "delete": b"deletes",
+}
 
 
 class Command(object):
@@ -59,6 +94,10 @@ def parse_msg(msg_bytes):
     """Return a command from a binary mongo db message or None if we shouldn't
     trace it. The protocol is documented here:
     http://docs.mongodb.com/manual/reference/mongodb-wire-protocol
+
+    Only the message headers and the top-level fields of the command document
+    are read: the documents sent along with the command are neither copied
+    nor decoded, except for the query of the first update or delete.
     """
     # NOTE[matt] this is used for queries in pymongo <= 3.0.0 and for inserts
     # in up to date versions.
@@ -83,33 +122,26 @@ def parse_msg(msg_bytes):
         # NOTE[matt] inserts, updates and queries can all use this opcode
 
         offset += 4  # skip flags
-        ns = _cstring(msg_bytes[offset:])
-        offset += len(ns) + 1  # include null terminator
+        ns_end = msg_bytes.index(b"\x00", offset)
+        ns = msg_bytes[offset:ns_end]
+        offset = ns_end + 1  # include null terminator
 
         # note: here coll could be '$cmd' because it can be overridden in the
         # query itself (like {'insert':'songs'})
         db, coll = _split_namespace(ns)
 
         offset += 8  # skip numberToSkip & numberToReturn
-        if msg_len <= MAX_MSG_PARSE_LEN:
-            # FIXME[matt] don't try to parse large messages for performance
-            # reasons. ideally we'd just peek at the first bytes to get
-            # the critical info (op type, collection, query, # of docs)
-            # rather than parse the whole thing. i suspect only massive
-            # inserts will be affected.
-            codec = CodecOptions(SON)
-            spec = next(bson.decode_iter(msg_bytes[offset:], codec_options=codec))
-            cmd = parse_spec(spec, db)
-        else:
-            # let's still note that a command happened.
-            cmd = Command("command", db, "untraced_message_too_large")
+        cmd = _parse_document(msg_bytes, offset, db)
 
         # If the command didn't contain namespace info, set it here.
-        if not cmd.coll:
+        if cmd and not cmd.coll:
             cmd.coll = coll
     elif op == "msg":
-        # Skip header and flag bits
+        # Read the flag bits
+        flags = int32_struct.unpack_from(msg_bytes, offset)[0]
         offset += 4
+        if flags & OP_MSG_CHECKSUM_PRESENT:
+            msg_len -= 4
 
         # Parse the msg kind
         kind = ord(msg_bytes[offset : offset + 1])
@@ -119,22 +151,155 @@ def parse_msg(msg_bytes):
         #   - 0: BSON Object
         #   - 1: Document Sequence
         if kind == 0:
-            if msg_len <= MAX_MSG_PARSE_LEN:
-                codec = CodecOptions(SON)
-                spec = next(bson.decode_iter(msg_bytes[offset:], codec_options=codec))
-                cmd = parse_spec(spec, db)
-            else:
-                # let's still note that a command happened.
-                cmd = Command("command", db, "untraced_message_too_large")
+            cmd = _parse_document(msg_bytes, offset, db)
+            if cmd:
+                _parse_document_sequences(
+                    msg_bytes, offset + int32_struct.unpack_from(msg_bytes, offset)[0], msg_len, cmd
+                )
         else:
             # let's still note that a command happened.
             cmd = Command("command", db, "unsupported_msg_kind")
 
     if cmd:
-        cmd.metrics[netx.BYTES_OUT] = msg_len
+        cmd.metrics[netx.BYTES_OUT] = len(msg_bytes)
     return cmd
 
 
+def _parse_document(msg_bytes, offset, db):
+    """Return a Command from the top-level fields of the BSON command document
+    starting at ``offset``, without decoding its nested documents.
+    """
+    cmd = None
+    for type_, key, value_offset, value_end in _iter_elements(msg_bytes, offset):
+        if cmd is None:
+            # the first element is the command and collection
+            cmd = Command(key.decode("utf-8"), db, _read_value(msg_bytes, type_, value_offset))
+        elif key == b"$db":
+            cmd.db = cmd.db or _read_value(msg_bytes, type_, value_offset)
+        elif key == b"ordered":
+            cmd.tags["mongodb.ordered"] = _read_value(msg_bytes, type_, value_offset)
+        elif type_ == 0x04 and key == DOCUMENTS_FIELDS.get(cmd.name):
+            # Documents sent inline, as the elements of an array
+            if cmd.name == "insert":
+                count = 0
+                for _ in _iter_elements(msg_bytes, value_offset):
+                    if count == MAX_COUNTED_DOCUMENTS:
+                        _set_documents_count(cmd, count, False)
+                        break
+                    count += 1
+                else:
+                    _set_documents_count(cmd, count, True)
+            else:
+                for _, _, doc_offset, _ in _iter_elements(msg_bytes, value_offset):
+                    cmd.query = _read_query(msg_bytes, doc_offset)
+                    break
+
+    return cmd
+
+
+def _parse_document_sequences(msg_bytes, offset, msg_len, cmd):
+    """Record the documents of the OP_MSG document sequences starting at ``offset``."""
+    while offset < msg_len:
+        kind = ord(msg_bytes[offset : offset + 1])
+        if kind != 1:
+            log.debug("unexpected OP_MSG section kind: %s", kind)
+            return
+        # The size includes itself and the identifier but not the kind
+        sequence_end = offset + 1 + int32_struct.unpack_from(msg_bytes, offset + 1)[0]
+        identifier_end = msg_bytes.index(b"\x00", offset + 5)
+        if msg_bytes[offset + 5 : identifier_end] == DOCUMENTS_FIELDS.get(cmd.name):
+            if cmd.name == "insert":
+                _set_documents_count(cmd, *_count_documents(msg_bytes, identifier_end + 1, sequence_end))
+            elif identifier_end + 1 < sequence_end:
+                cmd.query = _read_query(msg_bytes, identifier_end + 1)
+        offset = sequence_end
+
+
+def _count_documents(msg_bytes, offset, end, _unpack_from=int32_struct.unpack_from):
+    """Return the number of the BSON documents stored between ``offset`` and
+    ``end``, reading only their sizes, and whether they were all counted.
+
+    At most ``MAX_COUNTED_DOCUMENTS`` documents are counted so the cost does
+    not grow with the size of the bulk writes.
+    """
+    count = 0
+    while offset < end:
+        if count == MAX_COUNTED_DOCUMENTS:
+            return count, False
+        offset += _unpack_from(msg_bytes, offset)[0]
+        count += 1
+    return count, True
+
+
+def _set_documents_count(cmd, count, complete):
+    """Record the number of documents written by the command."""
+    cmd.metrics["mongodb.documents"] = count
+    if not complete:
+        # The command writes more documents than counted
+        cmd.tags["mongodb.documents.truncated"] = "true"
+
+
+def _read_query(msg_bytes, offset):
+    """Return the query of the update or delete document starting at ``offset``."""
+    # FIXME[matt] is there ever more than one here?
+    for type_, key, value_offset, value_end in _iter_elements(msg_bytes, offset):
+        if type_ == 0x03 and key == b"q":
+            # DEV: only the query is copied and decoded
+            return next(bson.decode_iter(msg_bytes[value_offset:value_end], codec_options=SON_CODEC_OPTIONS))
+    return None
+
+
+def _iter_elements(msg_bytes, offset):
+    """Iterate over the type, key, value offset and value end offset of the
+    top-level elements of the BSON document starting at ``offset``.
+    """
+    doc_end = offset + int32_struct.unpack_from(msg_bytes, offset)[0] - 1  # exclude the null terminator
+    offset += 4
+    while offset < doc_end:
+        type_ = ord(msg_bytes[offset : offset + 1])
+        key_end = msg_bytes.index(b"\x00", offset + 1)
+        value_offset = key_end + 1
+        value_end = _skip_value(msg_bytes, type_, value_offset)
+        yield type_, msg_bytes[offset + 1 : key_end], value_offset, value_end
+        offset = value_end
+
+
+def _skip_value(msg_bytes, type_, offset):
+    """Return the offset following the BSON value of the given type at ``offset``."""
+    size = BSON_FIXED_SIZES.get(type_)
+    if size is not None:
+        return offset + size
+    if type_ in BSON_STRING_TYPES:
+        return offset + 4 + int32_struct.unpack_from(msg_bytes, offset)[0]
+    if type_ in BSON_SIZED_TYPES:
+        return offset + int32_struct.unpack_from(msg_bytes, offset)[0]
+    if type_ == 0x05:  # binary
+        return offset + 5 + int32_struct.unpack_from(msg_bytes, offset)[0]
+    if type_ == 0x0B:  # regular expression: pattern and options cstrings
+        return msg_bytes.index(b"\x00", msg_bytes.index(b"\x00", offset) + 1) + 1
+    if type_ == 0x0C:  # DBPointer: string and ObjectId
+        return offset + 4 + int32_struct.unpack_from(msg_bytes, offset)[0] + 12
+    raise ValueError("unknown BSON type: %s" % type_)
+
+
+def _read_value(msg_bytes, type_, offset):
+    """Return the scalar BSON value of the given type at ``offset``, or None
+    for the other types.
+    """
+    if type_ == 0x02:
+        size = int32_struct.unpack_from(msg_bytes, offset)[0]
+        return msg_bytes[offset + 4 : offset + 3 + size].decode("utf-8")
+    if type_ == 0x10:
+        return int32_struct.unpack_from(msg_bytes, offset)[0]
+    if type_ == 0x12:
+        return int64_struct.unpack_from(msg_bytes, offset)[0]
+    if type_ == 0x01:
+        return double_struct.unpack_from(msg_bytes, offset)[0]
+    if type_ == 0x08:
+        return msg_bytes[offset : offset + 1] == b"\x01"
+    return None
+
+
 def parse_query(query):
     """Return a command parsed from the given mongo db query."""
     db, coll = None, None
@@ -187,11 +352,6 @@ def parse_spec(spec, db=None):
     return cmd
 
 
-def _cstring(raw):
-    """Return the first null terminated cstring from the buffer."""
-    return ctypes.create_string_buffer(raw).value
-
-
 def _split_namespace(ns):
     """Return a tuple of (db, collection) from the 'db.coll' string."""
     if ns:
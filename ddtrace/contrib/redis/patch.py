@@ -1,3 +1,5 @@
+import functools
+
 import redis
 
 from ddtrace import config
@@ -11,7 +13,8 @@ from ...ext import redis as redisx
 from ...pin import Pin
 from ...utils.wrappers import unwrap
 from .util import _extract_conn_tags
-from .util import format_command_args
+from .util import _set_command_tags
+from .util import _set_pipeline_tags
 
 
 config._add("redis", dict(_default_service="redis"))
@@ -72,9 +75,7 @@ def traced_execute_command(func, instance, args, kwargs):
         redisx.CMD, service=trace_utils.ext_service(pin, config.redis, pin), span_type=SpanTypes.REDIS
     ) as s:
         s.set_tag(SPAN_MEASURED_KEY)
-        query = format_command_args(args)
-        s.resource = query
-        s.set_tag(redisx.RAWCMD, query)
+        s._add_on_flush_callback(functools.partial(_set_command_tags, args))
         if pin.tags:
             s.set_tags(pin.tags)
         s.set_tags(_get_tags(instance))
@@ -99,17 +100,16 @@ def traced_execute_pipeline(func, instance, args, kwargs):
         return func(*args, **kwargs)
 
     # FIXME[matt] done in the agent. worth it?
-    cmds = [format_command_args(c) for c, _ in instance.command_stack]
-    resource = "\n".join(cmds)
+    # DEV: the command stack is cleared once executed
+    cmds = [c for c, _ in instance.command_stack]
     tracer = pin.tracer
     with tracer.trace(
         redisx.CMD,
-        resource=resource,
         service=trace_utils.ext_service(pin, config.redis),
         span_type=SpanTypes.REDIS,
     ) as s:
         s.set_tag(SPAN_MEASURED_KEY)
-        s.set_tag(redisx.RAWCMD, resource)
+        s._add_on_flush_callback(functools.partial(_set_pipeline_tags, cmds))
         s.set_tags(_get_tags(instance))
         s.set_metric(redisx.PIPELINE_LEN, len(instance.command_stack))
 
@@ -10,6 +10,8 @@ VALUE_PLACEHOLDER = "?"
 VALUE_MAX_LEN = 100
 VALUE_TOO_LONG_MARK = "..."
 CMD_MAX_LEN = 1000
+# Pipelines with more commands get the names of their commands as resource
+PIPELINE_MAX_FORMATTED_COMMANDS = 100
 
 
 def _extract_conn_tags(conn_kwargs):
@@ -52,3 +54,38 @@ def format_command_args(args):
             break
 
     return " ".join(out)
+
+
+def format_pipeline_commands(commands):
+    """Format the commands of a pipeline, given their arguments
+
+    The commands of large pipelines are not formatted: only their distinct
+    names are kept, in order of first use.
+    """
+    if len(commands) <= PIPELINE_MAX_FORMATTED_COMMANDS:
+        return "\n".join(format_command_args(args) for args in commands)
+
+    names = []
+    seen = set()
+    for args in commands:
+        if args and args[0] not in seen:
+            seen.add(args[0])
+            names.append(format_command_args(args[:1]))
+    return "\n".join(names)
+
+
+def _set_command_tags(args, span):
+    """Set the resource and the raw command of the span of a command, given its arguments
+
+    Formatting the command is deferred until the span is sent, see ``Span._add_on_flush_callback``.
+    """
+    query = format_command_args(args)
+    span.resource = query
+    span._set_str_tag(redisx.RAWCMD, query)
+
+
+def _set_pipeline_tags(commands, span):
+    """Set the resource and the raw command of the span of a pipeline, given the arguments of its commands"""
+    resource = format_pipeline_commands(commands)
+    span.resource = resource
+    span._set_str_tag(redisx.RAWCMD, resource)
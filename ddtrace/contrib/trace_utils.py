@@ -17,6 +17,7 @@ from ddtrace import config
 from ddtrace.ext import http
 from ddtrace.internal.logger import get_logger
 from ddtrace.propagation.http import HTTPPropagator
+from ddtrace.utils.cache import LRUCache
 from ddtrace.utils.cache import cached
 from ddtrace.utils.http import normalize_header_name
 from ddtrace.utils.http import strip_query_string
@@ -27,6 +28,7 @@ from ddtrace.vendor import wrapt
 if TYPE_CHECKING:
     from ddtrace import Span
     from ddtrace import Tracer
+    from ddtrace.context import Context
     from ddtrace.settings import IntegrationConfig
 
 
@@ -44,6 +46,10 @@ RESPONSE = "response"
 # starting a "new object" on the UI.
 NORMALIZE_PATTERN = re.compile(r"([^a-z0-9_\-:/]){1}")
 
+# Cache shared by the web integrations to avoid quoting the same request paths for every request.
+# Paths can contain identifiers, hence the least recently used values are evicted.
+_url_cache = LRUCache(1024)
+
 
 @cached()
 def _normalized_header_name(header_name):
@@ -280,11 +286,20 @@ def activate_distributed_headers(tracer, int_config=None, request_headers=None,
     int_config will be used to check if distributed trace headers context will be activated, but
     override will override whatever value is set in int_config if passed any value other than None.
     """
+    _activate_distributed_context(tracer, HTTPPropagator.extract, request_headers, int_config, override)
+
+
+def _activate_distributed_context(tracer, extract, carrier, int_config=None, override=None):
+    # type: (Tracer, Callable[[Any], Context], Any, Optional[IntegrationConfig], Optional[bool]) -> None
+    """Activate the context extracted from `carrier` if distributed tracing is enabled.
+
+    `extract` is the propagator method extracting the context from the carrier (e.g. HTTP headers or WSGI environ).
+    """
     if override is False:
         return None
 
     if override or (int_config and distributed_tracing_enabled(int_config)):
-        context = HTTPPropagator.extract(request_headers)
+        context = extract(carrier)
         # Only need to activate the new context if something was propagated
         if context.trace_id:
             tracer.context_provider.activate(context)
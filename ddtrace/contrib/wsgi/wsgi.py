@@ -57,8 +57,8 @@ def construct_url(environ):
             if environ["SERVER_PORT"] != "80":
                 url += ":" + environ["SERVER_PORT"]
 
-    url += quote(environ.get("SCRIPT_NAME", ""))
-    url += quote(environ.get("PATH_INFO", ""))
+    # DEV: quoting is done per character, the path can be quoted at once
+    url += trace_utils._url_cache.get_or_compute(environ.get("SCRIPT_NAME", "") + environ.get("PATH_INFO", ""), quote)
     if environ.get("QUERY_STRING"):
         url += "?" + environ["QUERY_STRING"]
 
@@ -109,7 +109,9 @@ class DDWSGIMiddleware(object):
                 write = start_response(status, response_headers, exc_info)
             return write
 
-        trace_utils.activate_distributed_headers(self.tracer, int_config=config.wsgi, request_headers=environ)
+        trace_utils._activate_distributed_context(
+            self.tracer, propagator._extract_from_wsgi_environ, environ, int_config=config.wsgi
+        )
 
         with self.tracer.trace(
             "wsgi.request",
@@ -135,7 +137,8 @@ class DDWSGIMiddleware(object):
             url = construct_url(environ)
             method = environ.get("REQUEST_METHOD")
             query_string = environ.get("QUERY_STRING")
-            request_headers = get_request_headers(environ)
+            # Only collect the request headers if some of them are traced
+            request_headers = get_request_headers(environ) if config.wsgi.is_header_tracing_configured else None
             trace_utils.set_http_meta(
                 span, config.wsgi, method=method, url=url, query=query_string, request_headers=request_headers
             )
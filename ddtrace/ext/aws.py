@@ -13,7 +13,11 @@ if TYPE_CHECKING:
 
 EXCLUDED_ENDPOINT = frozenset({"kms", "sts"})
 EXCLUDED_ENDPOINT_TAGS = {
+    "events": frozenset({"params.Entries"}),
     "firehose": frozenset({"params.Records"}),
+    "kinesis": frozenset({"params.Records"}),
+    "sns": frozenset({"params.PublishBatchRequestEntries"}),
+    "sqs": frozenset({"params.Entries"}),
 }
 
 
@@ -7,3 +7,4 @@ METHOD = "elasticsearch.method"
 TOOK = "elasticsearch.took"
 PARAMS = "elasticsearch.params"
 BODY = "elasticsearch.body"
+BODY_SIZE = "elasticsearch.body.size"
@@ -275,20 +275,35 @@ cdef class MsgpackEncoder(MsgpackEncoderBase):
         finally:
             self._reset_buffer()
 
-    cdef inline int _pack_meta(self, object meta, char *dd_origin):
+    cdef inline int _pack_meta(self, object meta, object shared_meta, char *dd_origin):
         cdef Py_ssize_t L
         cdef int ret
         cdef dict d
+        cdef dict shared
 
         if PyDict_CheckExact(meta):
             d = <dict> meta
             L = len(d)
+            # Shared tags are overridden by the span own tags
+            if shared_meta is not None:
+                shared = <dict> shared_meta
+                for k in shared:
+                    if k not in d:
+                        L += 1
             if dd_origin is not NULL:
                 L += 1
             if L > ITEM_LIMIT:
                 raise ValueError("dict is too large")
 
             ret = msgpack_pack_map(&self.pk, L)
+            if ret == 0 and shared_meta is not None:
+                for k, v in shared.items():
+                    if k in d:
+                        continue
+                    ret = pack_text(&self.pk, k)
+                    if ret != 0: break
+                    ret = pack_text(&self.pk, v)
+                    if ret != 0: break
             if ret == 0:
                 for k, v in d.items():
                     ret = pack_text(&self.pk, k)
@@ -331,9 +346,11 @@ cdef class MsgpackEncoder(MsgpackEncoderBase):
         cdef int has_span_type
         cdef int has_meta
         cdef int has_metrics
+        cdef object meta = span._meta
+        cdef object shared_meta = span._shared_meta
 
         has_span_type = <bint> (span.span_type is not None)
-        has_meta = <bint> (len(span.meta) > 0 or dd_origin is not NULL)
+        has_meta = <bint> (len(meta) > 0 or shared_meta is not None or dd_origin is not NULL)
         has_metrics = <bint> (len(span.metrics) > 0)
 
         L = 9 + has_span_type + has_meta + has_metrics
@@ -395,7 +412,7 @@ cdef class MsgpackEncoder(MsgpackEncoderBase):
             if has_meta:
                 ret = pack_bytes(&self.pk, <char *> b"meta", 4)
                 if ret != 0: return ret
-                ret = self._pack_meta(span.meta, dd_origin)
+                ret = self._pack_meta(meta, shared_meta, dd_origin)
                 if ret != 0: return ret
 
             if has_metrics:
@@ -1,2 +1,3 @@
 def seed() -> None: ...
 def rand64bits(check_pid: bool = True) -> int: ...
+def rand_trace_id_high_bits() -> str: ...
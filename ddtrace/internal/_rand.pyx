@@ -53,6 +53,7 @@ test_rand64bits_pid_check     121.8156 (2.03)     168.9837 (1.71)     130.3854 (
 """
 import os
 import random
+import time
 
 from ddtrace.internal import compat
 from ddtrace.internal import forksafe
@@ -87,4 +88,13 @@ cpdef rand64bits():
     return <uint64_t>(state * <uint64_t>2685821657736338717)
 
 
+cpdef rand_trace_id_high_bits():
+    """Return the hexadecimal representation of the higher 64 bits of a new 128-bit trace id.
+
+    Following the Datadog format, they are the unix time in seconds on 32 bits followed by 32 zero bits: the lower
+    64 bits are generated with :func:`rand64bits` as for 64-bit trace ids.
+    """
+    return "%08x00000000" % (<uint64_t>time.time() & 0xFFFFFFFF)
+
+
 seed()
@@ -12,6 +12,7 @@ import six
 from ddtrace.internal.logger import get_logger
 from ddtrace.internal.processor import SpanProcessor
 from ddtrace.internal.writer import TraceWriter
+from ddtrace.sampler import SpanSamplingRule
 from ddtrace.span import Span
 
 
@@ -51,22 +52,81 @@ class TraceSamplingProcessor(TraceProcessor):
     """Processor that keeps traces that have sampled spans. If all spans
     are unsampled then ``None`` is returned.
 
+    The single span sampling rules keep the spans they match from the traces
+    that are not sampled: only these spans are returned when the trace is
+    unsampled. When the trace is sent but rejected by its sampling priority,
+    the kept spans are tagged so that the agent keeps them.
+
     Note that this processor is only effective if complete traces are sent. If
     the spans of a trace are divided in separate lists then it's possible that
     parts of the trace are unsampled when the whole trace should be sampled.
     """
 
+    _single_span_rules = attr.ib(factory=list)  # type: List[SpanSamplingRule]
+
     def process_trace(self, trace):
         # type: (List[Span]) -> Optional[List[Span]]
         if trace:
             for span in trace:
                 if span.sampled:
+                    if self._single_span_rules and self._is_rejected(trace):
+                        self._sample_spans(trace)
                     return trace
 
+            if self._single_span_rules:
+                spans = self._sample_spans(trace)
+                if spans:
+                    log.debug("keeping %d spans of dropped trace %d", len(spans), trace[0].trace_id)
+                    return spans
+
             log.debug("dropping trace %d with %d spans", trace[0].trace_id, len(trace))
 
         return None
 
+    @staticmethod
+    def _is_rejected(trace):
+        # type: (List[Span]) -> bool
+        ctx = trace[0]._trace_context
+        if ctx is None:
+            return False
+        priority = ctx.sampling_priority
+        return priority is not None and priority <= 0
+
+    def _sample_spans(self, trace):
+        # type: (List[Span]) -> List[Span]
+        """Return the spans kept by the first single span sampling rule they match."""
+        spans = []
+        for span in trace:
+            for rule in self._single_span_rules:
+                if rule.matches(span):
+                    if rule.sample(span):
+                        spans.append(span)
+                    break
+        return spans
+
+
+@attr.s
+class TraceFlushCallbacksProcessor(TraceProcessor):
+    """Processor that calls the flush callbacks of the spans of the trace.
+
+    It must run after the traces that are not sent are dropped.
+    """
+
+    def process_trace(self, trace):
+        # type: (List[Span]) -> Optional[List[Span]]
+        for span in trace:
+            callbacks = span._on_flush_callbacks
+            if callbacks is None:
+                continue
+            span._on_flush_callbacks = None
+            for callback in callbacks:
+                try:
+                    callback(span)
+                except Exception:
+                    log.error("error applying flush callback %r to span %r", callback, span, exc_info=True)
+
+        return trace
+
 
 @attr.s
 class TraceTagsProcessor(TraceProcessor):
@@ -78,7 +138,7 @@ class TraceTagsProcessor(TraceProcessor):
             return trace
 
         chunk_root = trace[0]
-        ctx = chunk_root._context
+        ctx = chunk_root._trace_context
         if not ctx:
             return trace
 
@@ -120,6 +180,12 @@ class SpanAggregator(SpanProcessor):
             trace = self._traces[span.trace_id]
             trace.spans.append(span)
 
+    def num_unfinished_spans(self):
+        # type: () -> int
+        """Return the number of spans kept until their trace is flushed."""
+        with self._lock:
+            return sum(len(trace.spans) for trace in self._traces.values())
+
     def on_span_finish(self, span):
         # type: (Span) -> None
         with self._lock:
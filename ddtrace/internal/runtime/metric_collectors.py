@@ -11,6 +11,7 @@ from .constants import CTX_SWITCH_VOLUNTARY
 from .constants import GC_COUNT_GEN0
 from .constants import GC_COUNT_GEN1
 from .constants import GC_COUNT_GEN2
+from .constants import GC_TRACER_SPANS
 from .constants import MEM_RSS
 from .constants import THREAD_COUNT
 
@@ -41,6 +42,20 @@ class GCRuntimeMetricCollector(RuntimeMetricCollector):
         return metrics
 
 
+class TracerRuntimeMetricCollector(RuntimeMetricCollector):
+    """Collector for the objects kept alive by the ddtrace Tracer.
+
+    Finished spans have no reference cycles and are freed once written: only the spans of the unfinished traces
+    survive garbage collections.
+    """
+
+    required_modules = ["ddtrace"]
+
+    def collect_fn(self, keys):
+        ddtrace = self.modules.get("ddtrace")
+        return [(GC_TRACER_SPANS, ddtrace.tracer._num_unfinished_spans())]
+
+
 class PSUtilRuntimeMetricCollector(RuntimeMetricCollector):
     """Collector for psutil metrics.
 
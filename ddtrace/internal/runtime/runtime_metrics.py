@@ -22,6 +22,7 @@ from .constants import DEFAULT_RUNTIME_METRICS
 from .constants import DEFAULT_RUNTIME_TAGS
 from .metric_collectors import GCRuntimeMetricCollector
 from .metric_collectors import PSUtilRuntimeMetricCollector
+from .metric_collectors import TracerRuntimeMetricCollector
 from .tag_collectors import PlatformTagCollector
 from .tag_collectors import TracerTagCollector
 
@@ -59,6 +60,7 @@ class RuntimeMetrics(RuntimeCollectorsIterable):
     COLLECTORS = [
         GCRuntimeMetricCollector,
         PSUtilRuntimeMetricCollector,
+        TracerRuntimeMetricCollector,
     ]
 
 
@@ -97,7 +99,7 @@ class RuntimeWorker(periodic.PeriodicService):
         # add tags to root span to correlate trace with runtime metrics
         # only applied to spans with types that are internal to applications
         if span.parent_id is None and self.tracer._is_span_internal(span):
-            span.meta["language"] = "python"
+            span._set_str_tag("language", "python")
 
     @classmethod
     def disable(cls):
@@ -0,0 +1,143 @@
+"""Recycling of the spans sent to the agent.
+
+Once a trace is encoded, its spans are queued on a per-thread list. When the thread needs a span and its freelist is
+empty, the queued traces whose spans are not referenced anymore (by the user, a context, a weak reference...) are
+reset and put in the freelist; the others stay queued until the queue is full. Checking the references this late
+leaves the frames that finished the trace, and the context provider, enough time to release them.
+
+A span is only recycled when:
+
+- its generation did not change since its trace was queued, so a trace queued twice is never recycled twice;
+- it has no weak reference;
+- it is only referenced by its trace list and by the other spans of the trace;
+- its tags, metrics and finish callbacks containers are only referenced by the span.
+
+The references are counted with ``sys.getrefcount()``: recycling is disabled on interpreters without it.
+"""
+import sys
+import threading
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+import weakref
+
+from ..span import Span
+
+
+_getrefcount = getattr(sys, "getrefcount", None)
+
+
+def _internal_references(trace):
+    # type: (List[Span]) -> Dict[int, int]
+    """Return the number of references to each span from the other spans of the trace."""
+    references = {}  # type: Dict[int, int]
+    for span in trace:
+        for referenced in (span._parent, span._local_root_value):
+            if referenced is not None:
+                key = id(referenced)
+                references[key] = references.get(key, 0) + 1
+    return references
+
+
+def _is_unreferenced(
+    trace,  # type: List[Span]
+    generations,  # type: List[int]
+):
+    # type: (...) -> bool
+    """Return whether the spans of the trace are only referenced by the trace."""
+    references = _internal_references(trace)
+    for i in range(len(trace)):
+        # References: the trace, this variable and the getrefcount argument
+        span = trace[i]
+        if (
+            span._generation != generations[i]
+            or weakref.getweakrefcount(span)
+            or _getrefcount(span) != _SPAN_REFCOUNT + references.get(id(span), 0)
+            or _getrefcount(span._meta) != _CONTAINER_REFCOUNT
+            or _getrefcount(span.metrics) != _CONTAINER_REFCOUNT
+            or _getrefcount(span._on_finish_callbacks) != _CONTAINER_REFCOUNT
+        ):
+            return False
+    return True
+
+
+def _calibrate():
+    # type: () -> Tuple[int, int]
+    """Return the reference counts of a span and of its containers when nothing else references them.
+
+    The spans are referenced the same way in ``_is_unreferenced()``.
+    """
+    if _getrefcount is None:
+        return 0, 0
+    trace = [Span(None, "calibration")]
+    span = trace[0]
+    return _getrefcount(span), _getrefcount(span._meta)
+
+
+_SPAN_REFCOUNT, _CONTAINER_REFCOUNT = _calibrate()
+
+
+class _ThreadSpans(threading.local):
+    def __init__(self):
+        # type: () -> None
+        self.free = []  # type: List[Span]
+        # Traces waiting to be recycled, with the generations of their spans when queued
+        self.pending = []  # type: List[Tuple[List[Span], List[int]]]
+
+
+class SpanPool(object):
+    """Bounded per-thread freelists of recycled spans."""
+
+    def __init__(
+        self,
+        max_size=512,  # type: int
+        max_pending=64,  # type: int
+    ):
+        # type: (...) -> None
+        self.max_size = max_size
+        self.max_pending = max_pending
+        self._spans = _ThreadSpans()
+
+    def acquire(self):
+        # type: () -> Optional[Span]
+        """Return a recycled span, or None if there is none available.
+
+        The span must be initialized with :meth:`Span._init`.
+        """
+        spans = self._spans
+        if not spans.free:
+            if not spans.pending:
+                return None
+            self._collect(spans)
+            if not spans.free:
+                return None
+        return spans.free.pop()
+
+    def release(self, trace):
+        # type: (List[Span]) -> None
+        """Queue the spans of an encoded trace to be recycled once they are not referenced anymore."""
+        if _getrefcount is None or not trace:
+            return
+        pending = self._spans.pending
+        if len(pending) >= self.max_pending:
+            # The thread does not reuse its spans: let the oldest ones be garbage collected
+            del pending[0]
+        pending.append((trace, [span._generation for span in trace]))
+
+    def _collect(self, spans):
+        # type: (_ThreadSpans) -> None
+        free = spans.free
+        pending = []
+        for trace, generations in spans.pending:
+            if len(free) + len(trace) <= self.max_size and _is_unreferenced(trace, generations):
+                for span in trace:
+                    span._recycle()
+                free.extend(trace)
+            else:
+                # The trace might still be referenced for a while, e.g. by the context of the thread
+                pending.append((trace, generations))
+        spans.pending = pending
+
+
+span_pool = SpanPool()
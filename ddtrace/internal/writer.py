@@ -19,6 +19,7 @@ from . import agent
 from . import compat
 from . import periodic
 from . import service
+from .. import config
 from ..constants import KEEP_SPANS_RATE_KEY
 from ..sampler import BasePrioritySampler
 from ..sampler import BaseSampler
@@ -33,6 +34,7 @@ from .encoding import JSONEncoderV2
 from .logger import get_logger
 from .runtime import container
 from .sma import SimpleMovingAverage
+from .span_pool import span_pool
 
 
 if TYPE_CHECKING:
@@ -441,6 +443,10 @@ class AgentWriter(periodic.PeriodicService, TraceWriter):
             if self._sync_mode:
                 self.flush_queue()
 
+        if config._span_recycling_enabled:
+            # The trace is encoded: its spans can be reused
+            span_pool.release(spans)
+
     def flush_queue(self, raise_exc=False):
         # type: (bool) -> None
         try:
@@ -238,7 +238,11 @@ PyDoc_STRVAR(memalloc_heap_py__doc__,
              "heap($module, /)\n"
              "--\n"
              "\n"
-             "Get the sampled heap representation.\n");
+             "Get the sampled heap representation.\n"
+             "\n"
+             "Returns a list of (traceback, size, count) where size is the live\n"
+             "memory sampled for each unique traceback, in bytes, and count the\n"
+             "number of live sampled allocations.\n");
 static PyObject*
 memalloc_heap_py(PyObject* Py_UNUSED(module), PyObject* Py_UNUSED(args))
 {
@@ -261,7 +265,8 @@ PyDoc_STRVAR(iterevents__doc__,
              "--\n"
              "\n"
              "Returns a tuple with 3 items:\n:"
-             "1. an iterator of memory allocation traced so far\n"
+             "1. an iterator of memory allocation traced so far, as (traceback, size,\n"
+             "   monotonic timestamp in nanoseconds, native thread id or 0 if unavailable)\n"
              "2. the number of items in the iterator\n"
              "3. the total number of allocations since last reset\n"
              "\n"
@@ -305,11 +310,13 @@ iterevents_next(IterEventsState* iestate)
         traceback_t* tb = iestate->alloc_tracker->allocs.tab[iestate->seq_index];
         iestate->seq_index++;
 
-        PyObject* tb_and_size = PyTuple_New(2);
-        PyTuple_SET_ITEM(tb_and_size, 0, traceback_to_tuple(tb));
-        PyTuple_SET_ITEM(tb_and_size, 1, PyLong_FromSize_t(tb->size));
+        PyObject* event = PyTuple_New(4);
+        PyTuple_SET_ITEM(event, 0, traceback_to_tuple(tb));
+        PyTuple_SET_ITEM(event, 1, PyLong_FromSize_t(tb->size));
+        PyTuple_SET_ITEM(event, 2, PyLong_FromLongLong(tb->timestamp_ns));
+        PyTuple_SET_ITEM(event, 3, PyLong_FromUnsignedLong(tb->thread_native_id));
 
-        return tb_and_size;
+        return event;
     }
 
     /* Returning NULL in this case is enough. The next() builtin will raise the
@@ -8,7 +8,12 @@ StackType = typing.Tuple[FrameType, ...]
 # (stack, nframe, thread_id)
 TracebackType = typing.Tuple[StackType, int, int]
 
+# (traceback, size, monotonic timestamp in ns, native thread id or 0 if unavailable)
+EventType = typing.Tuple[TracebackType, int, int, int]
+
 def start(max_nframe: int, max_events: int, heap_sample_size: int) -> None: ...
 def stop() -> None: ...
-def heap() -> typing.List[typing.Tuple[TracebackType, int]]: ...
-def iter_events() -> typing.Iterator[typing.Tuple[TracebackType, int]]: ...
+
+# (traceback, live size, live count) for each unique traceback
+def heap() -> typing.List[typing.Tuple[TracebackType, int, int]]: ...
+def iter_events() -> typing.Tuple[typing.Iterator[EventType], int, int]: ...
@@ -1,10 +1,156 @@
 #include <math.h>
 #include <stdlib.h>
+#include <string.h>
 
 #define PY_SSIZE_T_CLEAN
 #include "_memalloc_heap.h"
 #include "_memalloc_tb.h"
 
+/* A unique traceback and the live sampled memory allocated from it */
+typedef struct
+{
+    /* The traceback; its ptr and size fields are not used */
+    traceback_t* tb;
+    /* Hash of the traceback */
+    uint64_t hash;
+    /* Live sampled memory allocated with this traceback in bytes */
+    size_t live_size;
+    /* Number of live sampled allocations with this traceback */
+    uint32_t live_count;
+} heap_stack_t;
+
+static void
+heap_stack_free(heap_stack_t* stack)
+{
+    traceback_free(stack->tb);
+    PyMem_RawFree(stack);
+}
+
+/* Open addressing hash table of the unique tracebacks, keyed by their hash.
+
+   The capacity is always a power of 2 and the table is kept at most half full,
+   so the linear probing sequences stay short. */
+typedef struct
+{
+    /* Slots of the table, NULL if empty */
+    heap_stack_t** tab;
+    /* Number of slots */
+    uint32_t capacity;
+    /* Number of stacks stored */
+    uint32_t count;
+} heap_stack_table_t;
+
+#define HEAP_STACK_TABLE_MIN_CAPACITY 64
+
+static void
+heap_stack_table_init(heap_stack_table_t* table)
+{
+    table->tab = NULL;
+    table->capacity = 0;
+    table->count = 0;
+}
+
+static void
+heap_stack_table_wipe(heap_stack_table_t* table)
+{
+    for (uint32_t i = 0; i < table->capacity; i++)
+        if (table->tab[i])
+            heap_stack_free(table->tab[i]);
+    PyMem_RawFree(table->tab);
+    heap_stack_table_init(table);
+}
+
+static heap_stack_t*
+heap_stack_table_find(heap_stack_table_t* table, uint64_t hash, traceback_t* tb)
+{
+    if (table->count == 0)
+        return NULL;
+
+    uint32_t mask = table->capacity - 1;
+
+    for (uint32_t i = hash & mask; table->tab[i]; i = (i + 1) & mask)
+        if (table->tab[i]->hash == hash && traceback_equal(table->tab[i]->tb, tb))
+            return table->tab[i];
+
+    return NULL;
+}
+
+static void
+heap_stack_table_place(heap_stack_t** tab, uint32_t mask, heap_stack_t* stack)
+{
+    uint32_t i = stack->hash & mask;
+
+    while (tab[i])
+        i = (i + 1) & mask;
+
+    tab[i] = stack;
+}
+
+/* Insert a stack in the table, growing it if needed.
+
+   Returns false if the table could not grow. */
+static bool
+heap_stack_table_insert(heap_stack_table_t* table, heap_stack_t* stack)
+{
+    if ((table->count + 1) * 2 > table->capacity) {
+        uint32_t capacity = table->capacity ? table->capacity * 2 : HEAP_STACK_TABLE_MIN_CAPACITY;
+        heap_stack_t** tab = PyMem_RawMalloc(capacity * sizeof(heap_stack_t*));
+        if (tab == NULL)
+            return false;
+        memset(tab, 0, capacity * sizeof(heap_stack_t*));
+
+        for (uint32_t i = 0; i < table->capacity; i++)
+            if (table->tab[i])
+                heap_stack_table_place(tab, capacity - 1, table->tab[i]);
+
+        PyMem_RawFree(table->tab);
+        table->tab = tab;
+        table->capacity = capacity;
+    }
+
+    heap_stack_table_place(table->tab, table->capacity - 1, stack);
+    table->count++;
+
+    return true;
+}
+
+static void
+heap_stack_table_remove(heap_stack_table_t* table, heap_stack_t* stack)
+{
+    uint32_t mask = table->capacity - 1;
+    uint32_t i = stack->hash & mask;
+
+    while (table->tab[i] != stack)
+        i = (i + 1) & mask;
+
+    /* Shift back the following entries of the probing sequence rather than
+       leaving a tombstone, so lookups never scan removed slots */
+    for (uint32_t j = (i + 1) & mask; table->tab[j]; j = (j + 1) & mask) {
+        uint32_t home = table->tab[j]->hash & mask;
+        /* Move the entry to the hole only if its home slot is not between the hole and the entry (cyclically) */
+        if (((j - home) & mask) >= ((j - i) & mask)) {
+            table->tab[i] = table->tab[j];
+            i = j;
+        }
+    }
+
+    table->tab[i] = NULL;
+    table->count--;
+}
+
+/* A live sampled allocation */
+typedef struct
+{
+    /* Memory pointer allocated */
+    void* ptr;
+    /* Memory size accounted for this allocation in bytes */
+    size_t size;
+    /* The stack this allocation is accounted in */
+    heap_stack_t* stack;
+} heap_alloc_t;
+
+DO_ARRAY(heap_alloc_t, heap_alloc, TRACEBACK_ARRAY_COUNT_TYPE, DO_NOTHING)
+
 typedef struct
 {
     /* Granularity of the heap profiler in bytes */
@@ -12,7 +158,9 @@ typedef struct
     /* Current sample size of the heap profiler in bytes */
     uint32_t current_sample_size;
     /* Tracked allocations */
-    traceback_array_t allocs;
+    heap_alloc_array_t allocs;
+    /* Unique tracebacks of the tracked allocations, with their aggregated live size */
+    heap_stack_table_t stacks;
     /* Allocated memory counter in bytes */
     uint32_t allocated_memory;
     /* True if the heap tracker is frozen */
@@ -40,7 +188,8 @@ heap_tracker_next_sample_size(uint32_t sample_size)
 static void
 heap_tracker_init(heap_tracker_t* heap_tracker)
 {
-    traceback_array_init(&heap_tracker->allocs);
+    heap_alloc_array_init(&heap_tracker->allocs);
+    heap_stack_table_init(&heap_tracker->stacks);
     traceback_array_init(&heap_tracker->freezer.allocs);
     ptr_array_init(&heap_tracker->freezer.frees);
     heap_tracker->allocated_memory = 0;
@@ -52,7 +201,8 @@ heap_tracker_init(heap_tracker_t* heap_tracker)
 static void
 heap_tracker_wipe(heap_tracker_t* heap_tracker)
 {
-    traceback_array_wipe(&heap_tracker->allocs);
+    heap_alloc_array_wipe(&heap_tracker->allocs);
+    heap_stack_table_wipe(&heap_tracker->stacks);
     traceback_array_wipe(&heap_tracker->freezer.allocs);
     ptr_array_wipe(&heap_tracker->freezer.frees);
 }
@@ -63,27 +213,68 @@ heap_tracker_freeze(heap_tracker_t* heap_tracker)
     heap_tracker->frozen = true;
 }
 
+static void
+heap_tracker_track_thawed(heap_tracker_t* heap_tracker, traceback_t* tb)
+{
+    uint64_t hash = traceback_hash(tb);
+    heap_stack_t* stack = heap_stack_table_find(&heap_tracker->stacks, hash, tb);
+    heap_alloc_t alloc = { tb->ptr, tb->size, stack };
+
+    if (stack)
+        traceback_free(tb);
+    else {
+        stack = PyMem_RawMalloc(sizeof(heap_stack_t));
+        if (stack == NULL) {
+            traceback_free(tb);
+            return;
+        }
+        stack->tb = tb;
+        stack->hash = hash;
+        stack->live_size = 0;
+        stack->live_count = 0;
+        if (!heap_stack_table_insert(&heap_tracker->stacks, stack)) {
+            heap_stack_free(stack);
+            return;
+        }
+        alloc.stack = stack;
+    }
+
+    stack->live_size += alloc.size;
+    stack->live_count++;
+
+    heap_alloc_array_append(&heap_tracker->allocs, alloc);
+}
+
 static void
 heap_tracker_untrack_thawed(heap_tracker_t* heap_tracker, void* ptr)
 {
-    /* This search is O(n) where `n` is the number of tracked traceback,
+    /* This search is O(n) where `n` is the number of tracked allocations,
        which is linearly linked to the heap size. This search could probably be
        optimized in a couple of ways:
 
-       - sort the traceback in allocs by ptr so we can find the ptr in O(log2 n)
+       - sort the allocations by ptr so we can find the ptr in O(log2 n)
        - use a Bloom filter?
 
        That being said, we start iterating at the end of the array because most
        of the time this is where the untracked ptr is (the most recent object
        get de-allocated first usually). This might be a good enough
        trade-off. */
-    for (TRACEBACK_ARRAY_COUNT_TYPE i = global_heap_tracker.allocs.count; i > 0; i--) {
-        traceback_t** tb = &global_heap_tracker.allocs.tab[i - 1];
+    for (TRACEBACK_ARRAY_COUNT_TYPE i = heap_tracker->allocs.count; i > 0; i--) {
+        heap_alloc_t* alloc = &heap_tracker->allocs.tab[i - 1];
+
+        if (ptr == alloc->ptr) {
+            heap_stack_t* stack = alloc->stack;
 
-        if (ptr == (*tb)->ptr) {
-            /* Free the traceback */
-            traceback_free(*tb);
-            traceback_array_remove(&heap_tracker->allocs, tb);
+            stack->live_size -= alloc->size;
+            stack->live_count--;
+
+            /* Free the traceback once no live allocation references it anymore */
+            if (stack->live_count == 0) {
+                heap_stack_table_remove(&heap_tracker->stacks, stack);
+                heap_stack_free(stack);
+            }
+
+            heap_alloc_array_remove(&heap_tracker->allocs, alloc);
             break;
         }
     }
@@ -92,12 +283,9 @@ heap_tracker_untrack_thawed(heap_tracker_t* heap_tracker, void* ptr)
 static void
 heap_tracker_thaw(heap_tracker_t* heap_tracker)
 {
-    /* Add the frozen allocs at the end */
-    traceback_array_splice(&heap_tracker->allocs,
-                           heap_tracker->allocs.count,
-                           0,
-                           heap_tracker->freezer.allocs.tab,
-                           heap_tracker->freezer.allocs.count);
+    /* Add the frozen allocs at the end; this transfers the tracebacks ownership to the heap tracker */
+    for (TRACEBACK_ARRAY_COUNT_TYPE i = 0; i < heap_tracker->freezer.allocs.count; i++)
+        heap_tracker_track_thawed(heap_tracker, heap_tracker->freezer.allocs.tab[i]);
 
     /* Handle the frees: we need to handle the frees after we merge the allocs
        array together to be sure that there's no free in the freezer matching
@@ -175,7 +363,7 @@ memalloc_heap_track(uint16_t max_nframe, void* ptr, size_t size)
         return false;
 
     /* Cannot add more sample */
-    if (global_heap_tracker.allocs.count >= TRACEBACK_ARRAY_MAX_COUNT)
+    if (global_heap_tracker.allocs.count + global_heap_tracker.freezer.allocs.count >= TRACEBACK_ARRAY_MAX_COUNT)
         return false;
 
     traceback_t* tb = memalloc_get_traceback(max_nframe, ptr, global_heap_tracker.allocated_memory);
@@ -183,7 +371,7 @@ memalloc_heap_track(uint16_t max_nframe, void* ptr, size_t size)
         if (global_heap_tracker.frozen)
             traceback_array_append(&global_heap_tracker.freezer.allocs, tb);
         else
-            traceback_array_append(&global_heap_tracker.allocs, tb);
+            heap_tracker_track_thawed(&global_heap_tracker, tb);
 
         /* Reset the counter to 0 */
         global_heap_tracker.allocated_memory = 0;
@@ -202,15 +390,23 @@ memalloc_heap()
 {
     heap_tracker_freeze(&global_heap_tracker);
 
-    PyObject* heap_list = PyList_New(global_heap_tracker.allocs.count);
+    /* Export one row per unique traceback rather than one per sample: the
+       number of rows is bound to the number of allocation sites, not to the
+       heap size. */
+    PyObject* heap_list = PyList_New(global_heap_tracker.stacks.count);
+    Py_ssize_t n = 0;
+
+    for (uint32_t i = 0; i < global_heap_tracker.stacks.capacity; i++) {
+        heap_stack_t* stack = global_heap_tracker.stacks.tab[i];
 
-    for (TRACEBACK_ARRAY_COUNT_TYPE i = 0; i < global_heap_tracker.allocs.count; i++) {
-        traceback_t* tb = global_heap_tracker.allocs.tab[i];
+        if (stack == NULL)
+            continue;
 
-        PyObject* tb_and_size = PyTuple_New(2);
-        PyTuple_SET_ITEM(tb_and_size, 0, traceback_to_tuple(tb));
-        PyTuple_SET_ITEM(tb_and_size, 1, PyLong_FromSize_t(tb->size));
-        PyList_SET_ITEM(heap_list, i, tb_and_size);
+        PyObject* tb_size_and_count = PyTuple_New(3);
+        PyTuple_SET_ITEM(tb_size_and_count, 0, traceback_to_tuple(stack->tb));
+        PyTuple_SET_ITEM(tb_size_and_count, 1, PyLong_FromSize_t(stack->live_size));
+        PyTuple_SET_ITEM(tb_size_and_count, 2, PyLong_FromUnsignedLong(stack->live_count));
+        PyList_SET_ITEM(heap_list, n++, tb_size_and_count);
     }
 
     heap_tracker_thaw(&global_heap_tracker);
@@ -161,6 +161,15 @@ memalloc_get_traceback(uint16_t max_nframe, void* ptr, size_t size)
     traceback->thread_id = tstate->thread_id;
 #endif
 
+#ifdef PY_HAVE_THREAD_NATIVE_ID
+    traceback->thread_native_id = PyThread_get_thread_native_id();
+#else
+    traceback->thread_native_id = 0;
+#endif
+
+    /* Same clock as time.monotonic_ns(); this does not raise nor allocate */
+    traceback->timestamp_ns = _PyTime_GetMonotonicClock();
+
     return traceback;
 }
 
@@ -192,3 +201,46 @@ traceback_to_tuple(traceback_t* tb)
 
     return tuple;
 }
+
+/* Hash a traceback based on its thread and frames.
+
+   The frame names are compared by identity: the same code objects always give
+   the same hash, and no Python code is ever called, which is mandatory since
+   this is called from the memory allocator. */
+uint64_t
+traceback_hash(traceback_t* tb)
+{
+    /* FNV-1a */
+    uint64_t hash = 14695981039346656037ULL;
+
+#define TRACEBACK_HASH_MIX(value) hash = (hash ^ (uint64_t)(value)) * 1099511628211ULL
+    TRACEBACK_HASH_MIX(tb->thread_id);
+    TRACEBACK_HASH_MIX(tb->total_nframe);
+
+    for (uint16_t nframe = 0; nframe < tb->nframe; nframe++) {
+        TRACEBACK_HASH_MIX((uintptr_t)tb->frames[nframe].filename);
+        TRACEBACK_HASH_MIX((uintptr_t)tb->frames[nframe].name);
+        TRACEBACK_HASH_MIX(tb->frames[nframe].lineno);
+    }
+#undef TRACEBACK_HASH_MIX
+
+    return hash;
+}
+
+/* Return true if both tracebacks have the same thread and frames. */
+bool
+traceback_equal(traceback_t* tb1, traceback_t* tb2)
+{
+    if (tb1->thread_id != tb2->thread_id || tb1->nframe != tb2->nframe || tb1->total_nframe != tb2->total_nframe)
+        return false;
+
+    for (uint16_t nframe = 0; nframe < tb1->nframe; nframe++) {
+        frame_t* frame1 = &tb1->frames[nframe];
+        frame_t* frame2 = &tb2->frames[nframe];
+
+        if (frame1->lineno != frame2->lineno || frame1->filename != frame2->filename || frame1->name != frame2->name)
+            return false;
+    }
+
+    return true;
+}
@@ -1,6 +1,7 @@
 #ifndef _DDTRACE_MEMALLOC_TB_H
 #define _DDTRACE_MEMALLOC_TB_H
 
+#include <stdbool.h>
 #include <stdint.h>
 
 #include <Python.h>
@@ -34,6 +35,10 @@ typedef struct
     size_t size;
     /* Thread ID */
     unsigned long thread_id;
+    /* Native thread ID, 0 if unavailable */
+    unsigned long thread_native_id;
+    /* Monotonic timestamp of the allocation in nanoseconds */
+    int64_t timestamp_ns;
     /* List of frames, top frame first */
     frame_t frames[1];
 } traceback_t;
@@ -55,6 +60,11 @@ memalloc_get_traceback(uint16_t max_nframe, void* ptr, size_t size);
 PyObject*
 traceback_to_tuple(traceback_t* tb);
 
+uint64_t
+traceback_hash(traceback_t* tb);
+bool
+traceback_equal(traceback_t* tb1, traceback_t* tb2);
+
 /* The maximum number of events we can store in `traceback_array_t.count` */
 #define TRACEBACK_ARRAY_MAX_COUNT UINT16_MAX
 #define TRACEBACK_ARRAY_COUNT_TYPE uint16_t
@@ -13,6 +13,7 @@ try:
 except ImportError:
     _memalloc = None  # type: ignore[assignment]
 
+from ddtrace.internal import compat
 from ddtrace.profiling import collector
 from ddtrace.profiling import event
 from ddtrace.profiling.collector import _threading
@@ -42,7 +43,10 @@ class MemoryHeapSampleEvent(event.StackBasedEvent):
     """A sample storing memory allocation tracked."""
 
     size = attr.ib(default=None)
-    """Allocation size in bytes."""
+    """Live allocation size in bytes, aggregated for all the samples with this stack."""
+
+    count = attr.ib(default=None)
+    """Number of live sampled allocations with this stack."""
 
     sample_size = attr.ib(default=None)
     """The sampling size."""
@@ -83,15 +87,24 @@ class MemoryCollector(collector.PeriodicCollector):
 
     _DEFAULT_MAX_EVENTS = 32
     _DEFAULT_INTERVAL = 0.5
+    # How many times more often the event buffer is emptied while an endpoint is profiled
+    _ENDPOINT_INTERVAL_FACTOR = 5
 
     # Arbitrary interval to empty the _memalloc event buffer
     _interval = attr.ib(default=_DEFAULT_INTERVAL, repr=False)
+    _configured_interval = attr.ib(init=False, repr=False, eq=False)
 
     # TODO make this dynamic based on the 1. interval and 2. the max number of events allowed in the Recorder
     _max_events = attr.ib(factory=attr_utils.from_env("_DD_PROFILING_MEMORY_EVENTS_BUFFER", _DEFAULT_MAX_EVENTS, int))
     max_nframe = attr.ib(factory=attr_utils.from_env("DD_PROFILING_MAX_FRAMES", 64, int))
     heap_sample_size = attr.ib(type=int, factory=_get_default_heap_sample_size)
     ignore_profiler = attr.ib(factory=attr_utils.from_env("DD_PROFILING_IGNORE_PROFILER", False, formats.asbool))
+    # Callable returning whether a profiled endpoint is running, to capture more allocation events
+    endpoint_active = attr.ib(default=None, repr=False, eq=False, type=typing.Optional[typing.Callable[[], bool]])
+
+    def __attrs_post_init__(self):
+        # Copy the value to use it later since we're going to adjust the real interval
+        self._configured_interval = self.interval
 
     def _start_service(self):  # type: ignore[override]
         # type: (...) -> None
@@ -134,9 +147,10 @@ class MemoryCollector(collector.PeriodicCollector):
                     frames=stack,
                     nframes=nframes,
                     size=size,
+                    count=count,
                     sample_size=self.heap_sample_size,
                 )
-                for (stack, nframes, thread_id), size in _memalloc.heap()
+                for (stack, nframes, thread_id), size, count in _memalloc.heap()
                 if not self.ignore_profiler or thread_id not in thread_id_ignore_set
             ),
         )
@@ -145,22 +159,40 @@ class MemoryCollector(collector.PeriodicCollector):
         events, count, alloc_count = _memalloc.iter_events()
         capture_pct = 100 * count / alloc_count
         thread_id_ignore_set = self._get_thread_id_ignore_set()
-        # TODO: The event timestamp is slightly off since it's going to be the time we copy the data from the
-        # _memalloc buffer to our Recorder. This is fine for now, but we might want to store the nanoseconds
-        # timestamp in C and then return it via iter_events.
-        return (
-            tuple(
+        # The timestamps are recorded in C with the monotonic clock at allocation time: convert them to wall clock
+        monotonic_to_wall_ns = compat.time_ns() - compat.monotonic_ns()
+        # Resolve each thread name once per collection rather than once per event
+        thread_names = {}  # type: typing.Dict[int, typing.Optional[str]]
+        collected = []
+        for (stack, nframes, thread_id), size, timestamp_ns, thread_native_id in events:
+            if self.ignore_profiler and thread_id in thread_id_ignore_set:
+                continue
+
+            try:
+                thread_name = thread_names[thread_id]
+            except KeyError:
+                thread_name = thread_names[thread_id] = _threading.get_thread_name(thread_id)
+
+            collected.append(
                 MemoryAllocSampleEvent(
+                    timestamp=timestamp_ns + monotonic_to_wall_ns,
                     thread_id=thread_id,
-                    thread_name=_threading.get_thread_name(thread_id),
-                    thread_native_id=_threading.get_thread_native_id(thread_id),
+                    thread_name=thread_name,
+                    # Native thread ids are not available before Python 3.8
+                    thread_native_id=thread_native_id or _threading.get_thread_native_id(thread_id),
                     frames=stack,
                     nframes=nframes,
                     size=size,
                     capture_pct=capture_pct,
                     nevents=alloc_count,
                 )
-                for (stack, nframes, thread_id), size in events
-                if not self.ignore_profiler or thread_id not in thread_id_ignore_set
-            ),
-        )
+            )
+
+        if self.endpoint_active is not None:
+            # The event buffer has a fixed size: emptying it more often captures more events
+            if self.endpoint_active():
+                self.interval = self._configured_interval / self._ENDPOINT_INTERVAL_FACTOR
+            else:
+                self.interval = self._configured_interval
+
+        return (tuple(collected),)
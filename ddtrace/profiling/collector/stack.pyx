@@ -411,6 +411,11 @@ class _ThreadSpanLinks(object):
                 return None
 
 
+def _parse_endpoints(value):
+    # type: (str) -> typing.FrozenSet[str]
+    return frozenset(endpoint.strip() for endpoint in value.split(",") if endpoint.strip())
+
+
 def _default_min_interval_time():
     if six.PY2:
         return 0.01
@@ -431,11 +436,19 @@ class StackCollector(collector.PeriodicCollector):
     nframes = attr.ib(factory=attr_utils.from_env("DD_PROFILING_MAX_FRAMES", 64, int))
     ignore_profiler = attr.ib(factory=attr_utils.from_env("DD_PROFILING_IGNORE_PROFILER", False, formats.asbool))
     tracer = attr.ib(default=None)
+    # Root span resources for which the stacks are sampled more often
+    endpoints = attr.ib(factory=attr_utils.from_env("DD_PROFILING_ENDPOINTS", "", _parse_endpoints))
+    endpoint_max_time_usage_pct = attr.ib(
+        factory=attr_utils.from_env("DD_PROFILING_ENDPOINT_MAX_TIME_USAGE_PCT", 10, float)
+    )
+    # Whether a trace for one of the endpoints was running during the last collection
+    endpoint_active = attr.ib(default=False, init=False, repr=False, eq=False)
     _thread_time = attr.ib(init=False, repr=False, eq=False)
     _last_wall_time = attr.ib(init=False, repr=False, eq=False)
     _thread_span_links = attr.ib(default=None, init=False, repr=False, eq=False)
 
     @max_time_usage_pct.validator
+    @endpoint_max_time_usage_pct.validator
     def _check_max_time_usage(self, attribute, value):
         if value <= 0 or value > 100:
             raise ValueError("Max time usage percent must be greater than 0 and smaller or equal to 100")
@@ -458,7 +471,11 @@ class StackCollector(collector.PeriodicCollector):
             self.tracer.context_provider._deregister_on_activate(self._thread_span_links.link_span)
 
     def _compute_new_interval(self, used_wall_time_ns):
-        interval = (used_wall_time_ns / (self.max_time_usage_pct / 100.0)) - used_wall_time_ns
+        if self.endpoint_active:
+            max_time_usage_pct = self.endpoint_max_time_usage_pct
+        else:
+            max_time_usage_pct = self.max_time_usage_pct
+        interval = (used_wall_time_ns / (max_time_usage_pct / 100.0)) - used_wall_time_ns
         return max(interval / 1e9, self.min_interval_time)
 
     def collect(self):
@@ -471,6 +488,10 @@ class StackCollector(collector.PeriodicCollector):
             self.ignore_profiler, self._thread_time, self.nframes, self.interval, wall_time, self._thread_span_links,
         )
 
+        if self.endpoints:
+            stack_events = all_events[0]
+            self.endpoint_active = any(event.trace_resource in self.endpoints for event in stack_events)
+
         used_wall_time_ns = compat.monotonic_ns() - now
         self.interval = self._compute_new_interval(used_wall_time_ns)
 
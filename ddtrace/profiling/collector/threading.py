@@ -1,6 +1,7 @@
 from __future__ import absolute_import
 
 import os.path
+import random
 import sys
 import threading
 import typing
@@ -60,18 +61,131 @@ else:
         del _w
 
 
+@attr.s(slots=True)
+class _LockSiteBudget(object):
+    """Token bucket, wait time average and contention counters of a single lock site."""
+
+    tokens = attr.ib(type=float)
+    last_refill_ns = attr.ib(type=int)
+    window_start_ns = attr.ib(type=int)
+    avg_wait_time_ns = attr.ib(type=float)
+    selected = attr.ib(default=0, type=int)
+    captured = attr.ib(default=0, type=int)
+    previous_capture_pct = attr.ib(default=None, type=typing.Optional[float])
+
+
+@attr.s
+class LockSiteSampler(object):
+    """Determine the contended lock acquisitions that should be captured.
+
+    Each lock site (the ``file:line`` where the lock has been allocated) gets its own budget of events per second, so
+    hot locks cannot starve the rarely contended ones. Only acquisitions that had to wait are submitted to the
+    sampler: uncontended acquisitions are never captured.
+
+    Acquisitions are weighted by their wait time: the ones that waited at least as long as the moving average of the
+    site are always candidates for the budget, the shorter ones are candidates with a probability proportional to
+    their wait time. The sampling percentage of each captured event accounts for both, so the exported wait times are
+    not biased toward the long waits.
+
+    This is not thread-safe: like :class:`ddtrace.profiling.collector.CaptureSampler`, concurrent updates might be lost,
+    which only makes the budget slightly inaccurate.
+    """
+
+    # Weight of the last wait time in the moving average of a site
+    WAIT_TIME_SMOOTHING = 0.125
+
+    events_per_second = attr.ib(type=float)
+    _sites = attr.ib(factory=dict, init=False, repr=False)  # type: typing.Dict[str, _LockSiteBudget]
+
+    @events_per_second.validator
+    def events_per_second_validator(self, attribute, value):
+        if value <= 0:
+            raise ValueError("Events per second should be greater than 0")
+
+    def capture(self, site, now_ns, wait_time_ns):
+        # type: (str, int, int) -> typing.Optional[float]
+        """Decide whether a contended acquisition of the lock allocated at `site` should be captured.
+
+        :param site: The lock site name.
+        :param now_ns: The current monotonic time in nanoseconds.
+        :param wait_time_ns: The time the acquisition waited for the lock in nanoseconds.
+        :return: The sampling percentage of the acquisition if it should be captured, `None` otherwise.
+        """
+        budget = self._sites.get(site)
+        if budget is None:
+            budget = self._sites[site] = _LockSiteBudget(
+                tokens=max(1.0, self.events_per_second),
+                last_refill_ns=now_ns,
+                window_start_ns=now_ns,
+                avg_wait_time_ns=float(wait_time_ns),
+            )
+        else:
+            budget.tokens = min(
+                max(1.0, self.events_per_second),
+                budget.tokens + (now_ns - budget.last_refill_ns) * self.events_per_second / 1e9,
+            )
+            budget.last_refill_ns = now_ns
+            if now_ns - budget.window_start_ns >= 1e9:
+                budget.previous_capture_pct = self._window_capture_pct(budget)
+                budget.window_start_ns = now_ns
+                budget.selected = budget.captured = 0
+
+        if wait_time_ns >= budget.avg_wait_time_ns:
+            weight = 1.0
+        else:
+            weight = wait_time_ns / budget.avg_wait_time_ns
+        budget.avg_wait_time_ns += (wait_time_ns - budget.avg_wait_time_ns) * self.WAIT_TIME_SMOOTHING
+
+        if weight < 1.0 and random.random() >= weight:
+            return None
+
+        budget.selected += 1
+        if budget.tokens >= 1:
+            budget.tokens -= 1
+            budget.captured += 1
+            return self._capture_pct(budget) * weight
+        return None
+
+    @staticmethod
+    def _window_capture_pct(budget):
+        # type: (_LockSiteBudget) -> float
+        if not budget.selected:
+            return 100.0
+        return 100.0 * budget.captured / budget.selected
+
+    def _capture_pct(self, budget):
+        # type: (_LockSiteBudget) -> float
+        # The last complete one-second window is used when available since the current window is biased toward the
+        # events captured at its start.
+        if budget.previous_capture_pct is not None:
+            return budget.previous_capture_pct
+        return self._window_capture_pct(budget)
+
+    def capture_pct(self, site):
+        # type: (str) -> float
+        """Return the estimated percentage of the weighted contended acquisitions captured for a lock site."""
+        budget = self._sites.get(site)
+        if budget is None:
+            return 100.0
+        return self._capture_pct(budget)
+
+
 class _ProfiledLock(wrapt.ObjectProxy):
-    def __init__(self, wrapped, recorder, tracer, max_nframes, capture_sampler):
+    def __init__(self, wrapped, recorder, tracer, max_nframes, capture_sampler, site_sampler=None):
         wrapt.ObjectProxy.__init__(self, wrapped)
         self._self_recorder = recorder
         self._self_tracer = tracer
         self._self_max_nframes = max_nframes
         self._self_capture_sampler = capture_sampler
+        self._self_site_sampler = site_sampler
         frame = sys._getframe(2 if WRAPT_C_EXT else 3)
         code = frame.f_code
         self._self_name = "%s:%d" % (os.path.basename(code.co_filename), frame.f_lineno)
 
     def acquire(self, *args, **kwargs):
+        if self._self_site_sampler is not None:
+            return self._acquire_site_sampled(*args, **kwargs)
+
         if not self._self_capture_sampler.capture():
             return self.__wrapped__.acquire(*args, **kwargs)
 
@@ -81,28 +195,54 @@ class _ProfiledLock(wrapt.ObjectProxy):
         finally:
             try:
                 end = self._self_acquired_at = compat.monotonic_ns()
-                thread_id, thread_name = _current_thread()
-                frames, nframes = _traceback.pyframe_to_frames(sys._getframe(1), self._self_max_nframes)
-                task_id, task_name = _task.get_task(thread_id)
-                event = LockAcquireEvent(
-                    lock_name=self._self_name,
-                    frames=frames,
-                    nframes=nframes,
-                    thread_id=thread_id,
-                    thread_name=thread_name,
-                    task_id=task_id,
-                    task_name=task_name,
-                    wait_time_ns=end - start,
-                    sampling_pct=self._self_capture_sampler.capture_pct,
-                )
-
-                if self._self_tracer is not None:
-                    event.set_trace_info(self._self_tracer.current_span())
-
-                self._self_recorder.push_event(event)
+                self._push_acquire_event(sys._getframe(1), end - start, self._self_capture_sampler.capture_pct)
             except Exception:
                 pass
 
+    def _acquire_site_sampled(self, *args, **kwargs):
+        # Uncontended acquisitions do not wait: never capture them.
+        if self.__wrapped__.acquire(False):
+            return True
+
+        # Non-blocking acquisitions do not wait either: no need to retry.
+        if not (args[0] if args else kwargs.get("blocking", True)):
+            return False
+
+        start = compat.monotonic_ns()
+        acquired = self.__wrapped__.acquire(*args, **kwargs)
+        end = compat.monotonic_ns()
+        try:
+            if acquired:
+                sampling_pct = self._self_site_sampler.capture(self._self_name, end, end - start)
+                if sampling_pct is not None:
+                    self._self_acquired_at = end
+                    self._self_sampling_pct = sampling_pct
+                    self._push_acquire_event(sys._getframe(2), end - start, sampling_pct)
+        except Exception:
+            pass
+        return acquired
+
+    def _push_acquire_event(self, caller_frame, wait_time_ns, sampling_pct):
+        thread_id, thread_name = _current_thread()
+        frames, nframes = _traceback.pyframe_to_frames(caller_frame, self._self_max_nframes)
+        task_id, task_name = _task.get_task(thread_id)
+        event = LockAcquireEvent(
+            lock_name=self._self_name,
+            frames=frames,
+            nframes=nframes,
+            thread_id=thread_id,
+            thread_name=thread_name,
+            task_id=task_id,
+            task_name=task_name,
+            wait_time_ns=wait_time_ns,
+            sampling_pct=sampling_pct,
+        )
+
+        if self._self_tracer is not None:
+            event.set_trace_info(self._self_tracer.current_span())
+
+        self._self_recorder.push_event(event)
+
     def release(self, *args, **kwargs):
         try:
             return self.__wrapped__.release(*args, **kwargs)
@@ -123,7 +263,7 @@ class _ProfiledLock(wrapt.ObjectProxy):
                             task_id=task_id,
                             task_name=task_name,
                             locked_for_ns=end - self._self_acquired_at,
-                            sampling_pct=self._self_capture_sampler.capture_pct,
+                            sampling_pct=self._release_sampling_pct(),
                         )
 
                         if self._self_tracer is not None:
@@ -135,6 +275,13 @@ class _ProfiledLock(wrapt.ObjectProxy):
             except Exception:
                 pass
 
+    def _release_sampling_pct(self):
+        # type: (...) -> float
+        if self._self_site_sampler is not None:
+            # The release is captured because its acquisition was: reuse its sampling percentage
+            return self._self_sampling_pct
+        return self._self_capture_sampler.capture_pct
+
     acquire_lock = acquire
 
 
@@ -152,6 +299,9 @@ class LockCollector(collector.CaptureSamplerCollector):
 
     nframes = attr.ib(factory=attr_utils.from_env("DD_PROFILING_MAX_FRAMES", 64, int))
     tracer = attr.ib(default=None)
+    site_events_per_second = attr.ib(
+        factory=attr_utils.from_env("DD_PROFILING_LOCK_SITE_EVENTS_PER_SECOND", 0.0, float)
+    )
 
     def _start_service(self):  # type: ignore[override]
         # type: (...) -> None
@@ -172,9 +322,14 @@ class LockCollector(collector.CaptureSamplerCollector):
         # Nobody should use locks from `_thread`; if they do so, then it's deliberate and we don't profile.
         self.original = threading.Lock
 
+        if self.site_events_per_second > 0:
+            site_sampler = LockSiteSampler(self.site_events_per_second)  # type: typing.Optional[LockSiteSampler]
+        else:
+            site_sampler = None
+
         def _allocate_lock(wrapped, instance, args, kwargs):
             lock = wrapped(*args, **kwargs)
-            return _ProfiledLock(lock, self.recorder, self.tracer, self.nframes, self._capture_sampler)
+            return _ProfiledLock(lock, self.recorder, self.tracer, self.nframes, self._capture_sampler, site_sampler)
 
         threading.Lock = FunctionWrapper(self.original, _allocate_lock)  # type: ignore[misc]
 
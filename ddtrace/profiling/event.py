@@ -58,9 +58,8 @@ class StackBasedEvent(SampleEvent):
         if span is not None:
             self.trace_id = span.trace_id
             self.span_id = span.span_id
-            if span._local_root is not None:
-                self.trace_resource = span._local_root.resource
-                self.trace_type = span._local_root.span_type
+            self.trace_resource = span._local_root.resource
+            self.trace_type = span._local_root.span_type
             span._on_finish_callbacks.append(self._update_trace_resource)
 
     def _update_trace_resource(
@@ -68,5 +67,4 @@ class StackBasedEvent(SampleEvent):
         span,  # type: ddspan.Span
     ):
         # type: (...) -> None
-        if span._local_root is not None:
-            self.trace_resource = span._local_root.resource
+        self.trace_resource = span._local_root.resource
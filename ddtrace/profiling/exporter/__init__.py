@@ -1,3 +1,5 @@
+import typing
+
 import attr
 
 
@@ -19,6 +21,29 @@ class Exporter(object):
         """
         raise NotImplementedError
 
+    def serialize(self, events, start_time_ns, end_time_ns):
+        # type: (...) -> typing.Any
+        """Serialize events into a payload that can be sent later with `upload`.
+
+        Splitting the export in two steps allows the upload to run in another thread while the next events are
+        serialized. The default implementation does the whole export at once.
+
+        :param events: List of events to export.
+        :param start_time_ns: The start time of recording.
+        :param end_time_ns: The end time of recording.
+        :return: The payload to pass to `upload` or `None` if there is nothing left to upload.
+        """
+        self.export(events, start_time_ns, end_time_ns)
+        return None
+
+    def upload(self, payload):
+        # type: (typing.Any) -> None
+        """Upload a payload returned by `serialize`.
+
+        :param payload: The payload to upload.
+        """
+        pass
+
 
 @attr.s
 class NullExporter(Exporter):
@@ -137,6 +137,16 @@ class PprofHTTPExporter(pprof.PprofExporter):
         :param start_time_ns: The start time of recording.
         :param end_time_ns: The end time of recording.
         """
+        self.upload(self.serialize(events, start_time_ns, end_time_ns))
+
+    def serialize(self, events, start_time_ns, end_time_ns):
+        """Serialize events into the HTTP request to send.
+
+        :param events: The event dictionary from a `ddtrace.profiling.recorder.Recorder`.
+        :param start_time_ns: The start time of recording.
+        :param end_time_ns: The end time of recording.
+        :return: A tuple with the request body and headers.
+        """
         if self.api_key:
             headers = {
                 "DD-API-KEY": self.api_key.encode(),
@@ -173,6 +183,14 @@ class PprofHTTPExporter(pprof.PprofExporter):
         )
         headers["Content-Type"] = content_type
 
+        return body, headers
+
+    def upload(self, payload):
+        """Send a request returned by `serialize` to the HTTP endpoint.
+
+        :param payload: A tuple with the request body and headers.
+        """
+        body, headers = payload
         client = agent.get_connection(self.endpoint, self.timeout)
         self._upload(client, self.endpoint_path, body, headers)
 
@@ -546,11 +546,8 @@ class PprofExporter(exporter.Exporter):
             (threading.LockReleaseEvent, converter.convert_lock_release_event),
         ):
             lock_events = events.get(event_class, [])
-            sampling_sum_pct = sum(event.sampling_pct for event in lock_events)
 
             if lock_events:
-                sampling_ratio_avg = sampling_sum_pct / (len(lock_events) * 100.0)
-
                 for (
                     lock_name,
                     thread_id,
@@ -564,6 +561,9 @@ class PprofExporter(exporter.Exporter):
                     frames,
                     nframes,
                 ), l_events in self._group_lock_events(lock_events):
+                    l_events = list(l_events)
+                    # Lock sites can be sampled at different rates: compute the ratio for each group
+                    sampling_ratio_avg = sum(event.sampling_pct for event in l_events) / (len(l_events) * 100.0)
                     convert_fn(
                         lock_name,
                         thread_id,
@@ -576,7 +576,7 @@ class PprofExporter(exporter.Exporter):
                         trace_type,
                         frames,
                         nframes,
-                        list(l_events),
+                        l_events,
                         sampling_ratio_avg,
                     )
 
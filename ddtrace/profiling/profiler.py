@@ -207,9 +207,15 @@ class _ProfilerInstance(service.Service):
             default_max_events=int(os.environ.get("DD_PROFILING_MAX_EVENTS", recorder.Recorder._DEFAULT_MAX_EVENTS)),
         )
 
+        stack_collector = stack.StackCollector(r, tracer=self.tracer)
+        if stack_collector.endpoints:
+            memory_collector = memalloc.MemoryCollector(r, endpoint_active=lambda: stack_collector.endpoint_active)
+        else:
+            memory_collector = memalloc.MemoryCollector(r)
+
         self._collectors = [
-            stack.StackCollector(r, tracer=self.tracer),
-            memalloc.MemoryCollector(r),
+            stack_collector,
+            memory_collector,
             threading.LockCollector(r, tracer=self.tracer),
         ]
 
@@ -1,10 +1,13 @@
 # -*- encoding: utf-8 -*-
+import collections
 import logging
+import typing
 
 import attr
 
 from ddtrace.internal import compat
 from ddtrace.internal import periodic
+from ddtrace.internal import service
 from ddtrace.profiling import _traceback
 from ddtrace.profiling import exporter
 from ddtrace.utils import attr as attr_utils
@@ -13,6 +16,73 @@ from ddtrace.utils import attr as attr_utils
 LOG = logging.getLogger(__name__)
 
 
+def _log_export_error(e):
+    # type: (Exception) -> None
+    if isinstance(e, exporter.ExportError):
+        LOG.error("Unable to export profile: %s. Ignoring.", _traceback.format_exception(e))
+    else:
+        LOG.error(
+            "Unexpected error while exporting events. "
+            "Please report this bug to https://github.com/DataDog/dd-trace-py/issues",
+            exc_info=True,
+        )
+
+
+@attr.s
+class Uploader(periodic.PeriodicService):
+    """Upload serialized profiles in the background.
+
+    Uploads can take a long time when the endpoint is slow (timeouts and retries): running them here allows the
+    scheduler to serialize the next profile in the meantime. At most `max_pending` payloads wait for upload; when the
+    queue is full, the oldest payload is dropped.
+    """
+
+    _interval = attr.ib(default=1.0, type=float)
+    max_pending = attr.ib(factory=attr_utils.from_env("DD_PROFILING_UPLOAD_QUEUE_SIZE", 1, int))
+    dropped = attr.ib(default=0, init=False)
+    _pending = attr.ib(init=False, repr=False, eq=False)
+
+    @max_pending.validator
+    def max_pending_validator(self, attribute, value):
+        if value < 1:
+            raise ValueError("Upload queue size should be at least 1")
+
+    def __attrs_post_init__(self):
+        # A deque with a maxlen discards the oldest item when full
+        self._pending = collections.deque(
+            maxlen=self.max_pending
+        )  # type: typing.Deque[typing.Tuple[exporter.Exporter, typing.Any]]
+
+    def put(
+        self,
+        exp,  # type: exporter.Exporter
+        payload,  # type: typing.Any
+    ):
+        # type: (...) -> None
+        """Queue a payload to be uploaded by an exporter."""
+        if len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            LOG.warning("Profile upload is too slow, dropping a pending profile (%d dropped so far)", self.dropped)
+        self._pending.append((exp, payload))
+
+    def periodic(self):
+        # type: (...) -> None
+        """Upload all the pending payloads."""
+        while True:
+            try:
+                exp, payload = self._pending.popleft()
+            except IndexError:
+                return
+
+            try:
+                exp.upload(payload)
+            except Exception as e:
+                _log_export_error(e)
+
+    # Upload what is still pending before shutting down
+    on_shutdown = periodic
+
+
 @attr.s
 class Scheduler(periodic.PeriodicService):
     """Schedule export of recorded data."""
@@ -23,6 +93,7 @@ class Scheduler(periodic.PeriodicService):
     _interval = attr.ib(factory=attr_utils.from_env("DD_PROFILING_UPLOAD_INTERVAL", 60.0, float))
     _configured_interval = attr.ib(init=False)
     _last_export = attr.ib(init=False, default=None, eq=False)
+    _uploader = attr.ib(factory=Uploader, init=False, repr=False, eq=False)
 
     def __attrs_post_init__(self):
         # Copy the value to use it later since we're going to adjust the real interval
@@ -32,10 +103,37 @@ class Scheduler(periodic.PeriodicService):
         # type: (...) -> None
         """Start the scheduler."""
         LOG.debug("Starting scheduler")
+        self._uploader.start()
         super(Scheduler, self)._start_service()
         self._last_export = compat.time_ns()
         LOG.debug("Scheduler started")
 
+    def _stop_service(self):  # type: ignore[override]
+        # type: (...) -> None
+        """Stop the scheduler."""
+        super(Scheduler, self)._stop_service()
+        # DEV: the uploader is stopped by the scheduler thread once its last flush is over, otherwise a payload could
+        # be queued after the uploader uploaded the pending ones. Stop it here if the thread is already gone.
+        if not self._worker.is_alive():
+            self._stop_uploader()
+
+    def _stop_uploader(self):
+        # type: (...) -> None
+        try:
+            self._uploader.stop()
+        except service.ServiceStatusError:
+            # Already stopped by the scheduler thread
+            pass
+
+    on_shutdown = _stop_uploader
+
+    def join(
+        self, timeout=None  # type: typing.Optional[float]
+    ):
+        # type: (...) -> None
+        super(Scheduler, self).join(timeout)
+        self._uploader.join(timeout)
+
     def flush(self):
         """Flush events from recorder to exporters."""
         LOG.debug("Flushing events")
@@ -48,16 +146,18 @@ class Scheduler(periodic.PeriodicService):
             events = self.recorder.reset()
             start = self._last_export
             self._last_export = compat.time_ns()
+            # Once stopped (e.g. last flush at exit), upload synchronously
+            background_upload = self._uploader.status == service.ServiceStatus.RUNNING
             for exp in self.exporters:
                 try:
-                    exp.export(events, start, self._last_export)
-                except exporter.ExportError as e:
-                    LOG.error("Unable to export profile: %s. Ignoring.", _traceback.format_exception(e))
-                except Exception:
-                    LOG.exception(
-                        "Unexpected error while exporting events. "
-                        "Please report this bug to https://github.com/DataDog/dd-trace-py/issues"
-                    )
+                    payload = exp.serialize(events, start, self._last_export)
+                    if payload is not None:
+                        if background_upload:
+                            self._uploader.put(exp, payload)
+                        else:
+                            exp.upload(payload)
+                except Exception as e:
+                    _log_export_error(e)
 
     def periodic(self):
         start_time = compat.monotonic()
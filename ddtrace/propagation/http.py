@@ -1,8 +1,20 @@
+from typing import Any
 from typing import Dict
-from typing import FrozenSet
+from typing import Iterable
 from typing import Optional
+from typing import Tuple
+from typing import Type
 
+from .. import config
+from ..constants import HIGHER_ORDER_TRACE_ID_BITS
+from ..constants import PROPAGATION_STYLE_B3
+from ..constants import PROPAGATION_STYLE_B3_SINGLE_HEADER
+from ..constants import PROPAGATION_STYLE_DATADOG
+from ..constants import PROPAGATION_STYLE_W3C_TRACECONTEXT
 from ..context import Context
+from ..ext.priority import AUTO_KEEP
+from ..ext.priority import AUTO_REJECT
+from ..ext.priority import USER_KEEP
 from ..internal.logger import get_logger
 from .utils import get_wsgi_header
 
@@ -15,6 +27,18 @@ HTTP_HEADER_TRACE_ID = "x-datadog-trace-id"
 HTTP_HEADER_PARENT_ID = "x-datadog-parent-id"
 HTTP_HEADER_SAMPLING_PRIORITY = "x-datadog-sampling-priority"
 HTTP_HEADER_ORIGIN = "x-datadog-origin"
+_HTTP_HEADER_TAGS = "x-datadog-tags"
+
+# B3 headers, see https://github.com/openzipkin/b3-propagation
+_HTTP_HEADER_B3_SINGLE = "b3"
+_HTTP_HEADER_B3_TRACE_ID = "x-b3-traceid"
+_HTTP_HEADER_B3_SPAN_ID = "x-b3-spanid"
+_HTTP_HEADER_B3_SAMPLED = "x-b3-sampled"
+_HTTP_HEADER_B3_FLAGS = "x-b3-flags"
+
+# W3C Trace Context headers, see https://www.w3.org/TR/trace-context/
+_HTTP_HEADER_TRACEPARENT = "traceparent"
+_HTTP_HEADER_TRACESTATE = "tracestate"
 
 
 # Note that due to WSGI spec we have to also check for uppercased and prefixed
@@ -27,8 +51,420 @@ POSSIBLE_HTTP_HEADER_SAMPLING_PRIORITIES = frozenset(
 POSSIBLE_HTTP_HEADER_ORIGIN = frozenset([HTTP_HEADER_ORIGIN, get_wsgi_header(HTTP_HEADER_ORIGIN).lower()])
 
 
+_ZERO_HIGH_BITS = "0" * 16
+
+
+def _trace_id_from_hex(value):
+    # type: (str) -> Tuple[int, Optional[str]]
+    """Parse a 64 or 128-bit hexadecimal trace id.
+
+    Return the lower 64 bits and the hexadecimal representation of the higher 64 bits, if any. The two halves are
+    parsed separately to keep the lower bits a machine-size integer.
+    """
+    if len(value) == 16:
+        return int(value, 16), None
+    if len(value) != 32:
+        raise ValueError("invalid id length %d" % len(value))
+    return int(value[16:], 16), _trace_id_high_bits_from_hex(value[:16])
+
+
+def _trace_id_high_bits_from_hex(value):
+    # type: (str) -> Optional[str]
+    """Validate the hexadecimal representation of the higher 64 bits of a trace id.
+
+    Return the normalized value, or None when all the bits are zero.
+    """
+    if len(value) != 16:
+        raise ValueError("invalid id length %d" % len(value))
+    # Only check the value is valid hexadecimal
+    int(value, 16)
+    value = value.lower()
+    return None if value == _ZERO_HIGH_BITS else value
+
+
+def _trace_id_to_hex(trace_id, trace_id_high_bits):
+    # type: (int, Optional[str]) -> str
+    """Return the 128-bit hexadecimal representation of a trace id from its lower bits and its higher bits, if any."""
+    return "%s%016x" % (trace_id_high_bits or _ZERO_HIGH_BITS, trace_id)
+
+
+def _set_trace_id_high_bits(context, high_bits):
+    # type: (Context, Optional[str]) -> Context
+    if high_bits is not None:
+        context._meta[HIGHER_ORDER_TRACE_ID_BITS] = high_bits
+    return context
+
+
+class _Propagator(object):
+    """Inject and extract the trace context with the headers of a propagation style."""
+
+    # Names of the headers used by the style
+    HEADERS = ()  # type: Tuple[str, ...]
+
+    @staticmethod
+    def _inject(span_context, headers):
+        # type: (Context, Dict[str, str]) -> None
+        raise NotImplementedError
+
+    @staticmethod
+    def _extract(values):
+        # type: (Dict[str, str]) -> Optional[Context]
+        """Return the context found in the values of the style headers, if any."""
+        raise NotImplementedError
+
+
+class _DatadogPropagator(_Propagator):
+    """Propagate the trace with the ``x-datadog-*`` headers."""
+
+    HEADERS = (
+        HTTP_HEADER_TRACE_ID,
+        HTTP_HEADER_PARENT_ID,
+        HTTP_HEADER_SAMPLING_PRIORITY,
+        HTTP_HEADER_ORIGIN,
+        _HTTP_HEADER_TAGS,
+    )
+
+    @staticmethod
+    def _inject(span_context, headers):
+        # type: (Context, Dict[str, str]) -> None
+        headers[HTTP_HEADER_TRACE_ID] = str(span_context.trace_id)
+        headers[HTTP_HEADER_PARENT_ID] = str(span_context.span_id)
+        sampling_priority = span_context.sampling_priority
+        # Propagate priority only if defined
+        if sampling_priority is not None:
+            headers[HTTP_HEADER_SAMPLING_PRIORITY] = str(sampling_priority)
+        # Propagate origin only if defined
+        if span_context.dd_origin is not None:
+            headers[HTTP_HEADER_ORIGIN] = str(span_context.dd_origin)
+        # The higher bits of 128-bit trace ids are propagated as a trace tag
+        trace_id_high_bits = span_context._meta.get(HIGHER_ORDER_TRACE_ID_BITS)
+        if trace_id_high_bits is not None:
+            headers[_HTTP_HEADER_TAGS] = "%s=%s" % (HIGHER_ORDER_TRACE_ID_BITS, trace_id_high_bits)
+
+    @staticmethod
+    def _extract(values):
+        # type: (Dict[str, str]) -> Optional[Context]
+        trace_id = values.get(HTTP_HEADER_TRACE_ID)
+        if trace_id is None:
+            return None
+
+        parent_span_id = values.get(HTTP_HEADER_PARENT_ID, "0")
+        sampling_priority = values.get(HTTP_HEADER_SAMPLING_PRIORITY)
+        origin = values.get(HTTP_HEADER_ORIGIN)
+
+        # Try to parse values into their expected types
+        try:
+            context = Context(
+                # DEV: Do not allow `0` for trace id or span id, use None instead
+                trace_id=int(trace_id) or None,
+                span_id=int(parent_span_id) or None,
+                sampling_priority=int(sampling_priority) if sampling_priority is not None else None,
+                dd_origin=origin,
+            )
+        # If headers are invalid and cannot be parsed, ignore them and log the issue.
+        except (TypeError, ValueError):
+            log.debug(
+                "received invalid x-datadog-* headers, trace-id: %r, parent-id: %r, priority: %r, origin: %r",
+                trace_id,
+                parent_span_id,
+                sampling_priority,
+                origin,
+            )
+            return None
+
+        tags = values.get(_HTTP_HEADER_TAGS)
+        if tags is not None:
+            _set_trace_id_high_bits(context, _DatadogPropagator._parse_trace_id_high_bits(tags))
+        return context
+
+    @staticmethod
+    def _parse_trace_id_high_bits(tags):
+        # type: (str) -> Optional[str]
+        """Return the higher bits of the trace id found in the ``x-datadog-tags`` header, if valid."""
+        for tag in tags.split(","):
+            key, _, value = tag.partition("=")
+            if key.strip() == HIGHER_ORDER_TRACE_ID_BITS:
+                try:
+                    return _trace_id_high_bits_from_hex(value.strip())
+                except ValueError:
+                    log.debug("received invalid %s trace tag: %r", HIGHER_ORDER_TRACE_ID_BITS, value)
+                    return None
+        return None
+
+
+class _B3MultiPropagator(_Propagator):
+    """Propagate the trace with the ``x-b3-*`` headers."""
+
+    HEADERS = (_HTTP_HEADER_B3_TRACE_ID, _HTTP_HEADER_B3_SPAN_ID, _HTTP_HEADER_B3_SAMPLED, _HTTP_HEADER_B3_FLAGS)
+
+    @staticmethod
+    def _inject(span_context, headers):
+        # type: (Context, Dict[str, str]) -> None
+        if span_context.trace_id is None or span_context.span_id is None:
+            return
+
+        trace_id_high_bits = span_context._meta.get(HIGHER_ORDER_TRACE_ID_BITS)
+        if trace_id_high_bits is None:
+            headers[_HTTP_HEADER_B3_TRACE_ID] = "%016x" % span_context.trace_id
+        else:
+            headers[_HTTP_HEADER_B3_TRACE_ID] = "%s%016x" % (trace_id_high_bits, span_context.trace_id)
+        headers[_HTTP_HEADER_B3_SPAN_ID] = "%016x" % span_context.span_id
+        sampling_priority = span_context.sampling_priority
+        if sampling_priority is not None:
+            if sampling_priority >= USER_KEEP:
+                headers[_HTTP_HEADER_B3_FLAGS] = "1"
+            else:
+                headers[_HTTP_HEADER_B3_SAMPLED] = "1" if sampling_priority > 0 else "0"
+
+    @staticmethod
+    def _extract(values):
+        # type: (Dict[str, str]) -> Optional[Context]
+        trace_id = values.get(_HTTP_HEADER_B3_TRACE_ID)
+        if trace_id is None:
+            return None
+
+        try:
+            span_id = values.get(_HTTP_HEADER_B3_SPAN_ID)
+            parent_span_id = int(span_id, 16) if span_id is not None else None
+            if values.get(_HTTP_HEADER_B3_FLAGS) == "1":
+                sampling_priority = USER_KEEP  # type: Optional[int]
+            else:
+                sampled = values.get(_HTTP_HEADER_B3_SAMPLED)
+                if sampled is None:
+                    sampling_priority = None
+                else:
+                    sampling_priority = AUTO_KEEP if sampled in ("1", "true", "d") else AUTO_REJECT
+            lower_bits, high_bits = _trace_id_from_hex(trace_id)
+            return _set_trace_id_high_bits(
+                Context(
+                    trace_id=lower_bits or None, span_id=parent_span_id or None, sampling_priority=sampling_priority
+                ),
+                high_bits,
+            )
+        except (TypeError, ValueError):
+            log.debug("received invalid x-b3-* headers, trace-id: %r", trace_id)
+            return None
+
+
+class _B3SingleHeaderPropagator(_Propagator):
+    """Propagate the trace with the ``b3`` header."""
+
+    HEADERS = (_HTTP_HEADER_B3_SINGLE,)
+
+    @staticmethod
+    def _inject(span_context, headers):
+        # type: (Context, Dict[str, str]) -> None
+        if span_context.trace_id is None or span_context.span_id is None:
+            return
+
+        trace_id_high_bits = span_context._meta.get(HIGHER_ORDER_TRACE_ID_BITS)
+        if trace_id_high_bits is None:
+            value = "%016x-%016x" % (span_context.trace_id, span_context.span_id)
+        else:
+            value = "%s%016x-%016x" % (trace_id_high_bits, span_context.trace_id, span_context.span_id)
+        sampling_priority = span_context.sampling_priority
+        if sampling_priority is not None:
+            if sampling_priority >= USER_KEEP:
+                value += "-d"
+            else:
+                value += "-1" if sampling_priority > 0 else "-0"
+        headers[_HTTP_HEADER_B3_SINGLE] = value
+
+    @staticmethod
+    def _extract(values):
+        # type: (Dict[str, str]) -> Optional[Context]
+        value = values.get(_HTTP_HEADER_B3_SINGLE)
+        # A single sampling decision without ids can not be used to continue the trace
+        if value is None or len(value) < 33:
+            return None
+
+        try:
+            # {trace_id}-{span_id}[-{sampling}[-{parent_span_id}]]
+            parts = value.split("-", 3)
+            if len(parts) > 2:
+                sampled = parts[2]
+                if sampled == "d":
+                    sampling_priority = USER_KEEP  # type: Optional[int]
+                else:
+                    sampling_priority = AUTO_KEEP if sampled in ("1", "true") else AUTO_REJECT
+            else:
+                sampling_priority = None
+            lower_bits, high_bits = _trace_id_from_hex(parts[0])
+            return _set_trace_id_high_bits(
+                Context(
+                    trace_id=lower_bits or None, span_id=int(parts[1], 16) or None, sampling_priority=sampling_priority
+                ),
+                high_bits,
+            )
+        except (IndexError, TypeError, ValueError):
+            log.debug("received invalid b3 header: %r", value)
+            return None
+
+
+class _TraceContextPropagator(_Propagator):
+    """Propagate the trace with the W3C Trace Context ``traceparent`` and ``tracestate`` headers.
+
+    The Datadog sampling priority and origin are propagated in the ``dd`` member of ``tracestate``.
+    """
+
+    HEADERS = (_HTTP_HEADER_TRACEPARENT, _HTTP_HEADER_TRACESTATE)
+
+    @staticmethod
+    def _inject(span_context, headers):
+        # type: (Context, Dict[str, str]) -> None
+        if span_context.trace_id is None or span_context.span_id is None:
+            return
+
+        sampling_priority = span_context.sampling_priority
+        sampled = sampling_priority is not None and sampling_priority > 0
+        headers[_HTTP_HEADER_TRACEPARENT] = "00-%s-%016x-%s" % (
+            _trace_id_to_hex(span_context.trace_id, span_context._meta.get(HIGHER_ORDER_TRACE_ID_BITS)),
+            span_context.span_id,
+            "01" if sampled else "00",
+        )
+
+        dd_state = []
+        if sampling_priority is not None:
+            dd_state.append("s:%d" % sampling_priority)
+        origin = span_context.dd_origin
+        if origin is not None:
+            # Characters reserved by the tracestate format are not allowed in the origin
+            dd_state.append("o:" + "".join("_" if c in _TRACESTATE_RESERVED_CHARACTERS else c for c in origin))
+        # The updated dd member goes first, followed by the members of the other vendors
+        members = []
+        if dd_state:
+            members.append("dd=" + ";".join(dd_state))
+        if span_context._tracestate:
+            members.append(span_context._tracestate)
+        if members:
+            headers[_HTTP_HEADER_TRACESTATE] = ",".join(members)
+
+    @staticmethod
+    def _extract(values):
+        # type: (Dict[str, str]) -> Optional[Context]
+        traceparent = values.get(_HTTP_HEADER_TRACEPARENT)
+        if traceparent is None:
+            return None
+
+        # version-trace_id-parent_id-flags, with fixed size fields: check the separators instead of splitting
+        traceparent = traceparent.strip()
+        if (
+            len(traceparent) < 55
+            or traceparent[2] != "-"
+            or traceparent[35] != "-"
+            or traceparent[52] != "-"
+            # Only future versions may append fields
+            or (len(traceparent) > 55 and (traceparent[:2] == "00" or traceparent[55] != "-"))
+            or traceparent[:2] == "ff"
+        ):
+            log.debug("received invalid traceparent header: %r", traceparent)
+            return None
+
+        try:
+            int(traceparent[:2], 16)
+            trace_id, trace_id_high_bits = _trace_id_from_hex(traceparent[3:35])
+            span_id = int(traceparent[36:52], 16)
+            sampled = int(traceparent[53:55], 16) & 1
+        except ValueError:
+            log.debug("received invalid traceparent header: %r", traceparent)
+            return None
+
+        # All zero ids are invalid
+        if not trace_id or not span_id:
+            log.debug("received invalid traceparent header: %r", traceparent)
+            return None
+
+        sampling_priority = None  # type: Optional[int]
+        origin = None  # type: Optional[str]
+        other_members = None  # type: Optional[str]
+        tracestate = values.get(_HTTP_HEADER_TRACESTATE)
+        if tracestate is not None:
+            sampling_priority, origin, other_members = _TraceContextPropagator._parse_tracestate(tracestate)
+
+        # The sampled flag has precedence when it contradicts the propagated sampling priority
+        if sampling_priority is None or (sampling_priority > 0) != bool(sampled):
+            sampling_priority = AUTO_KEEP if sampled else AUTO_REJECT
+
+        context = Context(trace_id=trace_id, span_id=span_id, sampling_priority=sampling_priority, dd_origin=origin)
+        context._tracestate = other_members
+        return _set_trace_id_high_bits(context, trace_id_high_bits)
+
+    @staticmethod
+    def _parse_tracestate(tracestate):
+        # type: (str) -> Tuple[Optional[int], Optional[str], Optional[str]]
+        """Parse a ``tracestate`` header.
+
+        Return the sampling priority and origin of the ``dd`` member, and the members of the other vendors.
+        """
+        sampling_priority = None  # type: Optional[int]
+        origin = None  # type: Optional[str]
+        other_members = []
+        for member in tracestate.split(","):
+            member = member.strip()
+            if member.startswith("dd="):
+                for field in member[3:].split(";"):
+                    if field.startswith("s:"):
+                        try:
+                            sampling_priority = int(field[2:])
+                        except ValueError:
+                            pass
+                    elif field.startswith("o:"):
+                        origin = field[2:]
+            elif member:
+                other_members.append(member)
+        # Keep room for the dd member within the maximum number of members
+        return sampling_priority, origin, ",".join(other_members[: _TRACESTATE_MAX_MEMBERS - 1]) or None
+
+
+_TRACESTATE_RESERVED_CHARACTERS = frozenset(",;=~ \t")
+_TRACESTATE_MAX_MEMBERS = 32
+
+# Propagators by propagation style
+_PROPAGATORS = {
+    PROPAGATION_STYLE_DATADOG: _DatadogPropagator,
+    PROPAGATION_STYLE_B3: _B3MultiPropagator,
+    PROPAGATION_STYLE_B3_SINGLE_HEADER: _B3SingleHeaderPropagator,
+    PROPAGATION_STYLE_W3C_TRACECONTEXT: _TraceContextPropagator,
+}  # type: Dict[str, Type[_Propagator]]
+
+
+class _HeaderLookup(object):
+    """Header names to look for when extracting the context with a set of propagation styles."""
+
+    __slots__ = ["names", "wsgi_keys", "asgi_names"]
+
+    def __init__(self, styles):
+        # type: (Tuple[str, ...]) -> None
+        headers = [header for style in styles for header in _PROPAGATORS[style].HEADERS]
+        # Lowercased header names, including the WSGI variant, to the header name
+        self.names = {}  # type: Dict[str, str]
+        for header in headers:
+            self.names[header] = header
+            self.names[get_wsgi_header(header).lower()] = header
+        # WSGI environ keys are uppercased
+        self.wsgi_keys = tuple((get_wsgi_header(header), header) for header in headers)
+        # ASGI header names are lowercased byte strings
+        self.asgi_names = {header.encode("ascii"): header for header in headers}
+
+
+_HEADER_LOOKUPS = {}  # type: Dict[Tuple[str, ...], _HeaderLookup]
+
+
+def _get_header_lookup(styles):
+    # type: (Tuple[str, ...]) -> _HeaderLookup
+    try:
+        return _HEADER_LOOKUPS[styles]
+    except KeyError:
+        lookup = _HEADER_LOOKUPS[styles] = _HeaderLookup(styles)
+        return lookup
+
+
 class HTTPPropagator(object):
-    """A HTTP Propagator using HTTP headers as carrier."""
+    """A HTTP Propagator using HTTP headers as carrier.
+
+    The headers used depend on the propagation styles configured with ``DD_TRACE_PROPAGATION_STYLE_INJECT`` and
+    ``DD_TRACE_PROPAGATION_STYLE_EXTRACT``.
+    """
 
     @staticmethod
     def inject(span_context, headers):
@@ -50,26 +486,8 @@ class HTTPPropagator(object):
         :param Context span_context: Span context to propagate.
         :param dict headers: HTTP headers to extend with tracing attributes.
         """
-        headers[HTTP_HEADER_TRACE_ID] = str(span_context.trace_id)
-        headers[HTTP_HEADER_PARENT_ID] = str(span_context.span_id)
-        sampling_priority = span_context.sampling_priority
-        # Propagate priority only if defined
-        if sampling_priority is not None:
-            headers[HTTP_HEADER_SAMPLING_PRIORITY] = str(span_context.sampling_priority)
-        # Propagate origin only if defined
-        if span_context.dd_origin is not None:
-            headers[HTTP_HEADER_ORIGIN] = str(span_context.dd_origin)
-
-    @staticmethod
-    def _extract_header_value(possible_header_names, headers, default=None):
-        # type: (FrozenSet[str], Dict[str, str], Optional[str]) -> Optional[str]
-        for header in possible_header_names:
-            try:
-                return headers[header]
-            except KeyError:
-                pass
-
-        return default
+        for style in config._propagation_style_inject:
+            _PROPAGATORS[style]._inject(span_context, headers)
 
     @staticmethod
     def extract(headers):
@@ -95,53 +513,68 @@ class HTTPPropagator(object):
             return Context()
 
         try:
-            normalized_headers = {name.lower(): v for name, v in headers.items()}
-            # TODO: Fix variable type changing (mypy)
-            trace_id = HTTPPropagator._extract_header_value(
-                POSSIBLE_HTTP_HEADER_TRACE_IDS,
-                normalized_headers,
-            )
-            if trace_id is None:
-                return Context()
+            styles = config._propagation_style_extract
+            names = _get_header_lookup(styles).names
+            values = {}
+            # Scan the headers once: most of them are not propagation headers
+            for name, value in headers.items():
+                header = names.get(name.lower())
+                if header is not None:
+                    values[header] = value
+            return HTTPPropagator._context_from_values(styles, values)
+        except Exception:
+            log.debug("error while extracting context propagation headers", exc_info=True)
+            return Context()
 
-            parent_span_id = HTTPPropagator._extract_header_value(
-                POSSIBLE_HTTP_HEADER_PARENT_IDS,
-                normalized_headers,
-                default="0",
-            )
-            sampling_priority = HTTPPropagator._extract_header_value(
-                POSSIBLE_HTTP_HEADER_SAMPLING_PRIORITIES,
-                normalized_headers,
-            )
-            origin = HTTPPropagator._extract_header_value(
-                POSSIBLE_HTTP_HEADER_ORIGIN,
-                normalized_headers,
-            )
+    @staticmethod
+    def _extract_from_wsgi_environ(environ):
+        # type: (Dict[str, Any]) -> Context
+        """Extract a Context from a WSGI environ.
 
-            # Try to parse values into their expected types
-            try:
-                if sampling_priority is not None:
-                    sampling_priority = int(sampling_priority)  # type: ignore[assignment]
-                else:
-                    sampling_priority = sampling_priority
-
-                return Context(
-                    # DEV: Do not allow `0` for trace id or span id, use None instead
-                    trace_id=int(trace_id) or None,
-                    span_id=int(parent_span_id) or None,  # type: ignore[arg-type]
-                    sampling_priority=sampling_priority,  # type: ignore[arg-type]
-                    dd_origin=origin,
-                )
-            # If headers are invalid and cannot be parsed, return a new context and log the issue.
-            except (TypeError, ValueError):
-                log.debug(
-                    "received invalid x-datadog-* headers, trace-id: %r, parent-id: %r, priority: %r, origin: %r",
-                    trace_id,
-                    parent_span_id,
-                    sampling_priority,
-                    origin,
-                )
-                return Context()
+        Only the propagation headers are looked up, the environ is not scanned.
+        """
+        try:
+            styles = config._propagation_style_extract
+            values = {}
+            for key, header in _get_header_lookup(styles).wsgi_keys:
+                value = environ.get(key)
+                if value is not None:
+                    values[header] = value
+            return HTTPPropagator._context_from_values(styles, values)
+        except Exception:
+            log.debug("error while extracting context propagation headers", exc_info=True)
+            return Context()
+
+    @staticmethod
+    def _extract_from_asgi_headers(headers):
+        # type: (Optional[Iterable[Tuple[bytes, bytes]]]) -> Context
+        """Extract a Context from the headers of an ASGI scope.
+
+        Only the values of the propagation headers are decoded.
+        """
+        if not headers:
+            return Context()
+
+        try:
+            styles = config._propagation_style_extract
+            names = _get_header_lookup(styles).asgi_names
+            values = {}
+            for name, value in headers:
+                header = names.get(name)
+                if header is not None:
+                    values[header] = value.decode("ascii")
+            return HTTPPropagator._context_from_values(styles, values)
         except Exception:
-            log.debug("error while extracting x-datadog-* headers", exc_info=True)
+            log.debug("error while extracting context propagation headers", exc_info=True)
             return Context()
+
+    @staticmethod
+    def _context_from_values(styles, values):
+        # type: (Tuple[str, ...], Dict[str, str]) -> Context
+        """Return the context of the first propagation style found in the header values."""
+        if values:
+            for style in styles:
+                context = _PROPAGATORS[style]._extract(values)
+                if context is not None:
+                    return context
+        return Context()
@@ -3,7 +3,12 @@
 Any `sampled = False` trace won't be written, and can be ignored by the instrumentation.
 """
 import abc
+import fnmatch
+import json
+import os
+import re
 from typing import Any
+from typing import Callable
 from typing import Dict
 from typing import List
 from typing import Optional
@@ -15,6 +20,9 @@ from .constants import ENV_KEY
 from .constants import SAMPLING_AGENT_DECISION
 from .constants import SAMPLING_LIMIT_DECISION
 from .constants import SAMPLING_RULE_DECISION
+from .constants import SPAN_SAMPLING_MAX_PER_SECOND
+from .constants import SPAN_SAMPLING_MECHANISM
+from .constants import SPAN_SAMPLING_RULE_RATE
 from .ext.priority import AUTO_KEEP
 from .ext.priority import AUTO_REJECT
 from .internal.compat import iteritems
@@ -35,6 +43,9 @@ MAX_TRACE_ID = 2 ** 64
 # Has to be the same factor and key as the Agent to allow chained sampling
 KNUTH_FACTOR = 1111111111111111111
 
+# Sampling mechanism of the spans kept by single span sampling rules
+SINGLE_SPAN_SAMPLING_MECHANISM = 8
+
 
 class BaseSampler(six.with_metaclass(abc.ABCMeta)):
     @abc.abstractmethod
@@ -407,3 +418,161 @@ class SamplingRule(BaseSampler):
         )
 
     __str__ = __repr__
+
+
+class SpanSamplingRule(object):
+    """
+    Definition of a single span sampling rule, keeping the matching spans of the traces that are not sampled
+    """
+
+    __slots__ = (
+        "service",
+        "name",
+        "sample_rate",
+        "max_per_second",
+        "min_duration",
+        "_service_matches",
+        "_name_matches",
+        "_min_duration_ns",
+        "_sampling_id_threshold",
+        "_limiter",
+    )
+
+    def __init__(
+        self,
+        service="*",  # type: str
+        name="*",  # type: str
+        sample_rate=1.0,  # type: float
+        max_per_second=None,  # type: Optional[int]
+        min_duration=None,  # type: Optional[float]
+    ):
+        # type: (...) -> None
+        """
+        Configure a new :class:`SpanSamplingRule`
+
+        .. code:: python
+
+            tracer.configure(span_sampling_rules=[
+                # Keep the database queries lasting more than a second
+                SpanSamplingRule(name='postgres.query', min_duration=1.0),
+
+                # Keep 10% of the spans of the services ending in `-db`, 50 spans per second at most
+                SpanSamplingRule(service='*-db', sample_rate=0.1, max_per_second=50),
+            ])
+
+        :param service: Glob pattern matching the `span.service`, default all the services
+        :type service: :obj:`str`
+        :param name: Glob pattern matching the `span.name`, default all the names
+        :type name: :obj:`str`
+        :param sample_rate: The sample rate to apply to the matching spans
+        :type sample_rate: :obj:`float` greater than or equal to 0.0 and less than or equal to 1.0
+        :param max_per_second: The maximum number of spans kept per second, default no limit
+        :type max_per_second: :obj:`int`
+        :param min_duration: The minimum duration in seconds of the matching spans, default all the spans
+        :type min_duration: :obj:`float`
+        """
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError(
+                "SpanSamplingRule(sample_rate={!r}) must be greater than or equal to 0.0 and less than or equal to "
+                "1.0".format(sample_rate),
+            )
+
+        self.service = service
+        self.name = name
+        self.sample_rate = sample_rate
+        self.max_per_second = max_per_second
+        self.min_duration = min_duration
+
+        self._service_matches = self._compile_glob(service)
+        self._name_matches = self._compile_glob(name)
+        self._min_duration_ns = None if min_duration is None else int(min_duration * 1e9)
+        self._sampling_id_threshold = sample_rate * MAX_TRACE_ID
+        self._limiter = None if max_per_second is None else RateLimiter(max_per_second)
+
+    @staticmethod
+    def _compile_glob(pattern):
+        # type: (str) -> Optional[Callable[[str], Any]]
+        if pattern == "*":
+            # Matches everything, skip the regular expression
+            return None
+        return re.compile(fnmatch.translate(pattern)).match
+
+    def matches(self, span):
+        # type: (Span) -> bool
+        """
+        Return if this span matches this rule
+
+        :param span: The span to match against
+        :type span: :class:`ddtrace.span.Span`
+        :returns: Whether this span matches or not
+        :rtype: :obj:`bool`
+        """
+        if self._service_matches is not None and not self._service_matches(span.service or ""):
+            return False
+        if self._name_matches is not None and not self._name_matches(span.name):
+            return False
+        if self._min_duration_ns is not None and (span.duration_ns or 0) < self._min_duration_ns:
+            return False
+        return True
+
+    def sample(self, span):
+        # type: (Span) -> bool
+        """
+        Return if this rule chooses to keep the span, tagging the span with the sampling decision if it does
+
+        :param span: The span to sample against
+        :type span: :class:`ddtrace.span.Span`
+        :returns: Whether this span was sampled
+        :rtype: :obj:`bool`
+        """
+        # DEV: spans are sampled on their own id, the spans of a trace are sampled independently
+        if ((span.span_id * KNUTH_FACTOR) % MAX_TRACE_ID) > self._sampling_id_threshold:
+            return False
+        if self._limiter is not None and not self._limiter.is_allowed():
+            return False
+
+        span.set_metric(SPAN_SAMPLING_MECHANISM, SINGLE_SPAN_SAMPLING_MECHANISM)
+        span.set_metric(SPAN_SAMPLING_RULE_RATE, self.sample_rate)
+        if self.max_per_second is not None:
+            span.set_metric(SPAN_SAMPLING_MAX_PER_SECOND, self.max_per_second)
+        return True
+
+    def __repr__(self):
+        return "{}(service={!r}, name={!r}, sample_rate={!r}, max_per_second={!r}, min_duration={!r})".format(
+            self.__class__.__name__,
+            self.service,
+            self.name,
+            self.sample_rate,
+            self.max_per_second,
+            self.min_duration,
+        )
+
+    __str__ = __repr__
+
+
+def get_span_sampling_rules():
+    # type: () -> List[SpanSamplingRule]
+    """Return the single span sampling rules of the ``DD_SPAN_SAMPLING_RULES`` environment variable.
+
+    The rules are a JSON list of objects with the arguments of :class:`SpanSamplingRule`; invalid rules are ignored.
+    """
+    rules_json = os.getenv("DD_SPAN_SAMPLING_RULES")
+    if not rules_json:
+        return []
+
+    try:
+        rules_config = json.loads(rules_json)
+    except ValueError:
+        log.warning("DD_SPAN_SAMPLING_RULES is not valid JSON, ignoring it: %r", rules_json)
+        return []
+    if not isinstance(rules_config, list):
+        log.warning("DD_SPAN_SAMPLING_RULES is not a list, ignoring it: %r", rules_json)
+        return []
+
+    rules = []
+    for rule_config in rules_config:
+        try:
+            rules.append(SpanSamplingRule(**rule_config))
+        except (TypeError, ValueError):
+            log.warning("Invalid span sampling rule %r, ignoring it", rule_config, exc_info=True)
+    return rules
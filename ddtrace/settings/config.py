@@ -3,6 +3,8 @@ import os
 from typing import List
 from typing import Tuple
 
+from ddtrace.constants import PROPAGATION_STYLE_ALL
+from ddtrace.constants import PROPAGATION_STYLE_DATADOG
 from ddtrace.utils.cache import cachedmethod
 
 from ..internal.logger import get_logger
@@ -39,6 +41,25 @@ def _deepmerge(source, destination):
     return destination
 
 
+def _parse_propagation_styles(name, default):
+    # type: (str, str) -> Tuple[str, ...]
+    """Return the propagation styles listed in the `name` environment variable.
+
+    Styles are comma separated and case insensitive; unknown styles are ignored.
+    """
+    styles = []
+    for style in os.getenv(name, default).split(","):
+        style = style.strip().lower()
+        if not style:
+            continue
+        if style not in PROPAGATION_STYLE_ALL:
+            log.warning("Unknown propagation style %r in %s, ignoring it", style, name)
+            continue
+        if style not in styles:
+            styles.append(style)
+    return tuple(styles)
+
+
 def get_error_ranges(error_range_str):
     # type: (str) -> List[Tuple[int, int]]
     error_ranges = []
@@ -103,6 +124,9 @@ class Config(object):
                     return True
             return False
 
+    # Incremented on every change of a global setting so values derived from them can be invalidated
+    _generation = 0
+
     def __init__(self):
         # use a dict as underlying storing mechanism
         self._config = {}
@@ -138,11 +162,25 @@ class Config(object):
 
         self.report_hostname = asbool(get_env("trace", "report_hostname", default=False))
 
+        # Propagation styles used to inject and extract the trace context, in order of precedence
+        self._propagation_style_inject = _parse_propagation_styles(
+            "DD_TRACE_PROPAGATION_STYLE_INJECT", PROPAGATION_STYLE_DATADOG
+        )
+        self._propagation_style_extract = _parse_propagation_styles(
+            "DD_TRACE_PROPAGATION_STYLE_EXTRACT", PROPAGATION_STYLE_DATADOG
+        )
+        self._128_bit_trace_id_enabled = asbool(os.getenv("DD_TRACE_128_BIT_TRACEID_GENERATION_ENABLED", False))
+        self._span_recycling_enabled = asbool(os.getenv("DD_TRACE_SPAN_RECYCLING_ENABLED", False))
+
         self.health_metrics_enabled = asbool(get_env("trace", "health_metrics_enabled", default=False))
 
         # Raise certain errors only if in testing raise mode to prevent crashing in production with non-critical errors
         self._raise = asbool(os.getenv("DD_TESTING_RAISE", False))
 
+    def __setattr__(self, name, value):
+        object.__setattr__(self, "_generation", self._generation + 1)
+        object.__setattr__(self, name, value)
+
     def __getattr__(self, name):
         if name not in self._config:
             self._config[name] = IntegrationConfig(self, name)
@@ -1,14 +1,26 @@
 import os
 from typing import Optional
+from typing import TYPE_CHECKING
 from typing import Tuple
 
 from .._hooks import Hooks
+from ..internal.rate_limiter import RateLimiter
 from ..utils.attrdict import AttrDict
 from ..utils.formats import asbool
 from ..utils.formats import get_env
 from .http import HttpConfig
 
 
+if TYPE_CHECKING:
+    from ..tracer import Tracer
+
+
+def _get_span_budget(name, option):
+    # type: (str, str) -> Optional[int]
+    value = get_env(name, option)
+    return None if value is None else int(value)
+
+
 class IntegrationConfig(AttrDict):
     """
     Integration specific configuration object.
@@ -40,6 +52,8 @@ class IntegrationConfig(AttrDict):
         object.__setattr__(self, "integration_name", name)
         object.__setattr__(self, "hooks", Hooks())
         object.__setattr__(self, "http", HttpConfig())
+        object.__setattr__(self, "_collapsed_spans_key", "%s.collapsed_spans" % name)
+        object.__setattr__(self, "_span_rate_limiter", None)
 
         analytics_enabled, analytics_sample_rate = self._get_analytics_settings()
         self.setdefault("analytics_enabled", analytics_enabled)
@@ -52,6 +66,10 @@ class IntegrationConfig(AttrDict):
         # unified.
         self.setdefault("service_name", service)
 
+        # Span budget: the calls beyond these numbers of spans are only counted on their parent span
+        self.setdefault("max_spans_per_trace", _get_span_budget(name, "max_spans_per_trace"))
+        self.setdefault("max_spans_per_second", _get_span_budget(name, "max_spans_per_second"))
+
     def _get_analytics_settings(self):
         # type: () -> Tuple[Optional[bool], float]
         # Set default analytics configuration, default is disabled
@@ -125,6 +143,49 @@ class IntegrationConfig(AttrDict):
         #   `False` would mean `0` which is a different thing
         return None
 
+    def _collapse_span(self, tracer):
+        # type: (Tracer) -> bool
+        """Return whether the span of a call must not be created, as the integration is over its span budget.
+
+        The collapsed calls are counted on the active span, in the ``<integration>.collapsed_spans`` metric.
+        Otherwise the span is counted in the budget: only call this right before creating the span.
+        """
+        max_spans_per_trace = self.get("max_spans_per_trace")
+        max_spans_per_second = self.get("max_spans_per_second")
+        if max_spans_per_trace is None and max_spans_per_second is None:
+            return False
+
+        parent = tracer.current_span()
+        counts = None
+        count = 0
+        if max_spans_per_trace is not None and parent is not None:
+            root = parent._local_root
+            counts = root._span_counts
+            if counts is None:
+                counts = root._span_counts = {}
+            count = counts.get(self.integration_name, 0)
+            if count >= max_spans_per_trace:
+                self._count_collapsed_span(parent)
+                return True
+
+        if max_spans_per_second is not None:
+            limiter = self._span_rate_limiter
+            if limiter is None or limiter.rate_limit != max_spans_per_second:
+                limiter = RateLimiter(max_spans_per_second)
+                object.__setattr__(self, "_span_rate_limiter", limiter)
+            if not limiter.is_allowed():
+                self._count_collapsed_span(parent)
+                return True
+
+        if counts is not None:
+            counts[self.integration_name] = count + 1
+        return False
+
+    def _count_collapsed_span(self, parent):
+        if parent is not None:
+            key = self._collapsed_spans_key
+            parent.set_metric(key, parent.metrics.get(key, 0) + 1)
+
     def __repr__(self):
         cls = self.__class__
         keys = ", ".join(self.keys())
@@ -14,6 +14,7 @@ from typing import Union
 import six
 
 from . import config
+from .constants import HIGHER_ORDER_TRACE_ID_BITS
 from .constants import MANUAL_DROP_KEY
 from .constants import MANUAL_KEEP_KEY
 from .constants import NUMERIC_TAGS
@@ -60,7 +61,8 @@ class Span(object):
         "span_id",
         "trace_id",
         "parent_id",
-        "meta",
+        "_meta",
+        "_shared_meta",
         "error",
         "metrics",
         "_span_type",
@@ -71,10 +73,14 @@ class Span(object):
         "sampled",
         # Internal attributes
         "_context",
-        "_local_root",
+        "_trace_context",
+        "_local_root_value",
         "_parent",
         "_ignored_exceptions",
         "_on_finish_callbacks",
+        "_on_flush_callbacks",
+        "_span_counts",
+        "_generation",
         "__weakref__",
     ]
 
@@ -120,6 +126,30 @@ class Span(object):
         if not (parent_id is None or isinstance(parent_id, six.integer_types)):
             raise TypeError("parent_id must be an integer")
 
+        # tags / metadata
+        self._meta = {}  # type: _MetaDictType
+        self.metrics = {}  # type: _MetricDictType
+        self._on_finish_callbacks = [] if on_finish is None else on_finish
+        # Incremented each time the span is recycled
+        self._generation = 0
+
+        self._init(tracer, name, service, resource, span_type, trace_id, span_id, parent_id, start, context)
+
+    def _init(
+        self,
+        tracer,  # type: Optional[Tracer]
+        name,  # type: str
+        service,  # type: Optional[str]
+        resource,  # type: Optional[str]
+        span_type,  # type: Optional[str]
+        trace_id,  # type: Optional[int]
+        span_id,  # type: Optional[int]
+        parent_id,  # type: Optional[int]
+        start,  # type: Optional[float]
+        context,  # type: Optional[Context]
+    ):
+        # type: (...) -> None
+        """Initialize the span attributes, except the tags, metrics and finish callbacks containers."""
         # required span info
         self.name = name
         self.service = service
@@ -127,10 +157,9 @@ class Span(object):
         self._span_type = None
         self.span_type = span_type
 
-        # tags / metadata
-        self.meta = {}  # type: _MetaDictType
+        # Tags shared with other spans (e.g. the global tags), overridden by `_meta`: never modify it
+        self._shared_meta = None  # type: Optional[_MetaDictType]
         self.error = 0
-        self.metrics = {}  # type: _MetricDictType
 
         # timing
         self.start_ns = time_ns() if start is None else int(start * 1e9)
@@ -141,15 +170,55 @@ class Span(object):
         self.span_id = span_id or _rand.rand64bits()  # type: int
         self.parent_id = parent_id  # type: Optional[int]
         self.tracer = tracer  # type: Optional[Tracer]
-        self._on_finish_callbacks = [] if on_finish is None else on_finish
 
         # sampling
         self.sampled = True  # type: bool
 
-        self._context = context._with_span(self) if context else None  # type: Optional[Context]
+        # The span context is only created when needed: keep the context holding the trace-level state until then
+        self._context = None  # type: Optional[Context]
+        self._trace_context = context  # type: Optional[Context]
         self._parent = None  # type: Optional[Span]
         self._ignored_exceptions = None  # type: Optional[List[Exception]]
-        self._local_root = None  # type: Optional[Span]
+        self._local_root_value = None  # type: Optional[Span]
+        # Only allocated when needed, see `_add_on_flush_callback`
+        self._on_flush_callbacks = None  # type: Optional[List[Callable[[Span], None]]]
+        # Number of spans created per integration in the trace, only allocated on the local roots by span budgets
+        self._span_counts = None  # type: Optional[Dict[str, int]]
+
+    def _recycle(self):
+        # type: () -> None
+        """Reset the span so that its containers can be reused by a new span.
+
+        Only call this once nothing references the span or its containers anymore.
+        """
+        self._meta.clear()
+        self.metrics.clear()
+        del self._on_finish_callbacks[:]
+        self._shared_meta = None
+        self.tracer = None
+        self._context = None
+        self._trace_context = None
+        self._parent = None
+        self._ignored_exceptions = None
+        self._local_root_value = None
+        self._on_flush_callbacks = None
+        self._span_counts = None
+        self._generation += 1
+
+    @property
+    def _local_root(self):
+        # type: () -> Span
+        """The root span of the trace in this process."""
+        if self._local_root_value is None:
+            return self
+        return self._local_root_value
+
+    @_local_root.setter
+    def _local_root(self, value):
+        # type: (Span) -> None
+        # Root spans do not reference themselves: spans without reference cycles are freed as soon as they are
+        # not used anymore, instead of surviving until a garbage collection.
+        self._local_root_value = None if value is self else value
 
     def _ignore_exception(self, exc):
         # type: (Exception) -> None
@@ -158,6 +227,24 @@ class Span(object):
         else:
             self._ignored_exceptions.append(exc)
 
+    @property
+    def meta(self):
+        # type: () -> _MetaDictType
+        """The span string tags."""
+        # Copy on write: the caller might modify the returned dict, so the span gets its own copy of the shared tags.
+        if self._shared_meta is not None:
+            meta = dict(self._shared_meta)
+            meta.update(self._meta)
+            self._meta = meta
+            self._shared_meta = None
+        return self._meta
+
+    @meta.setter
+    def meta(self, value):
+        # type: (_MetaDictType) -> None
+        self._meta = value
+        self._shared_meta = None
+
     @property
     def start(self):
         # type: () -> float
@@ -226,6 +313,18 @@ class Span(object):
         for cb in self._on_finish_callbacks:
             cb(self)
 
+    def _add_on_flush_callback(self, callback):
+        # type: (Callable[[Span], None]) -> None
+        """Add a function called with the span once it is finished and its trace is kept to be sent.
+
+        This defers the work only needed to send the span (e.g. formatting its resource from raw data) until
+        the trace is known not to be dropped by the sampler.
+        """
+        if self._on_flush_callbacks is None:
+            self._on_flush_callbacks = [callback]
+        else:
+            self._on_flush_callbacks.append(callback)
+
     def set_tag(self, key, value=None):
         # type: (_TagNameType, Any) -> None
         """Set a tag key/value pair on the span.
@@ -242,71 +341,35 @@ class Span(object):
             log.warning("Ignoring tag pair %s:%s. Key must be a string.", key, value)
             return
 
-        # Special case, force `http.status_code` as a string
-        # DEV: `http.status_code` *has* to be in `meta` for metrics
-        #   calculated in the trace agent
-        if key == http.STATUS_CODE:
-            value = str(value)
-
-        # Determine once up front
-        val_is_an_int = is_integer(value)
-
-        # Explicitly try to convert expected integers to `int`
-        # DEV: Some integrations parse these values from strings, but don't call `int(value)` themselves
-        INT_TYPES = (net.TARGET_PORT,)
-        if key in INT_TYPES and not val_is_an_int:
-            try:
-                value = int(value)
-                val_is_an_int = True
-            except (ValueError, TypeError):
-                pass
+        setter = _SPECIAL_TAG_SETTERS.get(key)
+        if setter is not None:
+            setter(self, key, value)
+        elif value.__class__ is six.text_type:
+            # Fast path for the most common case: a text value without special handling
+            self._meta[key] = value
+            if key in self.metrics:
+                del self.metrics[key]
+        else:
+            self._set_tag_value(key, value)
 
-        # Set integers that are less than equal to 2^53 as metrics
-        if value is not None and val_is_an_int and abs(value) <= 2 ** 53:
-            self.set_metric(key, value)
-            return
+    def _set_numeric_tag_value(self, key, value):
+        # type: (_TagNameType, Any) -> bool
+        """Set integers that are less than equal to 2^53 and floats as metrics.
 
-        # All floats should be set as a metric
-        elif isinstance(value, float):
+        :return: Whether the value has been set as a metric.
+        """
+        if isinstance(value, float) or (is_integer(value) and abs(value) <= 2 ** 53):
             self.set_metric(key, value)
-            return
-
-        # Key should explicitly be converted to a float if needed
-        elif key in NUMERIC_TAGS:
-            if value is None:
-                log.debug("ignoring not number metric %s:%s", key, value)
-                return
-
-            try:
-                # DEV: `set_metric` will try to cast to `float()` for us
-                self.set_metric(key, value)
-            except (TypeError, ValueError):
-                log.warning("error setting numeric metric %s:%s", key, value)
-
-            return
+            return True
+        return False
 
-        elif key == MANUAL_KEEP_KEY:
-            self.context.sampling_priority = priority.USER_KEEP
-            return
-        elif key == MANUAL_DROP_KEY:
-            self.context.sampling_priority = priority.USER_REJECT
-            return
-        elif key == SERVICE_KEY:
-            self.service = value
-        elif key == SERVICE_VERSION_KEY:
-            # Also set the `version` tag to the same value
-            # DEV: Note that we do no return, we want to set both
-            self.set_tag(VERSION_KEY, value)
-        elif key == SPAN_MEASURED_KEY:
-            # Set `_dd.measured` tag as a metric
-            # DEV: `set_metric` will ensure it is an integer 0 or 1
-            if value is None:
-                value = 1
-            self.set_metric(key, value)
+    def _set_tag_value(self, key, value):
+        # type: (_TagNameType, Any) -> None
+        if self._set_numeric_tag_value(key, value):
             return
 
         try:
-            self.meta[key] = stringify(value)
+            self._meta[key] = stringify(value)
             if key in self.metrics:
                 del self.metrics[key]
         except Exception:
@@ -319,7 +382,7 @@ class Span(object):
         U+FFFD.
         """
         try:
-            self.meta[key] = ensure_text(value, errors="replace")
+            self._meta[key] = ensure_text(value, errors="replace")
         except Exception as e:
             if config._raise:
                 raise e
@@ -327,13 +390,18 @@ class Span(object):
 
     def _remove_tag(self, key):
         # type: (_TagNameType) -> None
-        if key in self.meta:
+        if self._shared_meta is not None and key in self._shared_meta:
             del self.meta[key]
+        elif key in self._meta:
+            del self._meta[key]
 
     def get_tag(self, key):
         # type: (_TagNameType) -> Optional[Text]
         """Return the given tag or None if it doesn't exist."""
-        return self.meta.get(key, None)
+        value = self._meta.get(key)
+        if value is None and self._shared_meta is not None:
+            return self._shared_meta.get(key)
+        return value
 
     def set_tags(self, tags):
         # type: (_MetaDictType) -> None
@@ -341,8 +409,16 @@ class Span(object):
         must be strings (or stringable)
         """
         if tags:
-            for k, v in iter(tags.items()):
-                self.set_tag(k, v)
+            meta = self._meta
+            metrics = self.metrics
+            for k, v in iteritems(tags):
+                # Same fast path as `set_tag`, inlined to avoid a method call per tag
+                if v.__class__ is six.text_type and isinstance(k, six.string_types) and k not in _SPECIAL_TAG_SETTERS:
+                    meta[k] = v
+                    if k in metrics:
+                        del metrics[k]
+                else:
+                    self.set_tag(k, v)
 
     def set_meta(self, k, v):
         # type: (_TagNameType, NumericType) -> None
@@ -381,8 +457,7 @@ class Span(object):
             log.debug("ignoring not real metric %s:%s", key, value)
             return
 
-        if key in self.meta:
-            del self.meta[key]
+        self._remove_tag(key)
         self.metrics[key] = value
 
     def set_metrics(self, metrics):
@@ -442,7 +517,7 @@ class Span(object):
             self.set_exc_info(exc_type, exc_val, exc_tb)
         else:
             tb = "".join(traceback.format_stack(limit=limit + 1)[:-1])
-            self.meta[errors.ERROR_STACK] = tb
+            self._meta[errors.ERROR_STACK] = tb
 
     def set_exc_info(self, exc_type, exc_val, exc_tb):
         # type: (Any, Any, Any) -> None
@@ -463,9 +538,9 @@ class Span(object):
         # readable version of type (e.g. exceptions.ZeroDivisionError)
         exc_type_str = "%s.%s" % (exc_type.__module__, exc_type.__name__)
 
-        self.meta[errors.ERROR_MSG] = str(exc_val)
-        self.meta[errors.ERROR_TYPE] = exc_type_str
-        self.meta[errors.ERROR_STACK] = tb
+        self._meta[errors.ERROR_MSG] = str(exc_val)
+        self._meta[errors.ERROR_TYPE] = exc_type_str
+        self._meta[errors.ERROR_STACK] = tb
 
     def _remove_exc_info(self):
         # type: () -> None
@@ -504,9 +579,24 @@ class Span(object):
         # type: () -> Context
         """Return the trace context for this span."""
         if self._context is None:
-            self._context = Context(trace_id=self.trace_id, span_id=self.span_id)
+            if self._trace_context is None:
+                self._context = self._trace_context = Context(trace_id=self.trace_id, span_id=self.span_id)
+            else:
+                self._context = self._trace_context._with_span(self)
         return self._context
 
+    def _get_log_trace_id(self):
+        # type: () -> str
+        """Return the trace id to correlate logs with the span.
+
+        When 128-bit trace ids are enabled, 128-bit trace ids are formatted with 32 hexadecimal characters.
+        """
+        if config._128_bit_trace_id_enabled and self._trace_context is not None:
+            trace_id_high_bits = self._trace_context._meta.get(HIGHER_ORDER_TRACE_ID_BITS)
+            if trace_id_high_bits is not None:
+                return "%s%016x" % (trace_id_high_bits, self.trace_id)
+        return str(self.trace_id)
+
     def __enter__(self):
         return self
 
@@ -525,3 +615,82 @@ class Span(object):
             self.parent_id,
             self.name,
         )
+
+
+def _set_status_code_tag(span, key, value):
+    # type: (Span, _TagNameType, Any) -> None
+    # DEV: `http.status_code` *has* to be in `meta` for metrics calculated in the trace agent
+    span._set_tag_value(key, str(value))
+
+
+def _set_int_tag(span, key, value):
+    # type: (Span, _TagNameType, Any) -> None
+    # DEV: Some integrations parse these values from strings, but don't call `int(value)` themselves
+    if not is_integer(value):
+        try:
+            value = int(value)
+        except (ValueError, TypeError):
+            pass
+    span._set_tag_value(key, value)
+
+
+def _set_float_tag(span, key, value):
+    # type: (Span, _TagNameType, Any) -> None
+    if value is None:
+        log.debug("ignoring not number metric %s:%s", key, value)
+        return
+
+    try:
+        # DEV: `set_metric` will try to cast to `float()` for us
+        span.set_metric(key, value)
+    except (TypeError, ValueError):
+        log.warning("error setting numeric metric %s:%s", key, value)
+
+
+def _set_manual_keep_tag(span, key, value):
+    # type: (Span, _TagNameType, Any) -> None
+    if not span._set_numeric_tag_value(key, value):
+        span.context.sampling_priority = priority.USER_KEEP
+
+
+def _set_manual_drop_tag(span, key, value):
+    # type: (Span, _TagNameType, Any) -> None
+    if not span._set_numeric_tag_value(key, value):
+        span.context.sampling_priority = priority.USER_REJECT
+
+
+def _set_service_tag(span, key, value):
+    # type: (Span, _TagNameType, Any) -> None
+    if not span._set_numeric_tag_value(key, value):
+        span.service = value
+        span._set_tag_value(key, value)
+
+
+def _set_service_version_tag(span, key, value):
+    # type: (Span, _TagNameType, Any) -> None
+    if not span._set_numeric_tag_value(key, value):
+        # Also set the `version` tag to the same value
+        span.set_tag(VERSION_KEY, value)
+        span._set_tag_value(key, value)
+
+
+def _set_measured_tag(span, key, value):
+    # type: (Span, _TagNameType, Any) -> None
+    # DEV: `set_metric` will ensure it is an integer 0 or 1
+    if value is None:
+        value = 1
+    span.set_metric(key, value)
+
+
+# Tags which need a special treatment when set: any other tag is set as a metric or as a string tag depending on
+# the type of its value.
+_SPECIAL_TAG_SETTERS = {
+    http.STATUS_CODE: _set_status_code_tag,
+    net.TARGET_PORT: _set_int_tag,
+    MANUAL_KEEP_KEY: _set_manual_keep_tag,
+    MANUAL_DROP_KEY: _set_manual_drop_tag,
+    SERVICE_KEY: _set_service_tag,
+    SERVICE_VERSION_KEY: _set_service_version_tag,
+    SPAN_MEASURED_KEY: _set_measured_tag,
+}  # type: Dict[_TagNameType, Callable[[Span, _TagNameType, Any], None]]
+_SPECIAL_TAG_SETTERS.update((key, _set_float_tag) for key in NUMERIC_TAGS)
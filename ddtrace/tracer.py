@@ -23,13 +23,18 @@ from ddtrace.vendor import debtcollector
 from . import _hooks
 from .constants import ENV_KEY
 from .constants import FILTERS_KEY
+from .constants import HIGHER_ORDER_TRACE_ID_BITS
 from .constants import HOSTNAME_KEY
+from .constants import MANUAL_DROP_KEY
+from .constants import MANUAL_KEEP_KEY
 from .constants import SAMPLE_RATE_METRIC_KEY
+from .constants import SERVICE_KEY
 from .constants import VERSION_KEY
 from .context import Context
 from .ext import system
 from .ext.priority import AUTO_KEEP
 from .ext.priority import AUTO_REJECT
+from .internal import _rand
 from .internal import agent
 from .internal import atexit
 from .internal import compat
@@ -42,10 +47,12 @@ from .internal.logger import get_logger
 from .internal.logger import hasHandlers
 from .internal.processor import SpanProcessor
 from .internal.processor.trace import SpanAggregator
+from .internal.processor.trace import TraceFlushCallbacksProcessor
 from .internal.processor.trace import TraceProcessor
 from .internal.processor.trace import TraceSamplingProcessor
 from .internal.processor.trace import TraceTagsProcessor
 from .internal.runtime import get_runtime_id
+from .internal.span_pool import span_pool
 from .internal.writer import AgentWriter
 from .internal.writer import LogWriter
 from .internal.writer import TraceWriter
@@ -55,7 +62,10 @@ from .sampler import BaseSampler
 from .sampler import DatadogSampler
 from .sampler import RateByServiceSampler
 from .sampler import RateSampler
+from .sampler import SpanSamplingRule
+from .sampler import get_span_sampling_rules
 from .span import Span
+from .span import _MetaDictType
 from .utils.deprecation import deprecated
 from .utils.formats import asbool
 from .utils.formats import get_env
@@ -79,6 +89,52 @@ if debug_mode and not hasHandlers(log) and call_basic_config:
 
 _INTERNAL_APPLICATION_SPAN_TYPES = {"custom", "template", "web", "worker"}
 
+# Tags that change more than the span tags when set: they can not be copied from a template.
+_SPAN_TEMPLATE_UNSAFE_TAGS = {MANUAL_DROP_KEY, MANUAL_KEEP_KEY, SERVICE_KEY}
+
+
+class _SpanTemplate(object):
+    """Span attributes which only depend on the span service and on the tracer configuration.
+
+    They are computed once per service. The string tags are shared by all the spans of the service and only copied
+    when a span modifies them; the numeric tags are copied in bulk on every new span.
+    """
+
+    __slots__ = ["service", "meta", "metrics", "tags", "tracer_tags"]
+
+    def __init__(
+        self,
+        service,  # type: Optional[str]
+        tags,  # type: _MetaDictType
+    ):
+        # type: (...) -> None
+        self.service = config.service_mapping.get(service, service)
+        # The tracer tags can be modified in place: keep a copy to detect it
+        self.tracer_tags = dict(tags)
+
+        if _SPAN_TEMPLATE_UNSAFE_TAGS.isdisjoint(tags):
+            # Apply the tags to a scratch span to reuse the exact conversion rules of `Span.set_tag`
+            span = Span(None, "")
+            span.set_tags(tags)
+            if config.env:
+                span._set_str_tag(ENV_KEY, config.env)
+            self.meta = span.meta
+            self.metrics = span.metrics
+            self.tags = None  # type: Optional[_MetaDictType]
+        else:
+            # Tags are applied one by one on each span
+            self.meta = {ENV_KEY: config.env} if config.env else {}
+            self.metrics = {}
+            self.tags = self.tracer_tags
+
+    def is_current(self, service, tags):
+        # type: (Optional[str], _MetaDictType) -> bool
+        """Return whether the template still matches the service mapping and the tracer tags.
+
+        Both mappings can be modified in place without notifying the tracer.
+        """
+        return self.service == config.service_mapping.get(service, service) and self.tracer_tags == tags
+
 
 AnyCallable = TypeVar("AnyCallable", bound=Callable)
 
@@ -96,6 +152,7 @@ class Tracer(object):
     """
 
     SHUTDOWN_TIMEOUT = 5
+    _SPAN_TEMPLATES_MAX = 256
 
     def __init__(
         self,
@@ -159,6 +216,8 @@ class Tracer(object):
             get_env("trace", "partial_flush_min_spans", default=pfms_default_value)  # type: ignore[arg-type]
         )
 
+        self._span_sampling_rules = get_span_sampling_rules()  # type: List[SpanSamplingRule]
+
         self._initialize_span_processors()
         self._hooks = _hooks.Hooks()
         atexit.register(self._atexit)
@@ -168,6 +227,9 @@ class Tracer(object):
 
         self._new_process = False
 
+        self._span_templates = {}  # type: Dict[Optional[str], _SpanTemplate]
+        self._span_templates_config_generation = config._generation
+
     def _atexit(self):
         # type: () -> None
         key = "ctrl-break" if os.name == "nt" else "ctrl-c"
@@ -270,7 +332,7 @@ class Tracer(object):
             span = self.current_span()
 
         return {
-            "trace_id": str(span.trace_id) if span else "0",
+            "trace_id": span._get_log_trace_id() if span else "0",
             "span_id": str(span.span_id) if span else "0",
             "service": config.service or "",
             "version": config.version or "",
@@ -294,6 +356,7 @@ class Tracer(object):
         writer=None,  # type: Optional[TraceWriter]
         partial_flush_enabled=None,  # type: Optional[bool]
         partial_flush_min_spans=None,  # type: Optional[int]
+        span_sampling_rules=None,  # type: Optional[List[SpanSamplingRule]]
     ):
         # type: (...) -> None
         """
@@ -316,10 +379,15 @@ class Tracer(object):
         :param priority_sampling: enable priority sampling, this is required for
             complete distributed tracing support. Enabled by default.
         :param str dogstatsd_url: URL for UDP or Unix socket connection to DogStatsD
+        :param list span_sampling_rules: The :class:`ddtrace.sampler.SpanSamplingRule` rules keeping individual spans
+            of the traces that are not sampled.
         """
         if enabled is not None:
             self.enabled = enabled
 
+        if span_sampling_rules is not None:
+            self._span_sampling_rules = span_sampling_rules
+
         if settings is not None:
             filters = settings.get(FILTERS_KEY)
             if filters is not None:
@@ -404,6 +472,8 @@ class Tracer(object):
         if wrap_executor is not None:
             self._wrap_executor = wrap_executor
 
+        self._span_templates = {}
+
         if debug_mode or asbool(environ.get("DD_TRACE_STARTUP_LOGS", False)):
             try:
                 info = debug.collect(self)
@@ -422,6 +492,21 @@ class Tracer(object):
                     msg = "- DATADOG TRACER DIAGNOSTIC - %s" % agent_error
                     self._log_compat(logging.WARNING, msg)
 
+    def _get_span_template(self, service):
+        # type: (Optional[str]) -> _SpanTemplate
+        # Any change of the global configuration invalidates all the templates
+        if self._span_templates_config_generation != config._generation:
+            self._span_templates = {}
+            self._span_templates_config_generation = config._generation
+
+        template = self._span_templates.get(service)
+        if template is None or not template.is_current(service, self.tags):
+            # Keep the cache small if service names are generated dynamically
+            if len(self._span_templates) >= self._SPAN_TEMPLATES_MAX:
+                self._span_templates = {}
+            template = self._span_templates[service] = _SpanTemplate(service, self.tags)
+        return template
+
     def _child_after_fork(self):
         self._pid = getpid()
 
@@ -493,6 +578,9 @@ class Tracer(object):
                     span_id=child_of.span_id,
                     trace_id=child_of.trace_id,
                 )
+                trace_id_high_bits = child_of.context._meta.get(HIGHER_ORDER_TRACE_ID_BITS)
+                if trace_id_high_bits is not None:
+                    new_ctx._meta[HIGHER_ORDER_TRACE_ID_BITS] = trace_id_high_bits
 
                 # If the child_of span was active then activate the new context
                 # containing it so that the strong span referenced is removed
@@ -506,7 +594,8 @@ class Tracer(object):
             if isinstance(child_of, Context):
                 context = child_of
             else:
-                context = child_of.context
+                # Only the trace-level state is needed from the parent: avoid creating its context
+                context = child_of._trace_context or child_of.context
                 parent = child_of
         else:
             context = Context()
@@ -530,10 +619,15 @@ class Tracer(object):
             else:
                 service = config.service
 
-        mapped_service = config.service_mapping.get(service, service)
+        template = self._get_span_template(service)
+        mapped_service = template.service
 
-        if trace_id:
-            # child_of a non-empty context, so either a local child span or from a remote context
+        if not trace_id:
+            # this is the root span of a new trace
+            trace_id = parent_id = None
+
+        span = span_pool.acquire() if config._span_recycling_enabled else None
+        if span is None:
             span = Span(
                 self,
                 name,
@@ -545,29 +639,24 @@ class Tracer(object):
                 span_type=span_type,
                 on_finish=[self._on_span_finish],
             )
+        else:
+            span._init(self, name, mapped_service, resource, span_type, trace_id, None, parent_id, None, context)
+            span._on_finish_callbacks.append(self._on_span_finish)
+
+        if trace_id:
+            # child_of a non-empty context, so either a local child span or from a remote context
 
             # Extra attributes when from a local parent
             if parent:
                 span.sampled = parent.sampled
                 span._parent = parent
                 span._local_root = parent._local_root
-
-            if span._local_root is None:
-                span._local_root = span
         else:
-            # this is the root span of a new trace
-            span = Span(
-                self,
-                name,
-                context=context,
-                service=mapped_service,
-                resource=resource,
-                span_type=span_type,
-                on_finish=[self._on_span_finish],
-            )
-            span._local_root = span
+            if config._128_bit_trace_id_enabled:
+                # Only the higher bits are stored, as a trace-level tag: the span trace id keeps the lower 64 bits
+                context._meta[HIGHER_ORDER_TRACE_ID_BITS] = _rand.rand_trace_id_high_bits()
             if config.report_hostname:
-                span.meta[HOSTNAME_KEY] = hostname.get_hostname()
+                span._meta[HOSTNAME_KEY] = hostname.get_hostname()
             span.sampled = self.sampler.sample(span)
             # Old behavior
             # DEV: The new sampler sets metrics and priority sampling on the span for us
@@ -596,15 +685,18 @@ class Tracer(object):
                 span.sampled = True
 
         if not span._parent:
-            span.meta["runtime-id"] = get_runtime_id()
+            span._meta["runtime-id"] = get_runtime_id()
             span.metrics[system.PID] = self._pid
 
-        # Apply default global tags.
-        if self.tags:
-            span.set_tags(self.tags)
-
-        if config.env:
-            span._set_str_tag(ENV_KEY, config.env)
+        # Apply default global tags and environment.
+        if template.tags:
+            span.set_tags(template.tags)
+            span._meta.update(template.meta)
+        else:
+            if template.meta:
+                span._shared_meta = template.meta
+            if template.metrics:
+                span.metrics.update(template.metrics)
 
         # Only set the version tag on internal spans.
         if config.version:
@@ -614,7 +706,7 @@ class Tracer(object):
             #        and the root span has a version tag
             # then the span belongs to the user application and so set the version tag
             if (root_span is None and service == config.service) or (
-                root_span and root_span.service == service and VERSION_KEY in root_span.meta
+                root_span and root_span.service == service and root_span.get_tag(VERSION_KEY) is not None
             ):
                 span._set_str_tag(VERSION_KEY, config.version)
 
@@ -652,11 +744,17 @@ class Tracer(object):
         for p in self._span_processors:
             p.on_span_finish(span)
 
+    def _num_unfinished_spans(self):
+        # type: () -> int
+        """Return the number of spans kept by the tracer until their trace is flushed."""
+        return sum(p.num_unfinished_spans() for p in self._span_processors if isinstance(p, SpanAggregator))
+
     def _initialize_span_processors(self):
         # type: () -> None
         trace_processors = []  # type: List[TraceProcessor]
         trace_processors += [TraceTagsProcessor()]
-        trace_processors += [TraceSamplingProcessor()]
+        trace_processors += [TraceSamplingProcessor(single_span_rules=self._span_sampling_rules)]
+        trace_processors += [TraceFlushCallbacksProcessor()]
         trace_processors += self._filters
 
         self._span_processors = [
@@ -899,6 +997,7 @@ class Tracer(object):
         :param dict tags: dict of tags to set at tracer level
         """
         self.tags.update(tags)
+        self._span_templates = {}
 
     def _restore_from_shutdown(self):
         with self._shutdown_lock:
@@ -1,12 +1,13 @@
+from collections import OrderedDict
 from threading import RLock
 from typing import Any
 from typing import Callable
-from typing import Dict
 from typing import Optional
-from typing import Tuple
 from typing import Type
 from typing import TypeVar
 
+from ..internal.compat import PY2
+
 
 miss = object()
 
@@ -16,46 +17,115 @@ F = Callable[[T], S]
 M = Callable[[Any, T], S]
 
 
+class LRUCache(object):
+    """
+    Thread-safe bounded cache retaining the most recently used values.
+
+    Lookups, insertions and evictions are O(1). The hits and misses are
+    counted to monitor the efficiency of the cache.
+    """
+
+    def __init__(self, maxsize=256):
+        # type: (int) -> None
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()  # type: OrderedDict[Any, Any]
+        self._lock = RLock()
+        if PY2:
+            self._move_to_end = self._locked_move_to_end  # type: Callable[[Any], None]
+        else:
+            # DEV: the OrderedDict of Python 3 is implemented in C, moving a key is atomic
+            self._move_to_end = self._data.move_to_end
+
+    def __len__(self):
+        # type: () -> int
+        return len(self._data)
+
+    def __contains__(self, key):
+        # type: (Any) -> bool
+        return key in self._data
+
+    @property
+    def hit_rate(self):
+        # type: () -> float
+        """The ratio of the lookups that found their value in the cache."""
+        lookups = self.hits + self.misses
+        return float(self.hits) / lookups if lookups else 0.0
+
+    def _locked_move_to_end(self, key):
+        # type: (Any) -> None
+        with self._lock:
+            self._data[key] = self._data.pop(key)
+
+    def get_or_compute(self, key, f):
+        # type: (T, F) -> S
+        """Return the value cached for ``key``, computing it with ``f(key)`` on a miss."""
+        # DEV: hits do not take the lock, the statistics are best effort
+        value = self._data.get(key, miss)
+        if value is not miss:
+            try:
+                self._move_to_end(key)
+            except KeyError:
+                # Evicted by another thread in the meantime
+                pass
+            self.hits += 1
+            return value
+        return self._compute(key, f)
+
+    def _compute(self, key, f):
+        # type: (T, F) -> S
+        # DEV: compute the value without holding the lock so that a slow
+        # computation does not block the lookups of the other threads.
+        value = f(key)
+
+        with self._lock:
+            self.misses += 1
+            data = self._data
+            data[key] = value
+            while len(data) > self.maxsize:
+                data.popitem(last=False)
+
+        return value
+
+    def clear(self):
+        # type: () -> None
+        """Remove all the values and reset the statistics."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+
 def cached(maxsize=256):
     # type: (int) -> Callable[[F], F]
     """
     Decorator for caching the result of functions with a single argument.
 
-    The strategy is MFU, meaning that only the most frequently used values are
-    retained. The amortized cost of shrinking the cache when it grows beyond
-    the requested size is O(log(size)).
+    The strategy is LRU, meaning that only the most recently used values are
+    retained. The cost of shrinking the cache when it grows beyond the
+    requested size is O(1).
     """
 
     def cached_wrapper(f):
         # type: (F) -> F
-        cache = {}  # type: Dict[Any, Tuple[Any, int]]
-        lock = RLock()
+        cache = LRUCache(maxsize)
+        data = cache._data
+        move_to_end = cache._move_to_end
 
         def cached_f(key):
             # type: (T) -> S
-            if len(cache) >= maxsize:
-                for _, h in zip(range(maxsize >> 1), sorted(cache, key=lambda h: cache[h][1])):
-                    del cache[h]
-
-            _ = cache.get(key, miss)
-            if _ is not miss:
-                value, count = _
-                cache[key] = (value, count + 1)
+            # DEV: inlined hit path of LRUCache.get_or_compute, the most common case
+            value = data.get(key, miss)
+            if value is not miss:
+                try:
+                    move_to_end(key)
+                except KeyError:
+                    pass
+                cache.hits += 1
                 return value
+            return cache._compute(key, f)
 
-            with lock:
-                _ = cache.get(key, miss)
-                if _ is not miss:
-                    value, count = _
-                    cache[key] = (value, count + 1)
-                    return value
-
-                result = f(key)
-
-                cache[key] = (result, 1)
-
-                return result
-
+        cached_f.cache = cache  # type: ignore[attr-defined]
         cached_f.invalidate = cache.clear  # type: ignore[attr-defined]
 
         return cached_f
@@ -8,14 +8,21 @@ import zipfile
 
 import botocore.session
 from moto import mock_ec2
+from moto import mock_events
 from moto import mock_kinesis
 from moto import mock_kms
 from moto import mock_lambda
 from moto import mock_s3
+from moto import mock_sns
 from moto import mock_sqs
+import pytest
 
 from ddtrace import Pin
 from ddtrace.constants import ANALYTICS_SAMPLE_RATE_KEY
+from ddtrace.contrib.botocore import extract_context
+from ddtrace.contrib.botocore.patch import MAX_KINESIS_DATA_SIZE
+from ddtrace.contrib.botocore.patch import inject_trace_json_to_object
+from ddtrace.contrib.botocore.patch import inject_trace_to_sns_batch_message
 from ddtrace.contrib.botocore.patch import patch
 from ddtrace.contrib.botocore.patch import unpatch
 from ddtrace.internal.compat import stringify
@@ -805,3 +812,189 @@ class BotocoreTest(TracerTestCase):
         assert delivery_stream_span.get_tag("aws.operation") == "CreateDeliveryStream"
         assert put_record_batch_span.get_tag("aws.operation") == "PutRecordBatch"
         assert put_record_batch_span.get_tag("params.Records") is None
+
+    @mock_sqs
+    def test_sqs_receive_message_extract_context(self):
+        sqs = self.session.create_client("sqs", region_name="us-east-1")
+        queue = sqs.create_queue(QueueName="test")
+        Pin(service=self.TEST_SERVICE, tracer=self.tracer).onto(sqs)
+        entries = [{"Id": str(i), "MessageBody": "ironmaiden"} for i in range(2)]
+        sqs.send_message_batch(QueueUrl=queue["QueueUrl"], Entries=entries)
+        span = self.get_spans()[0]
+        self.reset()
+
+        names = ["other"]
+        response = sqs.receive_message(QueueUrl=queue["QueueUrl"], MaxNumberOfMessages=10, MessageAttributeNames=names)
+        # The caller's list is left untouched
+        assert names == ["other"]
+        assert len(response["Messages"]) == 2
+        for message in response["Messages"]:
+            context = extract_context(message)
+            assert context.trace_id == span.trace_id
+            assert context.span_id == span.span_id
+
+        # The batch entries are not tagged
+        assert span.get_tag("params.Entries") is None
+
+    @mock_sqs
+    def test_sqs_receive_message_distributed_tracing_off(self):
+        with self.override_config("botocore", dict(distributed_tracing=False)):
+            sqs = self.session.create_client("sqs", region_name="us-east-1")
+            queue = sqs.create_queue(QueueName="test")
+            Pin(service=self.TEST_SERVICE, tracer=self.tracer).onto(sqs)
+            sqs.send_message(QueueUrl=queue["QueueUrl"], MessageBody="ironmaiden")
+            response = sqs.receive_message(QueueUrl=queue["QueueUrl"])
+            assert "MessageAttributes" not in response["Messages"][0]
+            assert extract_context(response["Messages"][0]).trace_id is None
+
+    @mock_sns
+    @mock_sqs
+    def test_sns_publish_trace_injection(self):
+        sns = self.session.create_client("sns", region_name="us-east-1")
+        sqs = self.session.create_client("sqs", region_name="us-east-1")
+        topic = sns.create_topic(Name="test")
+        queue = sqs.create_queue(QueueName="test")
+        queue_arn = sqs.get_queue_attributes(QueueUrl=queue["QueueUrl"], AttributeNames=["QueueArn"])["Attributes"][
+            "QueueArn"
+        ]
+        sns.subscribe(TopicArn=topic["TopicArn"], Protocol="sqs", Endpoint=queue_arn)
+        Pin(service=self.TEST_SERVICE, tracer=self.tracer).onto(sns)
+
+        sns.publish(TopicArn=topic["TopicArn"], Message="ironmaiden")
+        spans = self.get_spans()
+        assert len(spans) == 1
+        span = spans[0]
+        assert span.get_tag("aws.operation") == "Publish"
+        assert span.resource == "sns.publish"
+
+        response = sqs.receive_message(QueueUrl=queue["QueueUrl"])
+        context = extract_context(response["Messages"][0])
+        assert context.trace_id == span.trace_id
+        assert context.span_id == span.span_id
+
+    @mock_kinesis
+    def test_kinesis_put_records_trace_injection(self):
+        kinesis = self.session.create_client("kinesis", region_name="us-east-1")
+        kinesis.create_stream(StreamName="test", ShardCount=1)
+        Pin(service=self.TEST_SERVICE, tracer=self.tracer).onto(kinesis)
+
+        records = [
+            {"Data": json.dumps({"name": "ironmaiden"}), "PartitionKey": "1"},
+            {"Data": b"{}", "PartitionKey": "1"},
+            {"Data": b"ironmaiden", "PartitionKey": "1"},
+        ]
+        with self.override_config("botocore", dict(distributed_tracing_payloads=True)):
+            kinesis.put_records(StreamName="test", Records=records)
+        span = self.get_spans()[0]
+        assert span.get_tag("aws.operation") == "PutRecords"
+        assert span.get_tag("params.Records") is None
+
+        shard_id = kinesis.describe_stream(StreamName="test")["StreamDescription"]["Shards"][0]["ShardId"]
+        shard_iterator = kinesis.get_shard_iterator(
+            StreamName="test", ShardId=shard_id, ShardIteratorType="TRIM_HORIZON"
+        )
+        received = kinesis.get_records(ShardIterator=shard_iterator["ShardIterator"])["Records"]
+        assert len(received) == 3
+        assert json.loads(received[0]["Data"])["name"] == "ironmaiden"
+        for record in received[:2]:
+            context = extract_context(record)
+            assert context.trace_id == span.trace_id
+            assert context.span_id == span.span_id
+        # Only the JSON objects carry the trace context
+        assert received[2]["Data"] == b"ironmaiden"
+        assert extract_context(received[2]).trace_id is None
+
+    @mock_events
+    def test_eventbridge_put_events_trace_injection(self):
+        events = self.session.create_client("events", region_name="us-east-1")
+        Pin(service=self.TEST_SERVICE, tracer=self.tracer).onto(events)
+
+        entries = [
+            {"Source": "test", "DetailType": "test", "Detail": json.dumps({"name": "ironmaiden"})},
+            {"Source": "test", "DetailType": "test", "Detail": "[]"},
+        ]
+        with self.override_config("botocore", dict(distributed_tracing_payloads=True)):
+            events.put_events(Entries=entries)
+        span = self.get_spans()[0]
+        assert span.get_tag("aws.operation") == "PutEvents"
+
+        detail = json.loads(entries[0]["Detail"])
+        assert detail["name"] == "ironmaiden"
+        # An event delivered to SQS
+        context = extract_context({"Body": json.dumps({"detail-type": "test", "detail": detail})})
+        assert context.trace_id == span.trace_id
+        assert context.span_id == span.span_id
+        assert entries[1]["Detail"] == "[]"
+
+    @mock_kinesis
+    def test_kinesis_put_record_payload_injection_off(self):
+        kinesis = self.session.create_client("kinesis", region_name="us-east-1")
+        kinesis.create_stream(StreamName="test", ShardCount=1)
+        Pin(service=self.TEST_SERVICE, tracer=self.tracer).onto(kinesis)
+
+        data = json.dumps({"name": "ironmaiden"})
+        kinesis.put_record(StreamName="test", Data=data, PartitionKey="1")
+
+        shard_id = kinesis.describe_stream(StreamName="test")["StreamDescription"]["Shards"][0]["ShardId"]
+        shard_iterator = kinesis.get_shard_iterator(
+            StreamName="test", ShardId=shard_id, ShardIteratorType="TRIM_HORIZON"
+        )
+        received = kinesis.get_records(ShardIterator=shard_iterator["ShardIterator"])["Records"]
+        # The payload is only updated when enabled
+        assert received[0]["Data"] == data.encode("utf-8")
+        assert extract_context(received[0]).trace_id is None
+
+    def test_sns_publish_batch_trace_injection(self):
+        entries = [{"Id": "1", "Message": "ironmaiden"}, {"Id": "2", "Message": "ironmaiden"}]
+        with self.tracer.trace("sns.command") as span:
+            inject_trace_to_sns_batch_message(("PublishBatch", {"PublishBatchRequestEntries": entries}), span)
+
+        attribute = entries[0]["MessageAttributes"]["_datadog"]
+        # The trace context is serialized once
+        assert entries[1]["MessageAttributes"]["_datadog"] is attribute
+        # A notification delivered to SQS
+        body = {
+            "Type": "Notification",
+            "MessageAttributes": {"_datadog": {"Type": "String", "Value": attribute["StringValue"]}},
+        }
+        context = extract_context({"Body": json.dumps(body)})
+        assert context.trace_id == span.trace_id
+        assert context.span_id == span.span_id
+
+
+@pytest.mark.parametrize(
+    "data,expected",
+    [
+        ("{}", '{"_datadog":{"k":"v"}}'),
+        (b'{"a": 1}', b'{"a": 1,"_datadog":{"k":"v"}}'),
+        ('{"a": 1} \n', '{"a": 1,"_datadog":{"k":"v"}} \n'),
+        ("{ }", '{ "_datadog":{"k":"v"}}'),
+        ('{"_datadog": {}}', None),
+        ('{"a": {"_datadog": {}}}', None),
+        ("[]", None),
+        ('{"a": 1} []', None),
+        ("{invalid", None),
+        (b"\x00", None),
+    ],
+)
+def test_inject_trace_json_to_object(data, expected):
+    member = '"_datadog":{"k":"v"}'
+    if isinstance(data, bytes):
+        member = member.encode("utf-8")
+    assert inject_trace_json_to_object(data, member, MAX_KINESIS_DATA_SIZE) == expected
+
+
+def test_inject_trace_json_to_object_too_large():
+    member = '"_datadog":{"k":"v"}'
+    data = json.dumps({"a": "b" * (MAX_KINESIS_DATA_SIZE - 10)})
+    assert inject_trace_json_to_object(data, member, MAX_KINESIS_DATA_SIZE) is None
+    # The size is checked in bytes
+    data = json.dumps({"a": u"\u00e9" * (MAX_KINESIS_DATA_SIZE // 2 - 10)}, ensure_ascii=False)
+    assert inject_trace_json_to_object(data, member, MAX_KINESIS_DATA_SIZE) is None
+    assert inject_trace_json_to_object(data, member, MAX_KINESIS_DATA_SIZE * 2) is not None
+
+
+def test_extract_context_malformed():
+    assert extract_context({"MessageAttributes": {"_datadog": {"StringValue": "{invalid"}}}).trace_id is None
+    assert extract_context({"Body": "ironmaiden"}).trace_id is None
+    assert extract_context({}).trace_id is None
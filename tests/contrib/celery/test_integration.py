@@ -766,3 +766,25 @@ class CeleryDistributedTracingIntegrationTask(CeleryBaseTestCase):
             run_span = traces[0][0]
 
         assert run_span.trace_id == 12345
+
+    @pytest.mark.skipif(
+        not CeleryBaseTestCase.ASYNC_USE_CELERY_FIXTURES, reason="the task must be published to a worker"
+    )
+    def test_distributed_tracing_publish_propagation(self):
+        @self.app.task
+        def fn_task():
+            return 42
+
+        # The context is injected by the before_publish signal
+        with self.override_config("celery", dict(distributed_tracing=True)):
+            result = fn_task.apply_async()
+            assert result.get(timeout=self.ASYNC_GET_TIMEOUT) == 42
+
+        traces = self.pop_traces()
+        assert 2 == len(traces)
+        async_span = traces[0][0]
+        run_span = traces[1][0]
+        assert async_span.name == "celery.apply"
+        assert run_span.name == "celery.run"
+        assert async_span.trace_id == run_span.trace_id == 12345
+        assert run_span.parent_id == async_span.span_id
@@ -1,4 +1,5 @@
 import gc
+import weakref
 
 from ddtrace.contrib.celery.utils import attach_span
 from ddtrace.contrib.celery.utils import detach_span
@@ -75,10 +76,9 @@ class CeleryTagsTest(CeleryBaseTestCase):
             return 42
 
         # propagate and retrieve a Span
-        task_id = "7c6731af-9533-40c3-83a9-25b58f0d837f"
         span_before = self.tracer.trace("celery.run")
-        attach_span(fn_task, task_id, span_before)
-        span_after = retrieve_span(fn_task, task_id)
+        attach_span(fn_task.request, span_before)
+        span_after = retrieve_span(fn_task.request)
         assert span_before is span_after
 
     def test_span_delete(self):
@@ -88,13 +88,11 @@ class CeleryTagsTest(CeleryBaseTestCase):
             return 42
 
         # propagate a Span
-        task_id = "7c6731af-9533-40c3-83a9-25b58f0d837f"
         span = self.tracer.trace("celery.run")
-        attach_span(fn_task, task_id, span)
+        attach_span(fn_task.request, span)
         # delete the Span
-        weak_dict = getattr(fn_task, "__dd_task_span")
-        detach_span(fn_task, task_id)
-        assert weak_dict.get((task_id, False)) is None
+        detach_span(fn_task.request)
+        assert retrieve_span(fn_task.request) is None
 
     def test_span_delete_empty(self):
         # ensure the helper works even if the Task doesn't have
@@ -105,33 +103,36 @@ class CeleryTagsTest(CeleryBaseTestCase):
 
         # delete the Span
         exception = None
-        task_id = "7c6731af-9533-40c3-83a9-25b58f0d837f"
         try:
-            detach_span(fn_task, task_id)
+            detach_span(fn_task.request)
         except Exception as e:
             exception = e
         assert exception is None
 
-    def test_memory_leak_safety(self):
-        # Spans are shared between signals using a Dictionary (task_id -> span).
-        # This test ensures the GC correctly cleans finished spans. If this test
-        # fails a memory leak will happen for sure.
+    def test_span_per_request(self):
+        # Spans are attached to the request of a task execution: each execution of
+        # the task has its own span, which is released with its request.
         @self.app.task
         def fn_task():
             return 42
 
-        # propagate and finish a Span for `fn_task`
         task_id = "7c6731af-9533-40c3-83a9-25b58f0d837f"
-        attach_span(fn_task, task_id, self.tracer.trace("celery.run"))
-        weak_dict = getattr(fn_task, "__dd_task_span")
-        key = (task_id, False)
-        assert weak_dict.get(key)
-        # flush data and force the GC
-        weak_dict.get(key).finish()
+        fn_task.push_request(id=task_id)
+        request = fn_task.request
+        span = self.tracer.trace("celery.run")
+        attach_span(request, span)
+        fn_task.pop_request()
+
+        assert retrieve_span(request) is span
+        assert retrieve_span(fn_task.request) is None
+        span.finish()
+        detach_span(request)
+        ref = weakref.ref(span)
+        del span
         self.pop_spans()
         self.pop_traces()
         gc.collect()
-        assert weak_dict.get(key) is None
+        assert ref() is None
 
     def test_task_id_from_protocol_v1(self):
         # ensures a `task_id` is properly returned when Protocol v1 is used.
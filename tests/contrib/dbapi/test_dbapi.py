@@ -1,8 +1,11 @@
+import itertools
+
 import mock
 import pytest
 
 from ddtrace import Pin
 from ddtrace.constants import ANALYTICS_SAMPLE_RATE_KEY
+from ddtrace.contrib.dbapi import FETCH_SAMPLING_INTERVAL
 from ddtrace.contrib.dbapi import FetchTracedCursor
 from ddtrace.contrib.dbapi import TracedConnection
 from ddtrace.contrib.dbapi import TracedCursor
@@ -40,6 +43,21 @@ class TestTracedCursor(TracerTestCase):
         assert "__result__" == traced_cursor.executemany("__query__", "arg_1", kwarg1="kwarg1")
         cursor.executemany.assert_called_once_with("__query__", "arg_1", kwarg1="kwarg1")
 
+    def test_executemany_size(self):
+        cursor = self.cursor
+        cursor.rowcount = 3
+        pin = Pin("pin_name", tracer=self.tracer)
+        traced_cursor = TracedCursor(cursor, pin, {})
+
+        traced_cursor.executemany("__query__", [(1,), (2,), (3,)])
+        traced_cursor.executemany("__query__", ((i,) for i in range(3)))
+
+        sized, unsized = self.pop_spans()
+        assert sized.get_tag("sql.executemany") == "true"
+        assert sized.get_metric("db.executemany.size") == 3
+        assert unsized.get_tag("sql.executemany") == "true"
+        assert unsized.get_metric("db.executemany.size") is None
+
     def test_fetchone_wrapped_is_called_and_returned(self):
         cursor = self.cursor
         cursor.rowcount = 0
@@ -540,6 +558,91 @@ class TestFetchTracedCursor(TracerTestCase):
         assert len(spans) == 1
         self.reset()
 
+    def test_iter_is_traced(self):
+        cursor = mock.MagicMock()
+        rows = [(i, "row") for i in range(250)]
+        cursor.__iter__.return_value = iter(rows)
+        pin = Pin("my_service", app="my_app", tracer=self.tracer, tags={"pin1": "value_pin1"})
+        traced_cursor = FetchTracedCursor(cursor, pin, {})
+        traced_cursor._self_last_execute_operation = "SELECT * FROM rows"
+
+        with self.tracer.trace("parent"):
+            # Each sampled fetch lasts 10ns
+            with mock.patch("ddtrace.contrib.dbapi.monotonic_ns", side_effect=itertools.count(0, 10)):
+                assert list(traced_cursor) == rows
+
+        parent, span = self.pop_spans()
+        assert span.name == "my_app.query.iter"
+        assert span.service == "my_service"
+        assert span.resource == "SELECT * FROM rows"
+        assert span.span_type == "sql"
+        assert span.parent_id == parent.span_id
+        assert span.error == 0
+        assert span.get_tag("pin1") == "value_pin1"
+        assert span.get_metric("sql.rows") == 250
+        assert span.get_metric("sql.rows") == 250
+        # The size and duration are extrapolated from the rows sampled
+        assert span.get_metric("db.fetch.bytes") == 750
+        assert span.get_metric("db.fetch.duration") == 2500
+        assert_is_not_measured(span)
+
+    def test_iter_shorter_than_sampling_interval(self):
+        cursor = mock.MagicMock()
+        cursor.__iter__.return_value = iter([("x",)] * (FETCH_SAMPLING_INTERVAL - 1))
+        pin = Pin("pin_name", tracer=self.tracer)
+        traced_cursor = FetchTracedCursor(cursor, pin, {})
+
+        assert len(list(traced_cursor)) == FETCH_SAMPLING_INTERVAL - 1
+
+        (span,) = self.pop_spans()
+        assert span.get_metric("sql.rows") == FETCH_SAMPLING_INTERVAL - 1
+        assert span.get_metric("db.fetch.bytes") == FETCH_SAMPLING_INTERVAL - 1
+        # The first fetch is never timed
+        assert span.get_metric("db.fetch.duration") is None
+
+    def test_iter_stopped_early(self):
+        cursor = mock.MagicMock()
+        cursor.__iter__.return_value = iter([(1,), (2,), (3,)])
+        pin = Pin("pin_name", tracer=self.tracer)
+        traced_cursor = FetchTracedCursor(cursor, pin, {})
+
+        for row in traced_cursor:
+            break
+        del row
+
+        (span,) = self.pop_spans()
+        assert span.name == "sql.query.iter"
+        assert span.error == 0
+        assert span.get_metric("sql.rows") == 1
+
+    def test_iter_error(self):
+        def rows():
+            yield (1,)
+            raise ValueError("fetch failed")
+
+        cursor = mock.MagicMock()
+        cursor.__iter__.return_value = rows()
+        pin = Pin("pin_name", tracer=self.tracer)
+        traced_cursor = FetchTracedCursor(cursor, pin, {})
+
+        with pytest.raises(ValueError):
+            list(traced_cursor)
+
+        (span,) = self.pop_spans()
+        assert span.error == 1
+        assert span.get_tag("error.msg") == "fetch failed"
+        assert span.get_metric("sql.rows") == 1
+
+    def test_iter_when_pin_disabled_then_no_tracing(self):
+        cursor = mock.MagicMock()
+        cursor.__iter__.return_value = iter([(1,), (2,)])
+        self.tracer.enabled = False
+        pin = Pin("pin_name", tracer=self.tracer)
+        traced_cursor = FetchTracedCursor(cursor, pin, {})
+
+        assert list(traced_cursor) == [(1,), (2,)]
+        assert len(self.pop_spans()) == 0
+
 
 class TestTracedConnection(TracerTestCase):
     def setUp(self):
@@ -563,6 +666,26 @@ class TestTracedConnection(TracerTestCase):
             traced_connection = TracedConnection(self.connection, pin=pin, cursor_cls=TracedCursor)
             self.assertTrue(traced_connection._self_cursor_cls is TracedCursor)
 
+    def test_cursors_share_connection_pin(self):
+        pin = Pin("pin_name", tracer=self.tracer)
+        traced_connection = TracedConnection(self.connection, pin=pin)
+
+        cursors = [traced_connection.cursor() for _ in range(2)]
+        # The pin of the connection is not cloned for each cursor
+        assert Pin.get_from(traced_connection) is pin
+        for cursor in cursors:
+            assert Pin.get_from(cursor) is pin
+
+        # Overriding the pin of a cursor does not change the pin of the connection
+        Pin.override(cursors[0], service="cursor-svc")
+        assert Pin.get_from(cursors[0]).service == "cursor-svc"
+        assert Pin.get_from(cursors[1]) is pin
+        assert Pin.get_from(traced_connection) is pin
+
+        # Overriding the pin of the connection changes the pin of its next cursors
+        Pin.override(traced_connection, service="conn-svc")
+        assert Pin.get_from(traced_connection.cursor()).service == "conn-svc"
+
     def test_commit_is_traced(self):
         connection = self.connection
         tracer = self.tracer
@@ -140,6 +140,7 @@ class ElasticsearchPatchTest(TracerTestCase):
         assert url.endswith("/_search")
         assert url == span.get_tag("elasticsearch.url")
         assert span.get_tag("elasticsearch.body").replace(" ", "") == '{"query":{"match_all":{}}}'
+        assert span.get_metric("elasticsearch.body.size") == len(span.get_tag("elasticsearch.body"))
         assert set(span.get_tag("elasticsearch.params").split("&")) == {"sort=name%3Adesc", "size=100"}
         assert set(span.get_tag(http.QUERY_STRING).split("&")) == {"sort=name%3Adesc", "size=100"}
 
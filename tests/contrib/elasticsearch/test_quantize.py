@@ -0,0 +1,64 @@
+import re
+
+import pytest
+
+from ddtrace.contrib.elasticsearch.quantize import DEFAULT_INDEX_PATTERNS
+from ddtrace.contrib.elasticsearch.quantize import Quantizer
+from ddtrace.contrib.elasticsearch.quantize import get_quantizer
+from ddtrace.contrib.elasticsearch.quantize import quantize
+from ddtrace.ext import elasticsearch as metadata
+from ddtrace.span import Span
+from tests.utils import override_config
+
+
+@pytest.mark.parametrize(
+    "method,url,expected",
+    [
+        ("PUT", "/my_index", "PUT /my_index"),
+        ("PUT", "/my_index/my_type/10", "PUT /my_index/my_type/?"),
+        ("GET", "/my_index/my_type/1?refresh=true", "GET /my_index/my_type/??refresh=true"),
+        ("POST", "/logs-2021.05.04/_bulk", "POST /logs-?.?.?/_bulk"),
+    ],
+)
+def test_resource(method, url, expected):
+    assert Quantizer(DEFAULT_INDEX_PATTERNS).resource(method, url) == expected
+
+
+def test_resource_index_patterns():
+    quantizer = Quantizer([r"[0-9]{4}\.[0-9]{2}\.[0-9]{2}", re.compile("shard-[a-z]")])
+    assert quantizer.resource("POST", "/logs-2021.05.04/_bulk") == "POST /logs-?/_bulk"
+    assert quantizer.resource("POST", "/shard-b/_doc/42") == "POST /?/_doc/?"
+    # Without index patterns, only the IDs are quantized
+    assert Quantizer([]).resource("POST", "/logs-2021.05.04/_doc/42") == "POST /logs-2021.05.04/_doc/?"
+
+
+def test_resource_cached():
+    quantizer = Quantizer(DEFAULT_INDEX_PATTERNS, maxsize=2)
+    for _ in range(3):
+        assert quantizer.resource("POST", "/logs-2021.05.04/_bulk") == "POST /logs-?.?.?/_bulk"
+    assert quantizer._cache.misses == 1
+    assert quantizer._cache.hits == 2
+
+    # The method is part of the key
+    assert quantizer.resource("PUT", "/logs-2021.05.04/_bulk") == "PUT /logs-?.?.?/_bulk"
+    assert quantizer.resource("POST", "/logs-2021.05.05/_bulk") == "POST /logs-?.?.?/_bulk"
+    # The cache is bounded
+    assert len(quantizer._cache) == 2
+
+
+def test_get_quantizer():
+    quantizer = get_quantizer(["[0-9]{2,}"])
+    assert get_quantizer(["[0-9]{2,}"]) is quantizer
+    other = get_quantizer(["[0-9]+"])
+    assert other is not quantizer
+    assert other.resource("GET", "/index-1") == "GET /index-?"
+
+
+def test_quantize():
+    span = Span(None, "elasticsearch.query")
+    span.set_tag(metadata.METHOD, "GET")
+    span.set_tag(metadata.URL, "/index-1/_search")
+    assert quantize(span).resource == "GET /index-1/_search"
+
+    with override_config("elasticsearch", dict(index_patterns=["[0-9]"])):
+        assert quantize(span).resource == "GET /index-?/_search"
@@ -311,6 +311,61 @@ class GrpcTestCase(TracerTestCase):
         self._check_client_span(client_span, "grpc-client", "SayHelloRepeatedly", "bidi_streaming")
         self._check_server_span(server_span, "grpc-server", "SayHelloRepeatedly", "bidi_streaming")
 
+    def test_stream_metrics(self):
+        requests_iterator = iter(HelloRequest(name=name) for name in ["first", "second", "third", "fourth", "fifth"])
+
+        # DEV: the client span can finish before the last messages are consumed, the parent span keeps the trace
+        #      from being flushed until then
+        with self.tracer.trace("parent"):
+            with grpc.insecure_channel("localhost:%d" % (_GRPC_PORT)) as channel:
+                stub = HelloStub(channel)
+                responses_iterator = stub.SayHelloRepeatedly(requests_iterator)
+                assert len(list(responses_iterator)) == 3
+
+        spans = [span for span in self.get_spans_with_sync_and_assert(size=3) if span.name == "grpc"]
+        assert len(spans) == 2
+        for span in spans:
+            assert span.get_metric(constants.GRPC_STREAM_MESSAGES_KEY) == 3
+            # Only the size of the first message is computed
+            assert span.get_metric(constants.GRPC_STREAM_BYTES_KEY) == 3 * HelloReply(message="first;second").ByteSize()
+
+    def test_stream_spans(self):
+        requests_iterator = iter(HelloRequest(name=name) for name in ["first", "second", "third", "fourth", "fifth"])
+
+        with self.override_config("grpc", dict(stream_sample_rate=1, stream_span_interval=1e-9)):
+            with self.override_config("grpc_server", dict(stream_sample_rate=1, stream_span_interval=1e-9)):
+                with self.tracer.trace("parent"):
+                    with grpc.insecure_channel("localhost:%d" % (_GRPC_PORT)) as channel:
+                        stub = HelloStub(channel)
+                        responses_iterator = stub.SayHelloRepeatedly(requests_iterator)
+                        messages = [r.message for r in responses_iterator]
+
+        spans = self.get_spans_with_sync_and_assert(size=9)
+        streams = [span for span in spans if span.name == "grpc"]
+        assert len(streams) == 2
+        for stream in streams:
+            assert stream.get_metric(constants.GRPC_STREAM_MESSAGES_KEY) == 3
+            assert stream.get_metric(constants.GRPC_STREAM_BYTES_KEY) == sum(
+                HelloReply(message=message).ByteSize() for message in messages
+            )
+            windows = [
+                span
+                for span in spans
+                if span.get_tag(constants.GRPC_STREAM_RPC_SPAN_ID_KEY) == str(stream.span_id)
+                and span.name == constants.GRPC_STREAM_SPAN_NAME
+            ]
+            assert len(windows) == 3
+            for window in windows:
+                # Each window is its own trace, linked to the RPC span
+                assert window.parent_id is None
+                assert window.trace_id != stream.trace_id
+                assert window.get_tag(constants.GRPC_STREAM_RPC_TRACE_ID_KEY) == str(stream.trace_id)
+                assert window.resource == stream.resource
+                assert window.service == stream.service
+                assert window.get_metric(constants.GRPC_STREAM_MESSAGES_KEY) == 1
+                assert window.start_ns >= stream.start_ns
+            assert windows[0].start_ns == stream.start_ns
+
     def test_priority_sampling(self):
         # DEV: Priority sampling is enabled by default
         # Setting priority sampling reset the writer, we need to re-override it
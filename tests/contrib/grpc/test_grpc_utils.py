@@ -1,7 +1,11 @@
 import mock
 import pytest
 
+from ddtrace.contrib.grpc import constants
 from ddtrace.contrib.grpc import utils
+from ddtrace.settings import IntegrationConfig
+from ddtrace.span import Span
+from tests.utils import DummyTracer
 
 
 def test_parse_method_path_with_package():
@@ -91,3 +95,57 @@ def test_set_grpc_method_meta(method, method_kind, calls):
     span = mock.MagicMock()
     utils.set_grpc_method_meta(span, method, method_kind)
     span._set_str_tag.assert_has_calls(calls)
+
+
+@pytest.mark.parametrize(
+    "rate, sampled, size",
+    [
+        (1, 250, 250 * 5),
+        (0.01, 3, 250 * 5),
+        (0, 0, None),
+    ],
+)
+def test_stream_messages(rate, sampled, size):
+    span = Span(None, "grpc")
+    messages = utils._StreamMessages(
+        None, span, IntegrationConfig(None, "grpc", stream_sample_rate=rate, stream_span_interval=0)
+    )
+    for _ in range(250):
+        messages.count += 1
+        if messages.count == messages.next_sample:
+            messages.sample(b"hello")
+
+    assert messages.sampled == sampled
+    messages.set_metrics(span)
+    assert span.get_metric(constants.GRPC_STREAM_MESSAGES_KEY) == 250
+    assert span.get_metric(constants.GRPC_STREAM_BYTES_KEY) == size
+
+
+@pytest.mark.parametrize("rate", [0, 0.01])
+def test_stream_messages_windows(rate):
+    tracer = DummyTracer()
+    with tracer.trace("grpc") as span:
+        span.context.sampling_priority = 2
+        messages = utils._StreamMessages(
+            tracer, span, IntegrationConfig(None, "grpc", stream_sample_rate=rate, stream_span_interval=1e-9)
+        )
+        for _ in range(250):
+            messages.count += 1
+            if messages.count == messages.next_sample:
+                messages.sample(b"hello")
+
+        # The windows are sent while the RPC is still running
+        windows = tracer.pop()
+        assert [window.name for window in windows] == [constants.GRPC_STREAM_SPAN_NAME] * 3
+        assert sum(window.get_metric(constants.GRPC_STREAM_MESSAGES_KEY) for window in windows) == 201
+        for window in windows:
+            assert window.trace_id != span.trace_id
+            assert window.get_tag(constants.GRPC_STREAM_RPC_TRACE_ID_KEY) == str(span.trace_id)
+            assert window.get_tag(constants.GRPC_STREAM_RPC_SPAN_ID_KEY) == str(span.span_id)
+            assert window.context.sampling_priority == 2
+            if rate:
+                assert window.get_metric(constants.GRPC_STREAM_BYTES_KEY) is not None
+            else:
+                assert window.get_metric(constants.GRPC_STREAM_BYTES_KEY) is None
+
+    assert tracer.pop() == [span]
@@ -50,6 +50,17 @@ class Jinja2Test(TracerTestCase):
         assert spans[1].name == "jinja2.render"
         assert_is_measured(spans[1])
 
+    def test_span_budget(self):
+        t = jinja2.environment.Template("Hello {{name}}!")
+        with self.override_config("jinja2", dict(max_spans_per_trace=1)):
+            with self.tracer.trace("parent") as parent:
+                for _ in range(3):
+                    assert t.render(name="Jinja") == "Hello Jinja!"
+
+        spans = self.pop_spans()
+        assert [span.name for span in spans] == ["jinja2.compile", "parent", "jinja2.render"]
+        assert parent.get_metric("jinja2.collapsed_spans") == 2
+
     def test_generate_inline_template(self):
         t = jinja2.environment.Template("Hello {{name}}!")
         assert "".join(t.generate(name="Jinja")) == "Hello Jinja!"
@@ -5,6 +5,7 @@ import six
 
 import ddtrace
 from ddtrace.constants import ENV_KEY
+from ddtrace.constants import HIGHER_ORDER_TRACE_ID_BITS
 from ddtrace.constants import VERSION_KEY
 from ddtrace.contrib.logging import patch
 from ddtrace.contrib.logging import unpatch
@@ -199,6 +200,20 @@ class LoggingTestCase(TracerTestCase):
         with self.override_global_config(dict(version="global.version", env="global.env")):
             self._test_logging(create_span=create_span, version="global.version", env="global.env")
 
+    def test_log_trace_128_bit_trace_id(self):
+        def func():
+            with self.tracer.trace("test.logging") as span:
+                logger.info("Hello!")
+                return span
+
+        with self.override_global_config(dict(_128_bit_trace_id_enabled=True)):
+            output, span = capture_function_log(func, fmt="%(message)s - dd.trace_id=%(dd.trace_id)s")
+
+        trace_id = output.split("dd.trace_id=")[1]
+        assert len(trace_id) == 32
+        assert trace_id[:16] == span.context._meta[HIGHER_ORDER_TRACE_ID_BITS]
+        assert int(trace_id[16:], 16) == span.trace_id
+
     @pytest.mark.skipif(six.PY2, reason="logging.StrFormatStyle does not exist on Python 2.7")
     def test_log_strformat_style(self):
         def func():
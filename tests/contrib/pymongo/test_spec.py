@@ -1,10 +1,20 @@
 """
 tests for parsing specs.
 """
+import struct
 
+from bson import BSON
+from bson.binary import Binary
+from bson.int64 import Int64
+from bson.objectid import ObjectId
+from bson.regex import Regex
 from bson.son import SON
+import pytest
 
+from ddtrace.contrib.pymongo.parse import MAX_COUNTED_DOCUMENTS
+from ddtrace.contrib.pymongo.parse import parse_msg
 from ddtrace.contrib.pymongo.parse import parse_spec
+from ddtrace.ext import net as netx
 
 
 def test_empty():
@@ -59,3 +69,102 @@ def test_update():
     assert cmd.name == "update"
     assert cmd.coll == "songs"
     assert cmd.query == {"artist": "Neil"}
+
+
+def _op_query(ns, spec):
+    body = struct.pack("<i", 0) + ns + b"\x00" + struct.pack("<ii", 0, -1) + BSON.encode(spec)
+    return struct.pack("<iiii", 16 + len(body), 1, 0, 2004) + body
+
+
+def _op_msg(spec, identifier=None, documents=(), flags=0):
+    body = struct.pack("<i", flags) + b"\x00" + BSON.encode(spec)
+    if identifier:
+        sequence = identifier + b"\x00" + b"".join(BSON.encode(doc) for doc in documents)
+        body += b"\x01" + struct.pack("<i", 4 + len(sequence)) + sequence
+    if flags & 1:
+        body += b"\x00\x00\x00\x00"
+    return struct.pack("<iiii", 16 + len(body), 1, 0, 2013) + body
+
+
+def test_parse_msg_query():
+    spec = SON([("insert", "songs"), ("ordered", False), ("documents", [{"a": 1}, {"b": [1, 2]}, {"c": "d"}])])
+    msg = _op_query(b"testdb.$cmd", spec)
+    cmd = parse_msg(msg)
+    assert cmd.name == "insert"
+    assert cmd.db == "testdb"
+    assert cmd.coll == "songs"
+    assert cmd.tags == {"mongodb.ordered": False}
+    assert cmd.metrics == {"mongodb.documents": 3, netx.BYTES_OUT: len(msg)}
+
+
+def test_parse_msg_query_namespace():
+    cmd = parse_msg(_op_query(b"testdb.songs", SON([("count", 1)])))
+    assert cmd.name == "count"
+    assert cmd.db == "testdb"
+    assert cmd.coll == 1
+
+
+def test_parse_msg_document_sequence():
+    spec = SON([("insert", "songs"), ("ordered", True), ("lsid", {"id": 1}), ("$db", "testdb")])
+    msg = _op_msg(spec, b"documents", [{"_id": i, "name": "x" * i} for i in range(5)])
+    cmd = parse_msg(msg)
+    assert cmd.name == "insert"
+    assert cmd.db == "testdb"
+    assert cmd.coll == "songs"
+    assert cmd.tags == {"mongodb.ordered": True}
+    assert cmd.metrics == {"mongodb.documents": 5, netx.BYTES_OUT: len(msg)}
+
+
+def test_parse_msg_documents_count_bound():
+    spec = SON([("insert", "songs"), ("$db", "testdb")])
+    documents = [{"_id": i} for i in range(MAX_COUNTED_DOCUMENTS + 1)]
+    msg = _op_msg(spec, b"documents", documents)
+    cmd = parse_msg(msg)
+    assert cmd.tags == {"mongodb.documents.truncated": "true"}
+    assert cmd.metrics == {"mongodb.documents": MAX_COUNTED_DOCUMENTS, netx.BYTES_OUT: len(msg)}
+
+    cmd = parse_msg(_op_query(b"testdb.$cmd", SON([("insert", "songs"), ("documents", documents)])))
+    assert cmd.tags == {"mongodb.documents.truncated": "true"}
+    assert cmd.metrics["mongodb.documents"] == MAX_COUNTED_DOCUMENTS
+
+    cmd = parse_msg(_op_msg(spec, b"documents", documents[:-1]))
+    assert cmd.tags == {}
+    assert cmd.metrics["mongodb.documents"] == MAX_COUNTED_DOCUMENTS
+
+
+@pytest.mark.parametrize("flags", [0, 1])
+def test_parse_msg_update_query(flags):
+    spec = SON([("update", "songs"), ("$db", "testdb")])
+    updates = [
+        SON([("qq", 1), ("q", {"artist": "Neil", "year": {"$gt": 1970}}), ("u", {"$set": {"artist": "Shakey"}})]),
+        SON([("q", {"other": 1}), ("u", {})]),
+    ]
+    cmd = parse_msg(_op_msg(spec, b"updates", updates, flags=flags))
+    assert cmd.name == "update"
+    assert cmd.coll == "songs"
+    assert cmd.query == {"artist": "Neil", "year": {"$gt": 1970}}
+
+
+def test_parse_msg_inline_delete_query():
+    spec = SON([("delete", "songs"), ("deletes", [SON([("q", {"artist": "Neil"}), ("limit", 0)])]), ("$db", "testdb")])
+    cmd = parse_msg(_op_msg(spec))
+    assert cmd.name == "delete"
+    assert cmd.db == "testdb"
+    assert cmd.query == {"artist": "Neil"}
+
+
+def test_parse_msg_skips_values():
+    spec = SON(
+        [
+            ("find", "songs"),
+            ("filter", {"re": Regex("^a", "i"), "bin": Binary(b"\x00\x01"), "id": ObjectId(), "n": None}),
+            ("maxTimeMS", Int64(10)),
+            ("ratio", 0.5),
+            ("$db", "testdb"),
+        ]
+    )
+    cmd = parse_msg(_op_msg(spec))
+    assert cmd.name == "find"
+    assert cmd.db == "testdb"
+    assert cmd.coll == "songs"
+    assert cmd.query is None
@@ -7,6 +7,8 @@ from ddtrace.constants import ANALYTICS_SAMPLE_RATE_KEY
 from ddtrace.contrib.redis import get_traced_redis
 from ddtrace.contrib.redis.patch import patch
 from ddtrace.contrib.redis.patch import unpatch
+from ddtrace.contrib.redis.util import PIPELINE_MAX_FORMATTED_COMMANDS
+from ddtrace.contrib.redis.util import format_pipeline_commands
 from ddtrace.internal import compat
 from tests.opentracer.utils import init_tracer
 from tests.utils import DummyTracer
@@ -27,6 +29,13 @@ def test_redis_legacy():
     assert not tracer.pop()
 
 
+def test_format_pipeline_commands():
+    assert format_pipeline_commands([("SET", "a", 1), ("GET", "a")]) == "SET a 1\nGET a"
+
+    commands = [("SET", "a", 1), ("GET", "a")] * (PIPELINE_MAX_FORMATTED_COMMANDS // 2) + [("INCR", "b")]
+    assert format_pipeline_commands(commands) == "SET\nGET\nINCR"
+
+
 class TestRedisPatch(TracerTestCase):
 
     TEST_PORT = REDIS_CONFIG["port"]
@@ -129,6 +138,20 @@ class TestRedisPatch(TracerTestCase):
         assert span.get_metric("redis.pipeline_length") == 3
         assert span.get_metric(ANALYTICS_SAMPLE_RATE_KEY) is None
 
+    def test_large_pipeline_traced(self):
+        with self.r.pipeline(transaction=False) as p:
+            for i in range(150):
+                p.set("key%d" % i, i)
+            p.get("key0")
+            p.execute()
+
+        spans = self.get_spans()
+        assert len(spans) == 1
+        span = spans[0]
+        assert span.resource == u"SET\nGET"
+        assert span.get_tag("redis.raw_command") == u"SET\nGET"
+        assert span.get_metric("redis.pipeline_length") == 151
+
     def test_pipeline_immediate(self):
         with self.r.pipeline() as p:
             p.set("a", 1)
@@ -184,6 +184,39 @@ class TestSQLite(TracerTestCase):
             )
             self.assertIsNone(fetchmany_span.get_tag("sql.query"))
 
+    def test_sqlite_iter_is_traced(self):
+        # Not traced by default
+        connection = self._given_a_traced_connection(self.tracer)
+        connection.execute("create table rows (name text)")
+        connection.executemany("insert into rows values (?)", [("row%d" % i,) for i in range(10)])
+        self.reset()
+        q = "select * from rows"
+        assert len(list(connection.execute(q))) == 10
+        self.assert_structure(dict(name="sqlite.query", resource=q))
+        self.reset()
+
+        with self.override_config("sqlite", dict(trace_fetch_methods=True)):
+            connection = self._given_a_traced_connection(self.tracer)
+            connection.execute("create table rows (name text)")
+            connection.executemany("insert into rows values (?)", [("row%d" % i,) for i in range(10)])
+            self.reset()
+            assert len(list(connection.execute(q))) == 10
+
+            # A single span for all the rows
+            query_span, iter_span = self.get_root_spans()
+            query_span.assert_structure(dict(name="sqlite.query", resource=q))
+            assert_is_not_measured(iter_span)
+            iter_span.assert_structure(
+                dict(
+                    name="sqlite.query.iter",
+                    resource=q,
+                    span_type="sql",
+                    error=0,
+                ),
+            )
+            assert iter_span.get_metric("sql.rows") == 10
+            assert iter_span.get_metric("db.fetch.bytes") == 40
+
     def test_sqlite_ot(self):
         """Ensure sqlite works with the opentracer."""
         ot_tracer = init_tracer("sqlite_svc", self.tracer)
@@ -233,6 +266,16 @@ class TestSQLite(TracerTestCase):
         self.assertEqual(span.service, "sqlite")
         self.assertEqual(span.name, "sqlite.connection.commit")
 
+    def test_span_budget(self):
+        connection = self._given_a_traced_connection(self.tracer)
+        with self.override_config("sqlite", dict(max_spans_per_trace=2)):
+            with self.tracer.trace("parent") as parent:
+                for _ in range(5):
+                    connection.execute("select 1")
+        spans = self.get_spans()
+        assert [span.name for span in spans] == ["parent", "sqlite.query", "sqlite.query"]
+        assert parent.get_metric("sqlite.collapsed_spans") == 3
+
     def test_rollback(self):
         connection = self._given_a_traced_connection(self.tracer)
         connection.rollback()
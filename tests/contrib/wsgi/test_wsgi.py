@@ -130,6 +130,17 @@ def test_query_string_tracing(tracer, test_spans):
         assert spans[0][3].name == "wsgi.response"
 
 
+def test_url_quoted_path(tracer, test_spans):
+    app = TestApp(wsgi.DDWSGIMiddleware(application, tracer=tracer))
+    for _ in range(2):
+        app.get("/a path")
+
+    spans = test_spans.pop_traces()
+    assert len(spans) == 2
+    for trace in spans:
+        assert trace[0].get_tag("http.url") == "http://localhost:80/a%20path"
+
+
 def test_http_request_header_tracing(tracer, test_spans):
     config.wsgi.http.trace_headers(["my-header"])
     app = TestApp(wsgi.DDWSGIMiddleware(application, tracer=tracer))
@@ -1,6 +1,7 @@
 # -*- encoding: utf-8 -*-
 import gc
 import os
+import sys
 import threading
 
 import pytest
@@ -11,6 +12,7 @@ try:
 except ImportError:
     pytestmark = pytest.mark.skip("_memalloc not available")
 
+from ddtrace.internal import compat
 from ddtrace.internal import nogevent
 from ddtrace.profiling import recorder
 from ddtrace.profiling.collector import memalloc
@@ -52,7 +54,7 @@ def test_start_stop():
 
 
 # This is used by tests and must be equal to the line number where object() is called in _allocate_1k 😉
-_ALLOC_LINE_NUMBER = 59
+_ALLOC_LINE_NUMBER = 61
 
 
 def _allocate_1k():
@@ -66,7 +68,9 @@ def _pre_allocate_1k():
 def test_iter_events():
     max_nframe = 32
     _memalloc.start(max_nframe, 10000, 512 * 1024)
+    start_ns = compat.monotonic_ns()
     _allocate_1k()
+    end_ns = compat.monotonic_ns()
     events, count, alloc_count = _memalloc.iter_events()
     _memalloc.stop()
 
@@ -74,7 +78,7 @@ def test_iter_events():
     # Watchout: if we dropped samples the test will likely fail
 
     object_count = 0
-    for (stack, nframe, thread_id), size in events:
+    for (stack, nframe, thread_id), size, timestamp_ns, thread_native_id in events:
         assert 0 < len(stack) <= max_nframe
         assert nframe >= len(stack)
         last_call = stack[0]
@@ -85,6 +89,9 @@ def test_iter_events():
             assert stack[1][0] == __file__
             assert stack[1][1] == _ALLOC_LINE_NUMBER
             assert stack[1][2] == "_allocate_1k"
+            assert start_ns <= timestamp_ns <= end_ns
+            if sys.version_info >= (3, 8):
+                assert thread_native_id == threading.main_thread().native_id
             object_count += 1
 
     assert object_count >= 1000
@@ -123,7 +130,7 @@ def test_iter_events_multi_thread():
 
     count_object = 0
     count_thread = 0
-    for (stack, nframe, thread_id), size in events:
+    for (stack, nframe, thread_id), size, timestamp_ns, thread_native_id in events:
         assert 0 < len(stack) <= max_nframe
         assert nframe >= len(stack)
         last_call = stack[0]
@@ -149,7 +156,9 @@ def test_memory_collector():
     r = recorder.Recorder()
     mc = memalloc.MemoryCollector(r)
     with mc:
+        start_ns = compat.time_ns()
         _allocate_1k()
+        end_ns = compat.time_ns()
         # Make sure we collect at least once
         mc.periodic()
 
@@ -165,8 +174,10 @@ def test_memory_collector():
             assert event.thread_name == "MainThread"
             count_object += 1
             assert event.frames[2][0] == __file__
-            assert event.frames[2][1] == 152
+            assert event.frames[2][1] == 160
             assert event.frames[2][2] == "test_memory_collector"
+            assert start_ns <= event.timestamp <= end_ns
+            assert event.thread_native_id > 0
 
     assert count_object > 0
 
@@ -221,7 +232,7 @@ def test_heap():
     x = _allocate_1k()
     # Check that at least one sample comes from the main thread
     thread_found = False
-    for (stack, nframe, thread_id), size in _memalloc.heap():
+    for (stack, nframe, thread_id), size, count in _memalloc.heap():
         assert 0 < len(stack) <= max_nframe
         assert size > 0
         if thread_id == nogevent.main_thread_id:
@@ -242,7 +253,7 @@ def test_heap():
         pytest.fail("No trace of allocation in heap")
     assert thread_found, "Main thread not found"
     y = _pre_allocate_1k()
-    for (stack, nframe, thread_id), size in _memalloc.heap():
+    for (stack, nframe, thread_id), size, count in _memalloc.heap():
         assert 0 < len(stack) <= max_nframe
         assert size > 0
         assert isinstance(thread_id, int)
@@ -261,7 +272,7 @@ def test_heap():
         pytest.fail("No trace of allocation in heap")
     del x
     gc.collect()
-    for (stack, nframe, thread_id), size in _memalloc.heap():
+    for (stack, nframe, thread_id), size, count in _memalloc.heap():
         assert 0 < len(stack) <= max_nframe
         assert size > 0
         assert isinstance(thread_id, int)
@@ -278,7 +289,7 @@ def test_heap():
             pytest.fail("Allocated memory still in heap")
     del y
     gc.collect()
-    for (stack, nframe, thread_id), size in _memalloc.heap():
+    for (stack, nframe, thread_id), size, count in _memalloc.heap():
         assert 0 < len(stack) <= max_nframe
         assert size > 0
         assert isinstance(thread_id, int)
@@ -296,6 +307,53 @@ def test_heap():
     _memalloc.stop()
 
 
+def test_heap_aggregated():
+    _memalloc.start(32, 10, 1024)
+    x = [_allocate_1k() for _ in range(64)]
+    rows = [
+        (size, count)
+        for (stack, nframe, thread_id), size, count in _memalloc.heap()
+        if stack[0][0] == __file__
+        and stack[0][1] == _ALLOC_LINE_NUMBER
+        and stack[1][2] == "_allocate_1k"
+        and stack[2][2] == "<listcomp>"
+        and stack[3][2] == "test_heap_aggregated"
+    ]
+    # All the samples of the same traceback are merged into a single row
+    assert len(rows) == 1
+    size, count = rows[0]
+    assert size > 1024
+    assert count > 1
+    del x
+    gc.collect()
+    for (stack, nframe, thread_id), size, count in _memalloc.heap():
+        assert size > 0
+        assert count > 0
+        if stack[0][0] == __file__ and len(stack) >= 4 and stack[3][2] == "test_heap_aggregated":
+            pytest.fail("Allocated memory still in heap")
+    _memalloc.stop()
+
+
+def test_heap_many_stacks():
+    namespace = {}
+    exec("\n".join("def _allocate_%d():\n    return bytearray(2048)" % i for i in range(500)), namespace)
+    _memalloc.start(32, 10, 1024)
+    x = [namespace["_allocate_%d" % i]() for i in range(500)]
+    names = {
+        stack[0][2]
+        for (stack, nframe, thread_id), size, count in _memalloc.heap()
+        if stack[0][2].startswith("_allocate_")
+    }
+    # Each function has its own stack
+    assert len(names) > 100
+    del x
+    gc.collect()
+    for (stack, nframe, thread_id), size, count in _memalloc.heap():
+        if stack[0][2].startswith("_allocate_") and stack[0][2] != "_allocate_1k":
+            pytest.fail("Allocated memory still in heap")
+    _memalloc.stop()
+
+
 def test_heap_collector():
     heap_sample_size = 1024
     r = recorder.Recorder()
@@ -357,3 +415,21 @@ def test_memalloc_sample_size(enabled, predicates, monkeypatch):
     assert predicates[1](memalloc._get_default_heap_sample_size(1))
     assert predicates[2](memalloc._get_default_heap_sample_size(512))
     assert predicates[3](memalloc._get_default_heap_sample_size(512 * 1024 * 1024))
+
+
+def test_memory_collector_endpoint_active():
+    active = [False]
+    r = recorder.Recorder()
+    mc = memalloc.MemoryCollector(r, endpoint_active=lambda: active[0])
+    with mc:
+        mc.collect()
+        assert mc.interval == memalloc.MemoryCollector._DEFAULT_INTERVAL
+        active[0] = True
+        mc.collect()
+        assert (
+            mc.interval
+            == memalloc.MemoryCollector._DEFAULT_INTERVAL / memalloc.MemoryCollector._ENDPOINT_INTERVAL_FACTOR
+        )
+        active[0] = False
+        mc.collect()
+        assert mc.interval == memalloc.MemoryCollector._DEFAULT_INTERVAL
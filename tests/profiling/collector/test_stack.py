@@ -198,7 +198,7 @@ def test_repr():
         stack.StackCollector,
         "StackCollector(status=<ServiceStatus.STOPPED: 'stopped'>, "
         "recorder=Recorder(default_max_events=32768, max_events={}), min_interval_time=0.01, max_time_usage_pct=1.0, "
-        "nframes=64, ignore_profiler=False, tracer=None)",
+        "nframes=64, ignore_profiler=False, tracer=None, endpoints=frozenset(), endpoint_max_time_usage_pct=10.0)",
     )
 
 
@@ -569,3 +569,36 @@ def test_thread_time_cache():
         assert set(tt._get_last_thread_time().keys()) == set(
             (pthread_id, _threading.get_thread_native_id(pthread_id)) for pthread_id in threads
         )
+
+
+def test_new_interval_endpoint():
+    r = recorder.Recorder()
+    c = stack.StackCollector(r, max_time_usage_pct=2, endpoint_max_time_usage_pct=10)
+    assert c._compute_new_interval(10000000) == 0.49
+    c.endpoint_active = True
+    assert c._compute_new_interval(10000000) == pytest.approx(0.09)
+
+
+def test_parse_endpoints():
+    assert stack._parse_endpoints("") == frozenset()
+    assert stack._parse_endpoints("GET /checkout, POST /cart,") == {"GET /checkout", "POST /cart"}
+
+
+def test_endpoint_active(tracer, monkeypatch):
+    monkeypatch.setenv("DD_PROFILING_ENDPOINTS", "GET /checkout")
+    r = recorder.Recorder()
+    c = stack.StackCollector(r, tracer=tracer)
+    assert c.endpoints == {"GET /checkout"}
+    c._init()
+    try:
+        with tracer.trace("web.request", resource="GET /home"):
+            c.collect()
+            assert not c.endpoint_active
+        with tracer.trace("web.request", resource="GET /checkout"):
+            with tracer.trace("db.query"):
+                c.collect()
+                assert c.endpoint_active
+        c.collect()
+        assert not c.endpoint_active
+    finally:
+        tracer.context_provider._deregister_on_activate(c._thread_span_links.link_span)
@@ -14,8 +14,8 @@ from . import test_collector
 def test_repr():
     test_collector._test_repr(
         collector_threading.LockCollector,
-        "LockCollector(status=<ServiceStatus.STOPPED: 'stopped'>, "
-        "recorder=Recorder(default_max_events=32768, max_events={}), capture_pct=2.0, nframes=64, tracer=None)",
+        "LockCollector(status=<ServiceStatus.STOPPED: 'stopped'>, recorder=Recorder(default_max_events=32768, "
+        "max_events={}), capture_pct=2.0, nframes=64, tracer=None, site_events_per_second=0.0)",
     )
 
 
@@ -240,3 +240,75 @@ def test_lock_acquire_release_speed_patched(benchmark, pct):
 )
 def test_lock_acquire_release_speed(benchmark):
     benchmark(_lock_acquire_release, threading.Lock())
+
+
+def test_lock_site_sampler():
+    sampler = collector_threading.LockSiteSampler(2)
+    assert sampler.capture_pct("foo") == 100.0
+    assert sampler.capture("foo", 0, 10) == 100.0
+    assert sampler.capture("foo", 1, 10) == 100.0
+    assert sampler.capture("foo", 2, 10) is None
+    # Another site has its own budget
+    assert sampler.capture("bar", 2, 10) == 100.0
+    assert sampler.capture_pct("foo") == pytest.approx(100.0 * 2 / 3)
+    # Half a second later, one more event can be captured
+    assert sampler.capture("foo", int(0.5e9) + 2, 10) == pytest.approx(100.0 * 3 / 4)
+    assert sampler.capture("foo", int(0.5e9) + 3, 10) is None
+    # Next window uses the previous window ratio
+    assert sampler.capture("foo", int(1.5e9), 10) == 60.0
+    assert sampler.capture_pct("foo") == 60.0
+
+
+def test_lock_site_sampler_wait_time_weight(monkeypatch):
+    sampler = collector_threading.LockSiteSampler(1000)
+    assert sampler.capture("foo", 0, 1000) == 100.0
+    # Longer waits are always captured
+    assert sampler.capture("foo", 1, 9000) == 100.0
+    # Shorter waits are captured with a probability proportional to their wait time
+    monkeypatch.setattr("random.random", lambda: 0.0)
+    assert sampler.capture("foo", 2, 1000) == 50.0
+    monkeypatch.setattr("random.random", lambda: 0.9)
+    assert sampler.capture("foo", 3, 10) is None
+    # Waits discarded by their weight do not count against the budget ratio
+    assert sampler.capture_pct("foo") == 100.0
+
+
+def test_lock_site_sampler_invalid():
+    with pytest.raises(ValueError):
+        collector_threading.LockSiteSampler(0)
+
+
+def test_lock_site_sampled_uncontended():
+    r = recorder.Recorder()
+    with collector_threading.LockCollector(r, site_events_per_second=100):
+        lock = threading.Lock()
+        assert lock.acquire()
+        assert not lock.acquire(False)
+        lock.release()
+    assert len(r.events[collector_threading.LockAcquireEvent]) == 0
+    assert len(r.events[collector_threading.LockReleaseEvent]) == 0
+
+
+def test_lock_site_sampled_contended():
+    r = recorder.Recorder()
+    with collector_threading.LockCollector(r, site_events_per_second=100):
+        lock = threading.Lock()
+        lock.acquire()
+        t = threading.Timer(0.1, lock.release)
+        t.start()
+        assert lock.acquire()
+        lock.release()
+        t.join()
+    acquire_events = [
+        e for e in r.events[collector_threading.LockAcquireEvent] if e.lock_name == "test_threading.py:295"
+    ]
+    assert len(acquire_events) == 1
+    event = acquire_events[0]
+    assert event.wait_time_ns > 0
+    assert event.frames[0] == (__file__, 299, "test_lock_site_sampled_contended")
+    assert event.sampling_pct == 100
+    release_events = [
+        e for e in r.events[collector_threading.LockReleaseEvent] if e.lock_name == "test_threading.py:295"
+    ]
+    assert len(release_events) == 1
+    assert release_events[0].frames[0] == (__file__, 300, "test_lock_site_sampled_contended")
@@ -1,6 +1,8 @@
 # -*- encoding: utf-8 -*-
 import logging
+import threading
 
+from ddtrace.internal import service
 from ddtrace.profiling import event
 from ddtrace.profiling import exporter
 from ddtrace.profiling import recorder
@@ -54,3 +56,98 @@ def test_before_flush_failure(caplog):
     assert caplog.record_tuples == [
         (("ddtrace.profiling.scheduler", logging.ERROR, "Scheduler before_flush hook failed"))
     ]
+
+
+class _SerializeExporter(exporter.Exporter):
+    def __init__(self):
+        self.uploaded = []
+
+    def serialize(self, events, start_time_ns, end_time_ns):
+        return len(events[event.Event])
+
+    def upload(self, payload):
+        self.uploaded.append(payload)
+
+
+def test_flush_upload_sync():
+    r = recorder.Recorder()
+    exp = _SerializeExporter()
+    s = scheduler.Scheduler(r, [exp])
+    r.push_events([event.Event()] * 10)
+    s.flush()
+    assert exp.uploaded == [10]
+
+
+def test_flush_upload_background():
+    r = recorder.Recorder()
+    exp = _SerializeExporter()
+    s = scheduler.Scheduler(r, [exp])
+    s.start()
+    try:
+        r.push_events([event.Event()] * 10)
+        s.flush()
+    finally:
+        s.stop()
+        s.join()
+    # Pending uploads are done on shutdown
+    assert exp.uploaded == [10]
+
+
+class _SlowSerializeExporter(_SerializeExporter):
+    def __init__(self):
+        super(_SlowSerializeExporter, self).__init__()
+        self.serializing = threading.Event()
+        self.stopped = threading.Event()
+
+    def serialize(self, events, start_time_ns, end_time_ns):
+        if not self.serializing.is_set():
+            self.serializing.set()
+            self.stopped.wait()
+        return super(_SlowSerializeExporter, self).serialize(events, start_time_ns, end_time_ns)
+
+
+def test_stop_during_flush():
+    r = recorder.Recorder()
+    exp = _SlowSerializeExporter()
+    s = scheduler.Scheduler(r, [exp], interval=0.01)
+    r.push_events([event.Event()] * 10)
+    s.start()
+    try:
+        exp.serializing.wait()
+        s.stop()
+        # The uploader is stopped once the running flush is over
+        assert s._uploader.status == service.ServiceStatus.RUNNING
+    finally:
+        exp.stopped.set()
+        s.join()
+    assert s._uploader.status == service.ServiceStatus.STOPPED
+    assert exp.uploaded == [10]
+
+
+def test_uploader_drop():
+    exp = _SerializeExporter()
+    u = scheduler.Uploader(max_pending=2)
+    u.put(exp, 1)
+    u.put(exp, 2)
+    u.put(exp, 3)
+    assert u.dropped == 1
+    u.periodic()
+    assert exp.uploaded == [2, 3]
+
+
+class _FailUploadExporter(exporter.Exporter):
+    def upload(self, payload):
+        raise exporter.ExportError("BOO!")
+
+
+def test_uploader_failure(caplog):
+    u = scheduler.Uploader()
+    u.put(_FailUploadExporter(), None)
+    u.periodic()
+    assert caplog.record_tuples == [
+        (
+            "ddtrace.profiling.scheduler",
+            logging.ERROR,
+            "Unable to export profile: ddtrace.profiling.exporter.ExportError: BOO!. Ignoring.",
+        )
+    ]
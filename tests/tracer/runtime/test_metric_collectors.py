@@ -1,9 +1,12 @@
+import ddtrace
 from ddtrace.internal.runtime.constants import GC_COUNT_GEN0
 from ddtrace.internal.runtime.constants import GC_RUNTIME_METRICS
+from ddtrace.internal.runtime.constants import GC_TRACER_SPANS
 from ddtrace.internal.runtime.constants import PSUTIL_RUNTIME_METRICS
 from ddtrace.internal.runtime.metric_collectors import GCRuntimeMetricCollector
 from ddtrace.internal.runtime.metric_collectors import PSUtilRuntimeMetricCollector
 from ddtrace.internal.runtime.metric_collectors import RuntimeMetricCollector
+from ddtrace.internal.runtime.metric_collectors import TracerRuntimeMetricCollector
 from tests.utils import BaseTestCase
 
 
@@ -58,3 +61,17 @@ class TestGCRuntimeMetricCollector(BaseTestCase):
         assert len(collected_after) == 1
         assert collected_after[0][0] == "runtime.python.gc.count.gen0"
         assert isinstance(collected_after[0][1], int)
+
+
+class TestTracerRuntimeMetricCollector(BaseTestCase):
+    def test_metrics(self):
+        collector = TracerRuntimeMetricCollector()
+        # Other tests might leave unfinished traces behind
+        [(key, start)] = collector.collect([GC_TRACER_SPANS])
+        assert key == GC_TRACER_SPANS
+
+        with ddtrace.tracer.trace("root"):
+            with ddtrace.tracer.trace("child"):
+                assert collector.collect([GC_TRACER_SPANS]) == [(GC_TRACER_SPANS, start + 2)]
+            assert collector.collect([GC_TRACER_SPANS]) == [(GC_TRACER_SPANS, start + 2)]
+        assert collector.collect([GC_TRACER_SPANS]) == [(GC_TRACER_SPANS, start)]
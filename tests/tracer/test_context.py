@@ -48,3 +48,20 @@ def test_eq(ctx1, ctx2):
 )
 def test_not_eq(ctx1, ctx2):
     assert ctx1 != ctx2
+
+
+def test_span_context_lazy():
+    ctx = Context(trace_id=123, span_id=321, dd_origin="synthetics")
+    span = Span(None, "test.span", trace_id=123, parent_id=321, context=ctx)
+    assert span._context is None
+
+    span.context.sampling_priority = 2
+    assert span.context is span._context
+    assert span.context.trace_id == 123
+    assert span.context.span_id == span.span_id
+    assert span.context.dd_origin == "synthetics"
+    # The trace-level state is shared with the parent context
+    assert ctx.sampling_priority == 2
+
+    span.context.sampling_priority = None
+    assert ctx.sampling_priority is None
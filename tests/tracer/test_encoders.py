@@ -342,3 +342,14 @@ def test_encoder_buffer_item_size_limit():
 
     with pytest.raises(BufferItemTooLarge):
         encoder.put([span] * (int(max_item_size / trace_size) + 1))
+
+
+def test_encoder_shared_meta():
+    encoder = MsgpackEncoder(1 << 20, 1 << 20)
+    span = Span(None, "test.span")
+    span._shared_meta = {"env": "prod", "team": "web"}
+    span.set_tag("team", "api")
+    span.set_tag("component", "test")
+    encoder.put([span])
+    decoded_span = decode(encoder.encode())[0][0]
+    assert decoded_span[b"meta"] == {b"env": b"prod", b"team": b"api", b"component": b"test"}
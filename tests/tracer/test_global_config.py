@@ -282,3 +282,18 @@ class GlobalConfigTestCase(TestCase):
         with override_env(dict(DD_SERVICE_MAPPING="foobar:bar,snafu:foo")):
             c = Config()
             assert c.service_mapping == {"foobar": "bar", "snafu": "foo"}
+
+    def test_dd_trace_propagation_style(self):
+        c = Config()
+        assert c._propagation_style_inject == ("datadog",)
+        assert c._propagation_style_extract == ("datadog",)
+
+        with override_env(
+            dict(
+                DD_TRACE_PROPAGATION_STYLE_INJECT="tracecontext, B3multi,tracecontext",
+                DD_TRACE_PROPAGATION_STYLE_EXTRACT="datadog,unknown,b3 single header",
+            )
+        ):
+            c = Config()
+            assert c._propagation_style_inject == ("tracecontext", "b3multi")
+            assert c._propagation_style_extract == ("datadog", "b3 single header")
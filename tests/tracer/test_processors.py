@@ -5,9 +5,17 @@ import mock
 import pytest
 
 from ddtrace import Span
+from ddtrace.constants import SPAN_SAMPLING_MECHANISM
+from ddtrace.ext.priority import AUTO_KEEP
+from ddtrace.ext.priority import AUTO_REJECT
 from ddtrace.internal.processor import SpanProcessor
 from ddtrace.internal.processor.trace import SpanAggregator
+from ddtrace.internal.processor.trace import TraceFlushCallbacksProcessor
 from ddtrace.internal.processor.trace import TraceProcessor
+from ddtrace.internal.processor.trace import TraceSamplingProcessor
+from ddtrace.sampler import RateSampler
+from ddtrace.sampler import SpanSamplingRule
+from tests.utils import DummyTracer
 from tests.utils import DummyWriter
 
 
@@ -216,3 +224,90 @@ def test_aggregator_partial_flush_2_spans():
     assert writer.pop() == [child1, child2]
     parent.finish()
     assert writer.pop() == [parent]
+
+
+def test_flush_callbacks_processor():
+    calls = []
+    span = Span(None, "span")
+    span._add_on_flush_callback(lambda s: calls.append(("first", s)))
+    span._add_on_flush_callback(mock.Mock(side_effect=ValueError))
+    span._add_on_flush_callback(lambda s: calls.append(("last", s)))
+    other = Span(None, "other")
+
+    trace = [span, other]
+    assert TraceFlushCallbacksProcessor().process_trace(trace) is trace
+    assert calls == [("first", span), ("last", span)]
+
+    # The callbacks are only called once
+    TraceFlushCallbacksProcessor().process_trace(trace)
+    assert len(calls) == 2
+
+
+def test_flush_callbacks_not_called_for_dropped_traces():
+    tracer = DummyTracer()
+    callback = mock.Mock()
+
+    with tracer.trace("kept") as span:
+        span._add_on_flush_callback(callback)
+    callback.assert_called_once_with(span)
+
+    callback.reset_mock()
+    with tracer.trace("dropped") as span:
+        span.sampled = False
+        span._add_on_flush_callback(callback)
+    callback.assert_not_called()
+
+
+def test_sampling_processor_single_span_rules():
+    processor = TraceSamplingProcessor(
+        single_span_rules=[
+            SpanSamplingRule(name="postgres.query", min_duration=1.0),
+            SpanSamplingRule(service="cache", sample_rate=0.0),
+            SpanSamplingRule(service="cache*"),
+        ]
+    )
+    root = Span(None, "flask.request", service="web")
+    slow = Span(None, "postgres.query", service="db")
+    slow.duration_ns = int(2e9)
+    fast = Span(None, "postgres.query", service="db")
+    fast.duration_ns = int(1e6)
+    cache = Span(None, "redis.command", service="cache")
+    sessions = Span(None, "redis.command", service="cache-sessions")
+    trace = [root, slow, fast, cache, sessions]
+    for span in trace:
+        span.sampled = False
+
+    # Only the spans kept by the first rule they match are sent
+    assert processor.process_trace(trace) == [slow, sessions]
+    assert [SPAN_SAMPLING_MECHANISM in span.metrics for span in trace] == [False, True, False, False, True]
+
+    # Traces without kept spans are dropped
+    assert processor.process_trace([root, fast]) is None
+    assert TraceSamplingProcessor().process_trace(trace) is None
+
+
+@pytest.mark.parametrize("priority,tagged", [(AUTO_REJECT, True), (AUTO_KEEP, False), (None, False)])
+def test_sampling_processor_single_span_rules_rejected_trace(priority, tagged):
+    # The traces rejected by their sampling priority are sent to the agent, which keeps the tagged spans
+    processor = TraceSamplingProcessor(single_span_rules=[SpanSamplingRule(name="postgres.query")])
+    tracer = DummyTracer()
+    with tracer.trace("flask.request") as root:
+        root.context.sampling_priority = priority
+        with tracer.trace("postgres.query") as span:
+            pass
+
+    trace = [root, span]
+    assert processor.process_trace(trace) is trace
+    assert (SPAN_SAMPLING_MECHANISM in span.metrics) is tagged
+    assert SPAN_SAMPLING_MECHANISM not in root.metrics
+
+
+def test_tracer_single_span_rules():
+    tracer = DummyTracer()
+    tracer.configure(sampler=RateSampler(0.0), span_sampling_rules=[SpanSamplingRule(name="postgres.query")])
+    with tracer.trace("flask.request"):
+        with tracer.trace("postgres.query") as span:
+            pass
+
+    assert tracer.pop() == [span]
+    assert span.get_metric(SPAN_SAMPLING_MECHANISM) == 8
@@ -3,6 +3,11 @@ from unittest import TestCase
 
 import pytest
 
+from ddtrace.constants import HIGHER_ORDER_TRACE_ID_BITS
+from ddtrace.constants import PROPAGATION_STYLE_B3
+from ddtrace.constants import PROPAGATION_STYLE_B3_SINGLE_HEADER
+from ddtrace.constants import PROPAGATION_STYLE_DATADOG
+from ddtrace.constants import PROPAGATION_STYLE_W3C_TRACECONTEXT
 from ddtrace.context import Context
 from ddtrace.propagation.http import HTTPPropagator
 from ddtrace.propagation.http import HTTP_HEADER_ORIGIN
@@ -11,6 +16,7 @@ from ddtrace.propagation.http import HTTP_HEADER_SAMPLING_PRIORITY
 from ddtrace.propagation.http import HTTP_HEADER_TRACE_ID
 from ddtrace.propagation.utils import get_wsgi_header
 from tests.utils import DummyTracer
+from tests.utils import override_global_config
 
 
 NOT_SET = object()
@@ -121,7 +127,275 @@ def test_extract_bad_values(trace_id, parent_span_id, sampling_priority, dd_orig
     assert context.sampling_priority is None
     assert context.dd_origin is None
 
+    # WSGI environ
+    context = HTTPPropagator._extract_from_wsgi_environ(wsgi_headers)
+    assert context.trace_id is None
+    assert context.span_id is None
+    assert context.sampling_priority is None
+    assert context.dd_origin is None
+
+
+def test_extract_wsgi_environ():
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "HTTP_HOST": "localhost",
+        "HTTP_X_DATADOG_TRACE_ID": "1234",
+        "HTTP_X_DATADOG_PARENT_ID": "5678",
+        "HTTP_X_DATADOG_SAMPLING_PRIORITY": "1",
+        "HTTP_X_DATADOG_ORIGIN": "synthetics",
+    }
+    assert HTTPPropagator._extract_from_wsgi_environ(environ) == Context(
+        trace_id=1234, span_id=5678, sampling_priority=1, dd_origin="synthetics"
+    )
+    assert HTTPPropagator._extract_from_wsgi_environ({"REQUEST_METHOD": "GET"}) == Context()
+
+
+def test_extract_asgi_headers():
+    headers = [
+        (b"host", b"localhost"),
+        (b"x-datadog-trace-id", b"1234"),
+        (b"x-datadog-parent-id", b"5678"),
+        (b"x-datadog-sampling-priority", b"1"),
+        (b"x-datadog-origin", b"synthetics"),
+    ]
+    assert HTTPPropagator._extract_from_asgi_headers(headers) == Context(
+        trace_id=1234, span_id=5678, sampling_priority=1, dd_origin="synthetics"
+    )
+    assert HTTPPropagator._extract_from_asgi_headers([(b"x-datadog-trace-id", b"\xff")]) == Context()
+    assert HTTPPropagator._extract_from_asgi_headers(None) == Context()
+
 
 class TestPropagationUtils(object):
     def test_get_wsgi_header(self):
         assert get_wsgi_header("x-datadog-trace-id") == "HTTP_X_DATADOG_TRACE_ID"
+
+
+ALL_STYLES = (
+    PROPAGATION_STYLE_DATADOG,
+    PROPAGATION_STYLE_B3,
+    PROPAGATION_STYLE_B3_SINGLE_HEADER,
+    PROPAGATION_STYLE_W3C_TRACECONTEXT,
+)
+
+
+@pytest.mark.parametrize(
+    "style,expected_headers",
+    [
+        (
+            PROPAGATION_STYLE_DATADOG,
+            {
+                HTTP_HEADER_TRACE_ID: "1234",
+                HTTP_HEADER_PARENT_ID: "5678",
+                HTTP_HEADER_SAMPLING_PRIORITY: "2",
+                HTTP_HEADER_ORIGIN: "synthetics",
+            },
+        ),
+        (
+            PROPAGATION_STYLE_B3,
+            {"x-b3-traceid": "00000000000004d2", "x-b3-spanid": "000000000000162e", "x-b3-flags": "1"},
+        ),
+        (PROPAGATION_STYLE_B3_SINGLE_HEADER, {"b3": "00000000000004d2-000000000000162e-d"}),
+        (
+            PROPAGATION_STYLE_W3C_TRACECONTEXT,
+            {
+                "traceparent": "00-000000000000000000000000000004d2-000000000000162e-01",
+                "tracestate": "dd=s:2;o:synthetics",
+            },
+        ),
+    ],
+)
+def test_propagation_style(style, expected_headers):
+    context = Context(trace_id=1234, span_id=5678, sampling_priority=2, dd_origin="synthetics")
+    with override_global_config(dict(_propagation_style_inject=(style,), _propagation_style_extract=(style,))):
+        headers = {}
+        HTTPPropagator.inject(context, headers)
+        assert headers == expected_headers
+
+        extracted = HTTPPropagator.extract(headers)
+        assert extracted.trace_id == 1234
+        assert extracted.span_id == 5678
+        assert extracted.sampling_priority == 2
+        if style in (PROPAGATION_STYLE_DATADOG, PROPAGATION_STYLE_W3C_TRACECONTEXT):
+            assert extracted.dd_origin == "synthetics"
+
+        # The WSGI and ASGI entry points find the same headers
+        environ = {get_wsgi_header(name): value for name, value in headers.items()}
+        assert HTTPPropagator._extract_from_wsgi_environ(environ) == extracted
+        asgi_headers = [(name.encode(), value.encode()) for name, value in headers.items()]
+        assert HTTPPropagator._extract_from_asgi_headers(asgi_headers) == extracted
+
+
+@pytest.mark.parametrize(
+    "headers,expected",
+    [
+        # The higher bits of 128-bit ids are kept as a trace tag
+        (
+            {"traceparent": "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"},
+            Context(
+                trace_id=0x8448EB211C80319C,
+                span_id=0xB7AD6B7169203331,
+                sampling_priority=1,
+                meta={HIGHER_ORDER_TRACE_ID_BITS: "0af7651916cd43dd"},
+            ),
+        ),
+        # The sampled flag wins over a contradicting priority
+        (
+            {"traceparent": "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-00", "tracestate": "dd=s:2"},
+            Context(
+                trace_id=0x8448EB211C80319C,
+                span_id=0xB7AD6B7169203331,
+                sampling_priority=0,
+                meta={HIGHER_ORDER_TRACE_ID_BITS: "0af7651916cd43dd"},
+            ),
+        ),
+        (
+            {
+                "traceparent": "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01",
+                "tracestate": "other=1,dd=o:rum;s:2,add=3",
+            },
+            Context(
+                trace_id=0x8448EB211C80319C,
+                span_id=0xB7AD6B7169203331,
+                sampling_priority=2,
+                dd_origin="rum",
+                meta={HIGHER_ORDER_TRACE_ID_BITS: "0af7651916cd43dd"},
+            ),
+        ),
+        ({"traceparent": "00-00000000000000000000000000000000-b7ad6b7169203331-01"}, Context()),
+        ({"traceparent": "ff-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"}, Context()),
+        ({"traceparent": "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331"}, Context()),
+        ({"traceparent": "00-0af7651916cd43dd8448eb211c80319z-b7ad6b7169203331-01"}, Context()),
+        # Only future versions may be longer
+        ({"traceparent": "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01-what"}, Context()),
+        (
+            {"traceparent": "01-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01-what"},
+            Context(
+                trace_id=0x8448EB211C80319C,
+                span_id=0xB7AD6B7169203331,
+                sampling_priority=1,
+                meta={HIGHER_ORDER_TRACE_ID_BITS: "0af7651916cd43dd"},
+            ),
+        ),
+        ({"b3": "0"}, Context()),
+        (
+            {"b3": "80f198ee56343ba864fe8b2a57d3eff7-e457b5a2e4d86bd1-1-05e3ac9a4f6e3b90"},
+            Context(
+                trace_id=0x64FE8B2A57D3EFF7,
+                span_id=0xE457B5A2E4D86BD1,
+                sampling_priority=1,
+                meta={HIGHER_ORDER_TRACE_ID_BITS: "80f198ee56343ba8"},
+            ),
+        ),
+        (
+            {
+                "x-b3-traceid": "80f198ee56343ba864fe8b2a57d3eff7",
+                "x-b3-spanid": "e457b5a2e4d86bd1",
+                "x-b3-sampled": "0",
+            },
+            Context(
+                trace_id=0x64FE8B2A57D3EFF7,
+                span_id=0xE457B5A2E4D86BD1,
+                sampling_priority=0,
+                meta={HIGHER_ORDER_TRACE_ID_BITS: "80f198ee56343ba8"},
+            ),
+        ),
+        ({"x-b3-traceid": "123", "x-b3-spanid": "e457b5a2e4d86bd1"}, Context()),
+    ],
+)
+def test_extract_other_styles(headers, expected):
+    with override_global_config(dict(_propagation_style_extract=ALL_STYLES)):
+        assert HTTPPropagator.extract(headers) == expected
+
+
+def test_tracestate_other_vendors():
+    headers = {
+        "traceparent": "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01",
+        "tracestate": "other=1, dd=o:rum;s:2 ,add=3",
+    }
+    with override_global_config(
+        dict(
+            _propagation_style_extract=(PROPAGATION_STYLE_W3C_TRACECONTEXT,),
+            _propagation_style_inject=(PROPAGATION_STYLE_W3C_TRACECONTEXT,),
+        )
+    ):
+        tracer = DummyTracer()
+        with tracer.start_span("child", child_of=HTTPPropagator.extract(headers)) as span:
+            span.context.sampling_priority = 1
+            injected = {}
+            HTTPPropagator.inject(span.context, injected)
+    # The dd member is updated and moved first, the other members are kept in order
+    assert injected["tracestate"] == "dd=s:1;o:rum,other=1,add=3"
+
+
+def test_extract_style_precedence():
+    headers = {
+        HTTP_HEADER_TRACE_ID: "1",
+        HTTP_HEADER_PARENT_ID: "2",
+        "traceparent": "00-00000000000000000000000000000003-0000000000000004-01",
+    }
+    with override_global_config(dict(_propagation_style_extract=ALL_STYLES)):
+        assert HTTPPropagator.extract(headers).trace_id == 1
+    with override_global_config(
+        dict(_propagation_style_extract=(PROPAGATION_STYLE_W3C_TRACECONTEXT, PROPAGATION_STYLE_DATADOG))
+    ):
+        assert HTTPPropagator.extract(headers).trace_id == 3
+    # Invalid headers of a style fall back to the next style
+    headers[HTTP_HEADER_TRACE_ID] = "invalid"
+    with override_global_config(dict(_propagation_style_extract=ALL_STYLES)):
+        assert HTTPPropagator.extract(headers).trace_id == 3
+
+
+@pytest.mark.parametrize(
+    "style,expected_headers",
+    [
+        (
+            PROPAGATION_STYLE_DATADOG,
+            {
+                HTTP_HEADER_TRACE_ID: "1234",
+                HTTP_HEADER_PARENT_ID: "5678",
+                "x-datadog-tags": "_dd.p.tid=640cfd8d00000000",
+            },
+        ),
+        (
+            PROPAGATION_STYLE_B3,
+            {"x-b3-traceid": "640cfd8d0000000000000000000004d2", "x-b3-spanid": "000000000000162e"},
+        ),
+        (PROPAGATION_STYLE_B3_SINGLE_HEADER, {"b3": "640cfd8d0000000000000000000004d2-000000000000162e"}),
+        (
+            PROPAGATION_STYLE_W3C_TRACECONTEXT,
+            {"traceparent": "00-640cfd8d0000000000000000000004d2-000000000000162e-00"},
+        ),
+    ],
+)
+def test_propagation_128_bit_trace_id(style, expected_headers):
+    context = Context(trace_id=1234, span_id=5678)
+    context._meta[HIGHER_ORDER_TRACE_ID_BITS] = "640cfd8d00000000"
+    with override_global_config(dict(_propagation_style_inject=(style,), _propagation_style_extract=(style,))):
+        headers = {}
+        HTTPPropagator.inject(context, headers)
+        assert headers == expected_headers
+
+        extracted = HTTPPropagator.extract(headers)
+        assert extracted.trace_id == 1234
+        assert extracted.span_id == 5678
+        assert extracted._meta[HIGHER_ORDER_TRACE_ID_BITS] == "640cfd8d00000000"
+
+
+@pytest.mark.parametrize(
+    "tags,expected",
+    [
+        ("_dd.p.tid=640cfd8d00000000", "640cfd8d00000000"),
+        ("_dd.p.other=1, _dd.p.tid=640CFD8D00000000", "640cfd8d00000000"),
+        ("_dd.p.tid=0000000000000000", None),
+        ("_dd.p.tid=640cfd8d", None),
+        ("_dd.p.tid=640cfd8d0000000z", None),
+        ("_dd.p.other=1", None),
+        ("", None),
+    ],
+)
+def test_extract_datadog_trace_id_high_bits(tags, expected):
+    context = HTTPPropagator.extract(
+        {HTTP_HEADER_TRACE_ID: "1234", HTTP_HEADER_PARENT_ID: "5678", "x-datadog-tags": tags}
+    )
+    assert context.trace_id == 1234
+    assert context._meta.get(HIGHER_ORDER_TRACE_ID_BITS) == expected
@@ -11,6 +11,9 @@ from ddtrace.constants import SAMPLING_AGENT_DECISION
 from ddtrace.constants import SAMPLING_LIMIT_DECISION
 from ddtrace.constants import SAMPLING_PRIORITY_KEY
 from ddtrace.constants import SAMPLING_RULE_DECISION
+from ddtrace.constants import SPAN_SAMPLING_MAX_PER_SECOND
+from ddtrace.constants import SPAN_SAMPLING_MECHANISM
+from ddtrace.constants import SPAN_SAMPLING_RULE_RATE
 from ddtrace.ext.priority import AUTO_KEEP
 from ddtrace.ext.priority import AUTO_REJECT
 from ddtrace.internal.compat import iteritems
@@ -20,6 +23,8 @@ from ddtrace.sampler import DatadogSampler
 from ddtrace.sampler import RateByServiceSampler
 from ddtrace.sampler import RateSampler
 from ddtrace.sampler import SamplingRule
+from ddtrace.sampler import SpanSamplingRule
+from ddtrace.sampler import get_span_sampling_rules
 from ddtrace.span import Span
 
 from ..utils import DummyTracer
@@ -821,3 +826,72 @@ def test_datadog_sampler_update_rate_by_service_sample_rates(dummy_tracer):
         for k, v in iteritems(sampler.default_sampler._by_service_samplers):
             rates[k] = v.sample_rate
         assert case == rates, "%s != %s" % (case, rates)
+
+
+@pytest.mark.parametrize(
+    "rule,service,name,duration,expected",
+    [
+        (SpanSamplingRule(), "", "test.span", 0, True),
+        (SpanSamplingRule(name="postgres.*"), "db", "postgres.query", 0, True),
+        (SpanSamplingRule(name="postgres.*"), "db", "mysql.query", 0, False),
+        (SpanSamplingRule(service="*-db", name="*.query"), "users-db", "postgres.query", 0, True),
+        (SpanSamplingRule(service="*-db", name="*.query"), "web", "postgres.query", 0, False),
+        (SpanSamplingRule(service="?eb"), "web", "flask.request", 0, True),
+        (SpanSamplingRule(service="web"), None, "test.span", 0, False),
+        (SpanSamplingRule(name="postgres.query", min_duration=1.0), "db", "postgres.query", 2e9, True),
+        (SpanSamplingRule(name="postgres.query", min_duration=1.0), "db", "postgres.query", 5e8, False),
+    ],
+)
+def test_span_sampling_rule_matches(rule, service, name, duration, expected):
+    span = Span(None, name, service=service)
+    span.duration_ns = int(duration)
+    assert rule.matches(span) is expected
+
+
+@pytest.mark.parametrize("sample_rate", [-0.1, 1.1])
+def test_span_sampling_rule_init_sample_rate(sample_rate):
+    with pytest.raises(ValueError):
+        SpanSamplingRule(sample_rate=sample_rate)
+
+
+@pytest.mark.parametrize("sample_rate", [0.0, 0.25, 0.5, 1.0])
+def test_span_sampling_rule_sample(sample_rate):
+    rule = SpanSamplingRule(sample_rate=sample_rate)
+    spans = [Span(None, str(i)) for i in range(int(1e4))]
+    sampled = [span for span in spans if rule.sample(span)]
+
+    assert abs(len(sampled) - len(spans) * sample_rate) <= len(spans) * 0.05
+    for span in sampled:
+        assert span.get_metric(SPAN_SAMPLING_MECHANISM) == 8
+        assert span.get_metric(SPAN_SAMPLING_RULE_RATE) == sample_rate
+        assert span.get_metric(SPAN_SAMPLING_MAX_PER_SECOND) is None
+    # The spans that are not sampled are not tagged
+    assert sum(SPAN_SAMPLING_MECHANISM in span.metrics for span in spans) == len(sampled)
+
+
+def test_span_sampling_rule_max_per_second():
+    rule = SpanSamplingRule(max_per_second=5)
+    sampled = [span for span in (Span(None, str(i)) for i in range(20)) if rule.sample(span)]
+    assert len(sampled) == 5
+    assert sampled[0].get_metric(SPAN_SAMPLING_MAX_PER_SECOND) == 5
+
+
+def test_get_span_sampling_rules():
+    with override_env(dict(DD_SPAN_SAMPLING_RULES="")):
+        assert get_span_sampling_rules() == []
+
+    rules_json = (
+        '[{"service": "*-db", "name": "postgres.query", "min_duration": 1, "max_per_second": 50},'
+        ' {"sample_rate": 2}, {"unknown": 1}, {"sample_rate": 0.5}]'
+    )
+    with override_env(dict(DD_SPAN_SAMPLING_RULES=rules_json)):
+        rules = get_span_sampling_rules()
+    # The invalid rules are ignored
+    assert [repr(rule) for rule in rules] == [
+        "SpanSamplingRule(service='*-db', name='postgres.query', sample_rate=1.0, max_per_second=50, min_duration=1)",
+        "SpanSamplingRule(service='*', name='*', sample_rate=0.5, max_per_second=None, min_duration=None)",
+    ]
+
+    for rules_json in ("{invalid", '{"sample_rate": 1}'):
+        with override_env(dict(DD_SPAN_SAMPLING_RULES=rules_json)):
+            assert get_span_sampling_rules() == []
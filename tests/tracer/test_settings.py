@@ -4,6 +4,7 @@ from ddtrace.settings import Config
 from ddtrace.settings import HttpConfig
 from ddtrace.settings import IntegrationConfig
 from tests.utils import BaseTestCase
+from tests.utils import DummyTracer
 
 
 class TestConfig(BaseTestCase):
@@ -290,6 +291,54 @@ class TestIntegrationConfig(BaseTestCase):
         ic = IntegrationConfig(self.config, "foo")
         assert ic.service == "foo-svc"
 
+    def test_span_budget_default(self):
+        ic = IntegrationConfig(self.config, "foo")
+        assert ic.max_spans_per_trace is None
+        assert ic.max_spans_per_second is None
+        tracer = DummyTracer()
+        with tracer.trace("parent") as parent:
+            assert not any(ic._collapse_span(tracer) for _ in range(100))
+        assert "foo.collapsed_spans" not in parent.metrics
+
+    @BaseTestCase.run_in_subprocess(
+        env_overrides=dict(DD_FOO_MAX_SPANS_PER_TRACE="10", DD_FOO_MAX_SPANS_PER_SECOND="100")
+    )
+    def test_span_budget_env_var(self):
+        ic = IntegrationConfig(self.config, "foo")
+        assert ic.max_spans_per_trace == 10
+        assert ic.max_spans_per_second == 100
+
+    def test_span_budget_per_trace(self):
+        ic = IntegrationConfig(self.config, "foo", max_spans_per_trace=2)
+        tracer = DummyTracer()
+        with tracer.trace("root") as root:
+            assert not ic._collapse_span(tracer)
+            assert not ic._collapse_span(tracer)
+            with tracer.trace("parent") as parent:
+                assert ic._collapse_span(tracer)
+                assert ic._collapse_span(tracer)
+            assert ic._collapse_span(tracer)
+        # The collapsed calls are counted on their parent
+        assert parent.get_metric("foo.collapsed_spans") == 2
+        assert root.get_metric("foo.collapsed_spans") == 1
+
+        # The budget is per trace and per integration
+        with tracer.trace("root"):
+            assert not ic._collapse_span(tracer)
+            assert not IntegrationConfig(self.config, "bar", max_spans_per_trace=1)._collapse_span(tracer)
+        # Calls outside of a trace start new traces
+        assert not any(ic._collapse_span(tracer) for _ in range(3))
+
+    def test_span_budget_per_second(self):
+        ic = IntegrationConfig(self.config, "foo", max_spans_per_second=2)
+        tracer = DummyTracer()
+        with tracer.trace("root") as root:
+            assert [ic._collapse_span(tracer) for _ in range(4)] == [False, False, True, True]
+        assert root.get_metric("foo.collapsed_spans") == 2
+
+        ic.max_spans_per_second = 0
+        assert ic._collapse_span(tracer)
+
 
 @pytest.mark.parametrize(
     "global_headers,int_headers,expected",
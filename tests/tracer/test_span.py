@@ -94,6 +94,23 @@ class SpanTestCase(TracerTestCase):
         assert s.meta == dict()
         assert s.metrics == dict(test=1)
 
+    def test_set_tags_batch(self):
+        s = Span(tracer=None, name="test.span")
+        s.set_tag("a", 1)
+        s.set_tags(
+            {
+                "a": "a",
+                "b": 2,
+                "service.name": "new-service",
+                "http.status_code": 200,
+                "out.port": "5432",
+                1: "ignored",
+            }
+        )
+        assert s.meta == {"a": "a", "service.name": "new-service", "http.status_code": "200"}
+        assert s.metrics == {"b": 2, "out.port": 5432}
+        assert s.service == "new-service"
+
     def test_set_valid_metrics(self):
         s = Span(tracer=None, name="test.span")
         s.set_metric("a", 0)
@@ -674,3 +691,28 @@ def test_manual_context_usage():
     span1.context.sampling_priority = 1
     assert span2.context.sampling_priority == 1
     assert span1.context.sampling_priority == 1
+
+
+def test_span_shared_meta():
+    shared = {"env": "prod", "team": "web"}
+    s = Span(None, "test.span")
+    s._shared_meta = shared
+    s.set_tag("team", "api")
+    assert s.get_tag("env") == "prod"
+    assert s.get_tag("team") == "api"
+    assert s._shared_meta is shared
+
+    # Overriding a shared tag with a metric copies the shared tags first
+    s.set_metric("env", 1)
+    assert s._shared_meta is None
+    assert s.meta == {"team": "api"}
+    assert shared == {"env": "prod", "team": "web"}
+
+
+def test_span_shared_meta_copy_on_read():
+    shared = {"env": "prod"}
+    s = Span(None, "test.span")
+    s._shared_meta = shared
+    s.meta["env"] = "staging"
+    assert s.get_tag("env") == "staging"
+    assert shared == {"env": "prod"}
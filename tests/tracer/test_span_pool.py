@@ -0,0 +1,153 @@
+import threading
+import weakref
+
+import mock
+
+from ddtrace.internal.span_pool import SpanPool
+from ddtrace.internal.writer import AgentWriter
+from ddtrace.span import Span
+from ddtrace.tracer import Tracer
+from tests.utils import override_global_config
+
+
+def _trace():
+    root = Span(None, "root")
+    root._local_root = root
+    root.set_tag("key", "value")
+    root.set_metric("metric", 1)
+    child = Span(None, "child", trace_id=root.trace_id, parent_id=root.span_id)
+    child._parent = child._local_root = root
+    return [root, child]
+
+
+def test_recycle():
+    pool = SpanPool()
+    assert pool.acquire() is None
+
+    pool.release(_trace())
+    spans = [pool.acquire(), pool.acquire()]
+    assert pool.acquire() is None
+    for span in spans:
+        assert span._generation == 1
+        assert span.meta == {}
+        assert span.metrics == {}
+        assert span._parent is None
+        assert span._local_root is span
+
+    span = spans[0]
+    meta, metrics = span._meta, span.metrics
+    span._init(None, "new", None, None, None, None, None, None, None, None)
+    assert span.name == "new"
+    assert span.duration_ns is None
+    # The containers are reused
+    assert span._meta is meta
+    assert span.metrics is metrics
+
+
+def test_referenced_span_not_recycled():
+    pool = SpanPool()
+    trace = _trace()
+    child = trace[1]
+    pool.release(trace)
+    del trace
+    assert pool.acquire() is None
+    assert child._generation == 0
+    assert child._parent.get_tag("key") == "value"
+
+
+def test_referenced_containers_not_recycled():
+    pool = SpanPool()
+    trace = _trace()
+    meta = trace[0].meta
+    pool.release(trace)
+    del trace
+    assert pool.acquire() is None
+    assert meta == {"key": "value"}
+
+
+def test_weakly_referenced_span_not_recycled():
+    pool = SpanPool()
+    trace = _trace()
+    ref = weakref.ref(trace[0])
+    pool.release(trace)
+    del trace
+    assert pool.acquire() is None
+    assert ref().name == "root"
+
+
+def test_released_twice():
+    pool = SpanPool()
+    trace = _trace()
+    pool.release(trace)
+    pool.release(trace)
+    del trace
+    assert pool.acquire() is not None
+    assert pool.acquire() is not None
+    assert pool.acquire() is None
+
+
+def test_bounds():
+    pool = SpanPool(max_size=3, max_pending=2)
+    for _ in range(3):
+        pool.release(_trace())
+    assert len(pool._spans.pending) == 2
+    assert pool.acquire() is not None
+    # The other trace does not fit in the freelist yet
+    assert len(pool._spans.pending) == 1
+    assert pool.acquire() is not None
+    assert pool.acquire() is not None
+    assert pool.acquire() is not None
+    assert pool.acquire() is None
+
+
+def test_retry_referenced_trace():
+    pool = SpanPool()
+    trace = _trace()
+    root = trace[0]
+    pool.release(trace)
+    del trace
+    assert pool.acquire() is None
+    del root
+    assert pool.acquire() is not None
+
+
+def test_per_thread():
+    pool = SpanPool()
+    pool.release(_trace())
+    acquired = []
+    t = threading.Thread(target=lambda: acquired.append(pool.acquire()))
+    t.start()
+    t.join()
+    assert acquired == [None]
+    assert pool.acquire() is not None
+
+
+def test_tracer_recycles_spans():
+    tracer = Tracer()
+    tracer.configure(writer=AgentWriter(agent_url="http://localhost:8126", sync_mode=True))
+    with override_global_config(dict(_span_recycling_enabled=True)):
+        with mock.patch.object(AgentWriter, "flush_queue"):
+            for _ in range(3):
+                with tracer.trace("root"):
+                    with tracer.trace("child"):
+                        pass
+
+            with tracer.trace("root", service="web") as root:
+                with tracer.trace("child") as child:
+                    pass
+            assert root._generation > 0
+            assert child._generation > 0
+
+            # The spans of the previous trace are still referenced
+            for _ in range(3):
+                with tracer.trace("other") as other:
+                    assert other is not root
+                    assert other is not child
+
+    assert root.name == "root"
+    assert root.service == "web"
+    assert child._parent is root
+    assert root._local_root is child._local_root is root
+    assert child.parent_id == root.span_id
+    assert child.trace_id == root.trace_id
+    assert child.duration_ns is not None
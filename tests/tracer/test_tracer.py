@@ -3,12 +3,14 @@
 tests for Tracer and utilities.
 """
 import contextlib
+import gc
 import multiprocessing
 import os
 from os import getpid
 import threading
 from unittest.case import SkipTest
 import warnings
+import weakref
 
 import mock
 import pytest
@@ -16,6 +18,7 @@ import six
 
 import ddtrace
 from ddtrace.constants import ENV_KEY
+from ddtrace.constants import HIGHER_ORDER_TRACE_ID_BITS
 from ddtrace.constants import HOSTNAME_KEY
 from ddtrace.constants import MANUAL_DROP_KEY
 from ddtrace.constants import MANUAL_KEEP_KEY
@@ -1689,3 +1692,95 @@ def test_fork_pid(tracer):
     _, status = os.waitpid(pid, 0)
     exit_code = os.WEXITSTATUS(status)
     assert exit_code == 12
+
+
+def test_span_template_invalidation(tracer):
+    with override_global_config(dict(env="prod")):
+        tracer.set_tags({"team": "web", "shard": 3})
+        with tracer.trace("a", service="svc") as span:
+            assert span.get_tag("env") == "prod"
+            assert span.get_tag("team") == "web"
+            assert span.get_metric("shard") == 3
+
+        tracer.set_tags({"team": "api"})
+        ddtrace.config.env = "staging"
+        with tracer.trace("b", service="svc") as span:
+            assert span.get_tag("env") == "staging"
+            assert span.get_tag("team") == "api"
+
+        ddtrace.config.service_mapping = {"svc": "mapped"}
+        try:
+            with tracer.trace("c", service="svc") as span:
+                assert span.service == "mapped"
+        finally:
+            ddtrace.config.service_mapping = {}
+
+
+def test_span_template_unsafe_tags(tracer):
+    tracer.set_tags({MANUAL_KEEP_KEY: None, "team": "web"})
+    with tracer.trace("a") as span:
+        assert span.context.sampling_priority == priority.USER_KEEP
+        assert span.get_tag("team") == "web"
+
+
+def test_128_bit_trace_id(tracer, test_spans):
+    with tracer.trace("disabled") as span:
+        pass
+    assert HIGHER_ORDER_TRACE_ID_BITS not in span.context._meta
+    assert tracer.get_log_correlation_context()["trace_id"] == "0"
+
+    with override_global_config(dict(_128_bit_trace_id_enabled=True)):
+        with tracer.trace("root") as root:
+            with tracer.trace("child") as child:
+                log_trace_id = tracer.get_log_correlation_context()["trace_id"]
+
+    trace_id_high_bits = root.context._meta[HIGHER_ORDER_TRACE_ID_BITS]
+    assert len(trace_id_high_bits) == 16
+    assert int(trace_id_high_bits, 16) != 0
+    # The span trace ids keep the lower 64 bits
+    assert child.trace_id == root.trace_id < 2 ** 64
+    assert log_trace_id == "%s%016x" % (trace_id_high_bits, root.trace_id)
+
+    # The higher bits are reported as a tag of the root span only
+    spans = test_spans.pop()
+    assert spans[-2].get_tag(HIGHER_ORDER_TRACE_ID_BITS) == trace_id_high_bits
+    assert spans[-1].get_tag(HIGHER_ORDER_TRACE_ID_BITS) is None
+
+
+def test_finished_spans_freed_without_gc(tracer):
+    gc.disable()
+    try:
+        with tracer.trace("root") as root:
+            with tracer.trace("child") as child:
+                pass
+        refs = [weakref.ref(root), weakref.ref(child)]
+        assert child._local_root is root
+        assert root._local_root is root
+        del root, child
+        tracer.pop()
+        tracer.pop_traces()
+        # No reference cycle: the spans are freed without a garbage collection
+        assert [ref() for ref in refs] == [None, None]
+    finally:
+        gc.enable()
+
+
+def test_span_template_in_place_changes(tracer):
+    tracer.set_tags({"team": "web"})
+    with tracer.trace("a", service="svc") as span:
+        assert span.service == "svc"
+        assert span.get_tag("team") == "web"
+
+    tracer.tags["team"] = "api"
+    tracer.tags["shard"] = 3
+    ddtrace.config.service_mapping["svc"] = "mapped"
+    try:
+        with tracer.trace("b", service="svc") as span:
+            assert span.service == "mapped"
+            assert span.get_tag("team") == "api"
+            assert span.get_metric("shard") == 3
+    finally:
+        del ddtrace.config.service_mapping["svc"]
+
+    with tracer.trace("c", service="svc") as span:
+        assert span.service == "svc"
@@ -7,9 +7,11 @@ import warnings
 import mock
 import pytest
 
+from ddtrace.internal.compat import PY2
 from ddtrace.utils import ArgumentError
 from ddtrace.utils import get_argument_value
 from ddtrace.utils import time
+from ddtrace.utils.cache import LRUCache
 from ddtrace.utils.cache import cached
 from ddtrace.utils.cache import cachedmethod
 from ddtrace.utils.deprecation import deprecated
@@ -370,10 +372,17 @@ def cached_test_recipe(expensive, cheap, witness, cache_size):
 
     MAX_FOO = "Foo%d" % (cache_size - 1)
 
-    cheap("last drop")  # Forces least frequent elements out of the cache
+    cheap("Foo0")  # Foo0 is now the most recently used element
+    assert witness.call_count == 1 + cache_size
+
+    cheap("last drop")  # Forces the least recently used element out of the cache
     assert witness.call_count == 2 + cache_size
 
-    cheap(MAX_FOO)  # Check MAX_FOO was dropped
+    cheap(MAX_FOO)  # Check MAX_FOO was retained
+    cheap("Foo0")  # Check Foo0 was retained
+    assert witness.call_count == 2 + cache_size
+
+    cheap("Foo1")  # Check Foo1 was dropped
     assert witness.call_count == 3 + cache_size
 
     cheap("last drop")  # Check last drop was retained
@@ -395,6 +404,57 @@ def test_cached():
     cached_test_recipe(expensive, cheap, witness, cache_size)
 
 
+def test_lru_cache():
+    cache = LRUCache(2)
+    witness = mock.Mock(side_effect=lambda key: key.upper())
+
+    assert cache.hit_rate == 0.0
+    assert cache.get_or_compute("a", witness) == "A"
+    assert cache.get_or_compute("b", witness) == "B"
+    assert cache.get_or_compute("a", witness) == "A"
+    assert witness.call_count == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    # "b" is the least recently used value
+    assert cache.get_or_compute("c", witness) == "C"
+    assert len(cache) == 2
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert cache.hit_rate == 0.25
+
+    cache.clear()
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+@pytest.mark.skipif(PY2, reason="The Python 2 OrderedDict is reordered under the lock")
+def test_lru_cache_hit_lock_free():
+    cache = LRUCache(2)
+    cache.get_or_compute("a", str.upper)
+    cache.get_or_compute("b", str.upper)
+
+    # Hits do not take the lock but still mark the value as the most recently used one
+    lock, cache._lock = cache._lock, None
+    assert cache.get_or_compute("a", str.upper) == "A"
+    cache._lock = lock
+
+    cache.get_or_compute("c", str.upper)
+    assert "a" in cache
+    assert "b" not in cache
+
+
+def test_cached_stats():
+    @cached(2)
+    def cheap(key):
+        return key
+
+    cheap("a")
+    cheap("a")
+    assert cheap.cache.hits == 1
+    assert cheap.cache.misses == 1
+
+
 def test_cachedmethod():
     witness = mock.Mock()
     cache_size = 128
@@ -90,6 +90,10 @@ def override_global_config(values):
         "version",
         "service",
         "_raise",
+        "_propagation_style_inject",
+        "_propagation_style_extract",
+        "_128_bit_trace_id_enabled",
+        "_span_recycling_enabled",
     ]
 
     # Grab the current values of all keys